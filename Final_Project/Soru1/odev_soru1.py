@@ -1,13 +1,241 @@
-import cv2      
-import numpy as np 
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 
-def parlak_nesne_tespiti(resim_yolu):
+import cv2
+import numpy as np
+
+# Soruda istenen kural: Sadece 1000 piksel seçilecek
+HEDEF_PIKSEL_SAYISI = 1000
+RESIM_UZANTILARI = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff")
+
+
+# ==========================================
+# KÜTÜPHANE API (PENCERESİZ)
+# ==========================================
+def histogram_hesapla(img):
+    """(H,W) -> (256,) ya da (N,H,W) -> (N,256) histogram (tek bincount ile)."""
+    img = np.asarray(img, dtype=np.uint8)
+    if img.ndim == 2:
+        return np.bincount(img.ravel(), minlength=256)
+    n = img.shape[0]
+    ofset = (np.arange(n, dtype=np.int64) * 256)[:, np.newaxis]
+    return np.bincount((img.reshape(n, -1) + ofset).ravel(), minlength=n * 256).reshape(n, 256)
+
+
+def dinamik_esik(hist, hedef=HEDEF_PIKSEL_SAYISI):
+    """
+    Histogramı 255'ten geriye doğru toplayıp toplamın ilk kez 'hedef'e ulaştığı
+    parlaklık değerini bulur (ters kümülatif toplam, Python döngüsü yok).
+    (256,) veya (N,256) histogram alır; (esik, esik ve üstündeki piksel sayısı) döner.
+    """
+    hist = np.asarray(hist)
+    ters_kumulatif = np.cumsum(hist[..., ::-1], axis=-1)[..., ::-1]   # [i] = #(piksel >= i)
+    yeterli = ters_kumulatif >= hedef
+    # yeterli[i] i azaldıkça True kalır -> True olan en büyük i
+    esik = np.where(yeterli.any(axis=-1), 255 - np.argmax(yeterli[..., ::-1], axis=-1), 0)
+    adet = np.take_along_axis(ters_kumulatif, np.asarray(esik)[..., np.newaxis], axis=-1)[..., 0]
+    return esik, adet
+
+
+def esik_maskesi(img, esik):
+    """cv2.threshold(img, esik, 255, THRESH_BINARY) ile aynı: piksel > esik -> 255."""
+    img = np.asarray(img, dtype=np.uint8)
+    esik = np.asarray(esik)
+    if img.ndim == 3:
+        esik = esik.reshape(-1, 1, 1)
+    return np.where(img > esik, 255, 0).astype(np.uint8)
+
+
+def topk_maskesi(img, hedef=HEDEF_PIKSEL_SAYISI):
+    """
+    Tam olarak 'hedef' adet en parlak pikseli seçer (np.argpartition).
+    Eşik değerinde eşitlik (tie) olduğunda eşik yönteminin hedefi aşmasını engeller.
+    (H,W) veya (N,H,W) alır.
+    """
+    img = np.asarray(img, dtype=np.uint8)
+    tekil = img.ndim == 2
+    yigin = img[np.newaxis] if tekil else img
+    n = yigin.shape[0]
+    duz = yigin.reshape(n, -1)
+    k = min(hedef, duz.shape[1])
+
+    maske = np.zeros_like(duz)
+    if k > 0:
+        secilen = np.argpartition(duz, duz.shape[1] - k, axis=1)[:, duz.shape[1] - k:]
+        np.put_along_axis(maske, secilen, 255, axis=1)
+    maske = maske.reshape(yigin.shape)
+    return maske[0] if tekil else maske
+
+
+def parlak_nesne_maskesi(img, hedef=HEDEF_PIKSEL_SAYISI, mod="esik"):
+    """
+    Tek resim veya (N,H,W) yığın için parlak nesne maskesi.
+    mod: "esik" (dinamik eşik, orijinal davranış) veya "topk" (tam hedef adet piksel).
+    Dönen: (maske, esik, seçilen piksel sayısı)
+    """
+    img = np.asarray(img, dtype=np.uint8)
+    esik, _ = dinamik_esik(histogram_hesapla(img), hedef)
+    if mod == "topk":
+        maske = topk_maskesi(img, hedef)
+    elif mod == "esik":
+        maske = esik_maskesi(img, esik)
+    else:
+        raise ValueError(f"Bilinmeyen mod: {mod}")
+    adet = np.count_nonzero(maske.reshape(maske.shape[0], -1), axis=1) if maske.ndim == 3 else np.count_nonzero(maske)
+    return maske, esik, adet
+
+
+def _dosya_isle(is_):
+    yol, hedef, mod, cikti_klasoru = is_
+    img = cv2.imread(yol, cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        return yol, None, None
+    maske, esik, adet = parlak_nesne_maskesi(img, hedef, mod)
+    if cikti_klasoru is not None:
+        ad = os.path.splitext(os.path.basename(yol))[0]
+        cv2.imwrite(os.path.join(cikti_klasoru, f"{ad}_maske.png"), maske)
+    return yol, int(esik), int(adet)
+
+
+def toplu_tespit(kaynak, hedef=HEDEF_PIKSEL_SAYISI, mod="esik", cikti_klasoru=None,
+                 isci_sayisi=None, parca=64):
+    """
+    Çok sayıda resim için penceresiz tespit.
+    kaynak: (N,H,W) uint8 yığın -> tek seferde vektörel hesap, (maske, esik, adet) döner.
+    kaynak: klasör yolu / dosya listesi -> süreç havuzuna dağıtılır,
+            [(yol, esik, adet), ...] döner (okunamayan dosyada esik/adet None).
+    """
+    if isinstance(kaynak, np.ndarray):
+        return parlak_nesne_maskesi(kaynak, hedef, mod)
+
+    if isinstance(kaynak, (str, os.PathLike)):
+        yollar = [os.path.join(kaynak, f) for f in sorted(os.listdir(kaynak))
+                  if f.lower().endswith(RESIM_UZANTILARI)]
+    else:
+        yollar = [str(p) for p in kaynak]
+
+    if cikti_klasoru is not None:
+        os.makedirs(cikti_klasoru, exist_ok=True)
+
+    isler = [(y, hedef, mod, cikti_klasoru) for y in yollar]
+    with ProcessPoolExecutor(max_workers=isci_sayisi) as havuz:
+        return list(havuz.map(_dosya_isle, isler, chunksize=parca))
+
+
+# ==========================================
+# ÇOK BÜYÜK RESİMLER: ŞERİT ŞERİT (MEMMAP) TAM ÇÖZÜNÜRLÜK
+# ==========================================
+# Resim belleğe hiç tamamen alınmaz: 1. geçişte şeritlerden global histogram,
+# 2. geçişte eşik uygulanıp maske şerit şerit diske yazılır.
+# Bellek eşlenebilen formatlar: .npy, ikili PGM (P5), .raw (sekil=(H,W) ile).
+# JPEG/PNG gibi sıkıştırılmış formatlar parça parça çözülemez; önce PGM'e
+# çevirin (örn. ImageMagick: "convert buyuk.tif buyuk.pgm").
+def _pgm_baslik_oku(yol):
+    with open(yol, "rb") as f:
+        bas = f.read(4096)
+    alanlar, i = [], 0
+    while len(alanlar) < 4:
+        while i < len(bas) and bas[i:i + 1].isspace():
+            i += 1
+        if bas[i:i + 1] == b"#":
+            i = bas.find(b"\n", i) + 1
+            if i == 0:
+                raise ValueError(f"PGM başlığı eksik: {yol}")
+            continue
+        j = i
+        while j < len(bas) and not bas[j:j + 1].isspace():
+            j += 1
+        if j == i or j == len(bas):          # alan yok ya da başlık ayırıcı boşluktan önce bitti
+            raise ValueError(f"PGM başlığı eksik: {yol}")
+        alanlar.append(bas[i:j])
+        i = j
+    if alanlar[0] != b"P5" or int(alanlar[3]) > 255:
+        raise ValueError(f"Sadece 8 bit ikili PGM (P5) destekleniyor: {yol}")
+    return int(alanlar[2]), int(alanlar[1]), i + 1   # H, W, veri ofseti
+
+
+def resmi_bellege_esle(yol, sekil=None):
+    """Büyük gri resmi okumadan np.memmap olarak açar: (H,W) uint8."""
+    uzanti = os.path.splitext(str(yol))[1].lower()
+    if uzanti == ".npy":
+        img = np.load(yol, mmap_mode="r")
+    elif uzanti in (".pgm", ".pnm"):
+        h, w, ofset = _pgm_baslik_oku(yol)
+        img = np.memmap(yol, dtype=np.uint8, mode="r", offset=ofset, shape=(h, w))
+    elif uzanti == ".raw":
+        if sekil is None:
+            raise ValueError(".raw için sekil=(H,W) verilmeli")
+        img = np.memmap(yol, dtype=np.uint8, mode="r", shape=tuple(sekil))
+    else:
+        raise ValueError(f"Bellek eşlenemeyen format: {uzanti} (.npy / .pgm / .raw kullanın)")
+    if img.ndim != 2 or img.dtype != np.uint8:
+        raise ValueError(f"(H,W) uint8 resim bekleniyor, gelen: {img.shape} {img.dtype}")
+    return img
+
+
+def _maske_dosyasi_ac(yol, h, w):
+    if str(yol).lower().endswith(".npy"):
+        return np.lib.format.open_memmap(yol, mode="w+", dtype=np.uint8, shape=(h, w))
+    baslik = f"P5\n{w} {h}\n255\n".encode("ascii")
+    with open(yol, "wb") as f:
+        f.write(baslik)
+        f.truncate(len(baslik) + h * w)
+    return np.memmap(yol, dtype=np.uint8, mode="r+", offset=len(baslik), shape=(h, w))
+
+
+def serit_serit_tespit(kaynak, cikti, hedef=HEDEF_PIKSEL_SAYISI, mod="esik",
+                       serit_yuksekligi=1024, sekil=None):
+    """
+    Tam çözünürlükte, sınırlı bellekle parlak nesne maskesi üretir.
+    cikti: .npy veya .pgm maske dosyası. Dönen: (esik, seçilen piksel sayısı)
+    mod="topk": eşik değerindeki eşit pikseller tarama sırasına göre kota kadar
+    seçilir; toplam tam olarak min(hedef, H*W) olur.
+    """
+    img = resmi_bellege_esle(kaynak, sekil)
+    h, w = img.shape
+
+    # 1. GEÇİŞ: global histogram
+    hist = np.zeros(256, dtype=np.int64)
+    for y in range(0, h, serit_yuksekligi):
+        hist += np.bincount(np.asarray(img[y:y + serit_yuksekligi]).ravel(), minlength=256)
+    esik, _ = dinamik_esik(hist, hedef)
+    esik = int(esik)
+
+    if mod == "topk":
+        kota = min(hedef, h * w) - int(hist[esik + 1:].sum())
+    elif mod != "esik":
+        raise ValueError(f"Bilinmeyen mod: {mod}")
+
+    # 2. GEÇİŞ: eşikle ve maskeyi şerit şerit yaz
+    maske = _maske_dosyasi_ac(cikti, h, w)
+    secilen = 0
+    for y in range(0, h, serit_yuksekligi):
+        s = np.asarray(img[y:y + serit_yuksekligi])
+        m = s > esik
+        if mod == "topk" and kota > 0:
+            esit = s == esik
+            sira = np.cumsum(esit, axis=None).reshape(s.shape)
+            m |= esit & (sira <= kota)
+            kota -= min(kota, int(sira.ravel()[-1]))
+        maske[y:y + serit_yuksekligi] = m.view(np.uint8) * np.uint8(255)
+        secilen += int(np.count_nonzero(m))
+    maske.flush()
+    del maske
+    return esik, secilen
+
+
+# ==========================================
+# ETKİLEŞİMLİ GÖSTERİM (ORİJİNAL ÖDEV AKIŞI)
+# ==========================================
+def parlak_nesne_tespiti(resim_yolu, hedef=HEDEF_PIKSEL_SAYISI, mod="esik"):
     # 1. ADIM: Resmi Oku
     img = cv2.imread(resim_yolu, cv2.IMREAD_GRAYSCALE)
-    
+
     if img is None:
         print("Hata: Resim bulunamadı!")
-        return
+        return None
 
     # --- EKSTRA: RESİM ÇOK BÜYÜKSE KÜÇÜLTELİM ---
     # Eğer resim çok büyükse işlem uzun sürer ve ekrana sığmaz.
@@ -19,49 +247,61 @@ def parlak_nesne_tespiti(resim_yolu):
         img = cv2.resize(img, (800, yeni_yukseklik))
         print("Uyarı: Resim ekrana sığması için küçültüldü.")
 
-    # Soruda istenen kural: Sadece 1000 piksel seçilecek
-    HEDEF_PIKSEL_SAYISI = 1000 
-    
-    # 2. ADIM: Histogram Hesapla
-    hist = cv2.calcHist([img], [0], None, [256], [0, 256])
-
-    # 3. ADIM: Eşik Değerini Bul
-    toplam_piksel = 0
-    esik_degeri = 0
-
-    for i in range(255, -1, -1):
-        toplam_piksel += hist[i]
-        if toplam_piksel >= HEDEF_PIKSEL_SAYISI:
-            esik_degeri = i
-            break 
+    # 2-4. ADIM: Histogram, dinamik eşik ve maske (vektörel)
+    sonuc_resmi, esik_degeri, _ = parlak_nesne_maskesi(img, hedef, mod)
+    _, toplam_piksel = dinamik_esik(histogram_hesapla(img), hedef)
 
     print(f"Hesaplanan Dinamik Eşik Değeri: {esik_degeri}")
     print(f"Bu değerin üzerindeki piksel sayısı: {int(toplam_piksel)}")
 
-    # 4. ADIM: Resmi Kesip Biç (Thresholding)
-    _, sonuc_resmi = cv2.threshold(img, esik_degeri, 255, cv2.THRESH_BINARY)
-
     # --- PENCERE AYARLARI (Sorunu Çözen Kısım) ---
     # Pencereleri oluşturup boyutlandırılabilir yapıyoruz
     cv2.namedWindow('Orijinal Resim', cv2.WINDOW_NORMAL)
-    cv2.namedWindow(f'En Parlak {HEDEF_PIKSEL_SAYISI} Piksel', cv2.WINDOW_NORMAL)
+    cv2.namedWindow(f'En Parlak {hedef} Piksel', cv2.WINDOW_NORMAL)
 
     # Pencereleri ekrana sığacak boyuta (örneğin 600x400) getiriyoruz
     cv2.resizeWindow('Orijinal Resim', 600, 400)
-    cv2.resizeWindow(f'En Parlak {HEDEF_PIKSEL_SAYISI} Piksel', 600, 400)
+    cv2.resizeWindow(f'En Parlak {hedef} Piksel', 600, 400)
 
     # Sonuçları Göster
     cv2.imshow('Orijinal Resim', img)
-    cv2.imshow(f'En Parlak {HEDEF_PIKSEL_SAYISI} Piksel', sonuc_resmi)
-    
+    cv2.imshow(f'En Parlak {hedef} Piksel', sonuc_resmi)
+
     cv2.waitKey(0)
     cv2.destroyAllWindows()
+    return sonuc_resmi
+
 
-# Fonksiyonu çalıştır
-parlak_nesne_tespiti('test_resmi.jpg')
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("kaynak", nargs="?", default="test_resmi.jpg", help="Resim dosyası veya klasör")
+    parser.add_argument("--hedef", type=int, default=HEDEF_PIKSEL_SAYISI)
+    parser.add_argument("--mod", choices=["esik", "topk"], default="esik")
+    parser.add_argument("--cikti", type=str, default=None, help="Klasör modunda maskelerin yazılacağı yer")
+    parser.add_argument("--isci", type=int, default=None, help="Süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--serit", type=int, default=None,
+                        help="Büyük resim modu: şerit yüksekliği (.npy/.pgm/.raw girdi, --cikti maske dosyası)")
+    parser.add_argument("--sekil", type=int, nargs=2, default=None, metavar=("H", "W"), help=".raw girdi boyutu")
+    args = parser.parse_args()
 
-# ... (kodun en alt kısmı) ...
+    if args.serit is not None:
+        if args.cikti is None:
+            parser.error("--serit için --cikti (maske .npy/.pgm) gerekli")
+        t0 = time.perf_counter()
+        esik, adet = serit_serit_tespit(args.kaynak, args.cikti, args.hedef, args.mod, args.serit, args.sekil)
+        print(f"Eşik: {esik} | Seçilen piksel: {adet} | {time.perf_counter() - t0:.2f} s -> {args.cikti}")
+    elif os.path.isdir(args.kaynak):
+        t0 = time.perf_counter()
+        sonuclar = toplu_tespit(args.kaynak, args.hedef, args.mod, args.cikti, args.isci)
+        sure = time.perf_counter() - t0
+        hatali = sum(1 for _, esik, _ in sonuclar if esik is None)
+        print(f"{len(sonuclar)} resim / {sure:.2f} s -> {len(sonuclar) / max(sure, 1e-9):.1f} resim/s "
+              f"(okunamayan: {hatali})")
+    else:
+        # Fonksiyonu çalıştır
+        sonuc_resmi = parlak_nesne_tespiti(args.kaynak, args.hedef, args.mod)
 
-# SAĞLAMA: Beyaz pikselleri say
-beyaz_piksel_sayisi = cv2.countNonZero(sonuc_resmi)
-print(f"RESİMDEKİ TOPLAM BEYAZ PİKSEL SAYISI: {beyaz_piksel_sayisi}")
+        # SAĞLAMA: Beyaz pikselleri say
+        if sonuc_resmi is not None:
+            beyaz_piksel_sayisi = cv2.countNonZero(sonuc_resmi)
+            print(f"RESİMDEKİ TOPLAM BEYAZ PİKSEL SAYISI: {beyaz_piksel_sayisi}")
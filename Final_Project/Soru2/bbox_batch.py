@@ -0,0 +1,193 @@
+import time
+import argparse
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# =========================
+# TOPLU (N,H,W) BBOX ÇEKİRDEĞİ
+# =========================
+# make_yolo_labels.find_bbox ile aynı zincir, resim resim değil yığın üzerinde:
+#   GaussianBlur 5x5 -> Otsu (INV) -> open 3x3 -> dilate 3x3 -> en büyük bileşenin kutusu
+# Blur/Otsu/morfoloji NumPy ile vektörel; en büyük bileşen, yığın tek bir karo resme
+# dizilip tek connectedComponentsWithStats çağrısıyla bulunur (8-komşuluk = dış kontur).
+# Fark: find_bbox konturları poligon alanıyla (contourArea), burada piksel sayısıyla
+# sıralar; kutular pratikte aynıdır (python bbox_batch.py ile ölçülür).
+# Ne zaman kazandırır: resim başına cv2 çağrı yükü baskın olan küçük kırpıntılarda
+# (28x28 rakamlar: ~1.2x, kutular birebir aynı). 64x64 ve üstünde cv2'nin SIMD
+# çekirdekleri NumPy geçişlerinden hızlıdır; orada find_bbox kullanın (--size ile görülebilir).
+BATCH = 256   # 28x28'de ~1 MB ara veri: L2 önbelleğe sığar
+
+
+def _pad_reflect101(imgs, r=2):
+    """cv2.BORDER_REFLECT_101 dolgusu (GaussianBlur varsayılanı); np.pad'den hızlı, uint16 çıktı."""
+    n, H, W = imgs.shape
+    p = np.empty((n, H + 2 * r, W + 2 * r), dtype=np.uint16)
+    p[:, r:-r, r:-r] = imgs
+    for k in range(1, r + 1):
+        p[:, r:-r, r - k] = imgs[:, :, k]
+        p[:, r:-r, W + r - 1 + k] = imgs[:, :, W - 1 - k]
+    for k in range(1, r + 1):
+        p[:, r - k] = p[:, r + k]
+        p[:, H + r - 1 + k] = p[:, H + r - 1 - k]
+    return p
+
+
+def gaussian_blur_5(imgs):
+    """(N,H,W) uint8 -> 5x5 Gauss; cv2'nin 8-bit sabit noktalı sonucu: (toplam + 128) >> 8."""
+    # Çekirdek [1 4 6 4 1] ayrık; en büyük ara toplam 255 * 256 = 65280 -> uint16 yeterli
+    n, H, W = imgs.shape
+    p = _pad_reflect101(imgs)
+    h = p[:, :, 0:W] + p[:, :, 4:W + 4]
+    h += (p[:, :, 1:W + 1] + p[:, :, 3:W + 3]) << 2
+    h += p[:, :, 2:W + 2] * 6
+    v = h[:, 0:H] + h[:, 4:H + 4]
+    v += (h[:, 1:H + 1] + h[:, 3:H + 3]) << 2
+    v += h[:, 2:H + 2] * 6
+    v += 128
+    v >>= 8
+    return v.astype(np.uint8)
+
+
+def otsu_thresholds(imgs):
+    """
+    Her resim için cv2 THRESH_OTSU eşiği (ilk maksimum), (N,) int.
+    Sınıflar arası varyans tek ifadeyle: (mu * q1 - m1)^2 / (q1 * q2), m1 = kümülatif i*p(i).
+    """
+    n = imgs.shape[0]
+    ofs = (np.arange(n, dtype=np.int32) * 256)[:, None, None]
+    hist = np.bincount((imgs + ofs).ravel(), minlength=n * 256).reshape(n, 256)
+    p = hist / float(imgs[0].size)
+    q1 = np.cumsum(p, axis=1)
+    m1 = np.cumsum(p * np.arange(256.0), axis=1)
+    q2 = 1.0 - q1
+    num = m1[:, -1:] * q1
+    num -= m1
+    num *= num
+    den = q1 * q2
+    eps = np.finfo(np.float32).eps
+    # cv2 ile aynı: sınıflardan biri ~boşsa bu eşik atlanır
+    den[(np.minimum(q1, q2) < eps) | (np.maximum(q1, q2) > 1.0 - eps)] = np.inf
+    return (num / den).argmax(axis=1)
+
+
+def _morph(masks, k, op, border):
+    """Ayrık (separable) kxk dikdörtgen erode/dilate; kenar dışı etkisiz değer (cv2 varsayılanı)."""
+    r = k // 2
+    out = masks
+    for axis in (1, 2):
+        pad = [(0, 0)] * 3
+        pad[axis] = (r, r)
+        p = np.pad(out, pad, constant_values=border)
+        n = out.shape[axis]
+        sl = [slice(None)] * 3
+        acc = None
+        for d in range(k):
+            sl[axis] = slice(d, d + n)
+            acc = p[tuple(sl)] if acc is None else op(acc, p[tuple(sl)])
+        out = acc
+    return out
+
+
+def threshold_masks(grays):
+    """Blur + Otsu (INV) + open + dilate: find_bbox'taki 'th' maskelerinin (bool) yığını."""
+    blur = gaussian_blur_5(grays)
+    t = otsu_thresholds(blur)
+    th = blur <= t[:, None, None]            # THRESH_BINARY_INV (bool: 0/255 yerine 0/1)
+    th = _morph(th, 3, np.logical_and, True)     # open = erode 3x3 ...
+    return _morph(th, 5, np.logical_or, False)   # ... + dilate 3x3, sonra dilate 3x3 = dilate 5x5
+
+
+def largest_boxes(masks, min_area=200):
+    """
+    (N,H,W) ikili maskeler -> (N,4) [x, y, w, h] int32; bileşen yoksa / kutu < min_area ise -1.
+    Maskeler aralarında 1 satır boşlukla alt alta dizilir, etiketleme tek çağrıda yapılır.
+    """
+    n, H, W = masks.shape
+    karo = np.zeros((n, H + 1, W), dtype=np.uint8)
+    karo[:, :H] = masks        # bool / 0-255 fark etmez: sıfır olmayan = ön plan
+    _, _, stats, _ = cv2.connectedComponentsWithStats(karo.reshape(n * (H + 1), W), connectivity=8)
+    stats = stats[1:]                                   # 0: arka plan
+    img_idx = stats[:, cv2.CC_STAT_TOP] // (H + 1)
+
+    # Her resim için en büyük alanlı bileşen: (resim, -alan) sıralaması, ilk kayıt
+    sira = np.lexsort((-stats[:, cv2.CC_STAT_AREA], img_idx))
+    ilk = np.ones(len(sira), dtype=bool)
+    ilk[1:] = img_idx[sira][1:] != img_idx[sira][:-1]
+    sec = sira[ilk]
+
+    boxes = np.full((n, 4), -1, dtype=np.int32)
+    s = stats[sec]
+    boxes[img_idx[sec]] = np.stack([s[:, cv2.CC_STAT_LEFT], s[:, cv2.CC_STAT_TOP] % (H + 1),
+                                    s[:, cv2.CC_STAT_WIDTH], s[:, cv2.CC_STAT_HEIGHT]], axis=1)
+    boxes[boxes[:, 2] * boxes[:, 3] < min_area] = -1
+    return boxes
+
+
+def find_bboxes(grays, min_area=200, batch=BATCH):
+    """
+    find_bbox'ın toplu karşılığı: (N,H,W) uint8 -> (N,4) [x, y, w, h] (bulunamazsa -1).
+    Ara diziler önbellekte kalsın diye yığın 'batch' resimlik parçalarla işlenir.
+    """
+    grays = np.ascontiguousarray(grays, dtype=np.uint8)
+    out = np.empty((len(grays), 4), dtype=np.int32)
+    for i in range(0, len(grays), batch):
+        out[i:i + batch] = largest_boxes(threshold_masks(grays[i:i + batch]), min_area)
+    return out
+
+
+# =========================
+# BENCHMARK / DOĞRULAMA
+# =========================
+def load_stack(src):
+    """dataset/0..9 altındaki aynı boyutlu resimleri (N,H,W) gri yığın olarak yükler."""
+    paths = sorted(p for p in Path(src).glob("*/*") if p.suffix.lower() in (".jpg", ".jpeg", ".png"))
+    grays = [cv2.cvtColor(cv2.imread(str(p)), cv2.COLOR_BGR2GRAY) for p in paths]
+    return np.stack(grays)
+
+
+def benchmark(src, repeat=5, tol=1, size=None):
+    from make_yolo_labels import find_bbox
+
+    grays = load_stack(src)
+    if size:
+        grays = np.stack([cv2.resize(g, (size, size)) for g in grays])
+    n = len(grays)
+    reps = max(1, 4096 // n)       # küçük veri setinde ölçüm için çoğalt
+    big = np.concatenate([grays] * reps)
+
+    def best_of(fn):
+        best, out = float("inf"), None
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            out = fn()
+            best = min(best, time.perf_counter() - t0)
+        return best, out
+
+    t_ref, ref = best_of(lambda: [find_bbox(g) for g in big])
+    t_new, boxes = best_of(lambda: find_bboxes(big))
+
+    ref_arr = np.array([r if r is not None else (-1, -1, -1, -1) for r in ref], dtype=np.int32)
+    fark = np.abs(ref_arr - boxes).max(axis=1)
+    esit = int((fark == 0).sum())
+    tolerans = int((fark <= tol).sum())
+
+    m = len(big)
+    print(f"{m} resim ({grays.shape[1]}x{grays.shape[2]})")
+    print(f"  find_bbox (resim resim): {t_ref * 1e6 / m:7.1f} us/resim ({m / t_ref:8.0f} resim/s)")
+    print(f"  find_bboxes (toplu)    : {t_new * 1e6 / m:7.1f} us/resim ({m / t_new:8.0f} resim/s)"
+          f"  -> x{t_ref / t_new:.1f}")
+    print(f"  birebir aynı kutu: {esit}/{m} | ±{tol} piksel içinde: {tolerans}/{m}")
+    if tolerans < m:
+        bad = np.flatnonzero(fark > tol)[:5] % n
+        print(f"  farklı örnekler (indeks): {bad.tolist()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Toplu bbox çekirdeği benchmark'ı")
+    parser.add_argument("--src", default="dataset")
+    parser.add_argument("--tol", type=int, default=1)
+    parser.add_argument("--size", type=int, default=None, help="Resimleri SxS'e ölçekleyerek ölç")
+    args = parser.parse_args()
+    benchmark(args.src, tol=args.tol, size=args.size)
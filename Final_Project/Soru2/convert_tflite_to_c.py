@@ -1,5 +1,10 @@
+import sys
 from pathlib import Path
 
+# Ortak çevirici: tools/tflite_to_c.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "tools"))
+from tflite_to_c import onbellekli_cevir
+
 # TFLite model yolu (gerekirse adını değiştir)
 TFLITE_PATH = Path("runs/detect/train/weights/best_saved_model/best_float32.tflite")
 OUT_PATH = Path("model_data.h")
@@ -10,22 +15,10 @@ def main():
     if not TFLITE_PATH.is_file():
         raise FileNotFoundError(f"TFLite dosyası bulunamadı: {TFLITE_PATH}")
 
-    data = TFLITE_PATH.read_bytes()
-    with OUT_PATH.open("w", encoding="utf-8") as f:
-        f.write("#include <cstdint>\n\n")
-        f.write(f"const unsigned char {ARRAY_NAME}[] = {{\n  ")
-
-        for i, b in enumerate(data):
-            f.write(str(b))
-            if i != len(data) - 1:
-                f.write(", ")
-            if (i + 1) % 12 == 0:
-                f.write("\n  ")
-
-        f.write("\n};\n")
-        f.write(f"const unsigned int {ARRAY_NAME}_len = {len(data)};\n")
+    # TFLM modeli hizalı ister: alignas(8). Model byte'ları aynıysa başlık yeniden yazılmaz.
+    n, durum = onbellekli_cevir(TFLITE_PATH, OUT_PATH, ARRAY_NAME, tek_baslik=True, hizalama=8, cstdint=True)
 
-    print(f"Oluşturuldu: {OUT_PATH} (boyut: {len(data)} byte)")
+    print(f"[{durum}] {OUT_PATH} (boyut: {n} byte)")
 
 
 if __name__ == "__main__":
@@ -1,22 +1,33 @@
-import cv2
+import os
+import json
+import time
+import shutil
+import sqlite3
+import argparse
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+import numpy as np
 
 # =========================
 # AYARLAR
 # =========================
 SRC = Path("dataset")          # içinde 0..9 klasörleri olan yer
 OUT = Path("dataset_yolo")
-IMG_OUT = OUT / "images"
-LBL_OUT = OUT / "labels"
-IMG_OUT.mkdir(parents=True, exist_ok=True)
-LBL_OUT.mkdir(parents=True, exist_ok=True)
+IMG_EXTS = (".jpg", ".jpeg", ".png")
+CHUNK = 256                    # süreç başına tek seferde gönderilen resim sayısı
+MANIFEST = "labels_manifest.sqlite"   # OUT içinde; artımlı çalıştırma için
+# find_bbox ayarları (+ --batched, --mode); değişirse manifest tüm resimleri yeniden etiketletir
+BBOX_PARAMS = {"blur_k": 5, "kernel_k": 3, "min_area": 200}
 
-def find_bbox(gray):
-    blur = cv2.GaussianBlur(gray, (5, 5), 0)
+
+def find_bbox(gray, blur_k=5, kernel_k=3, min_area=200):
+    blur = cv2.GaussianBlur(gray, (blur_k, blur_k), 0)
     _, th = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
 
     # temizle
-    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (kernel_k, kernel_k))
     th = cv2.morphologyEx(th, cv2.MORPH_OPEN, kernel, iterations=1)
     th = cv2.dilate(th, kernel, iterations=1)
 
@@ -27,11 +38,12 @@ def find_bbox(gray):
     c = max(contours, key=cv2.contourArea)
     x, y, w, h = cv2.boundingRect(c)
 
-    if w * h < 200:   # çok küçükse gürültü
+    if w * h < min_area:   # çok küçükse gürültü
         return None
 
     return x, y, w, h
 
+
 def to_yolo(x, y, w, h, W, H):
     xc = (x + w/2) / W
     yc = (y + h/2) / H
@@ -39,48 +51,211 @@ def to_yolo(x, y, w, h, W, H):
     hh = h / H
     return xc, yc, ww, hh
 
-ok, fail = 0, 0
-for class_dir in sorted(SRC.iterdir()):
-    if not class_dir.is_dir():
-        continue
-    if not class_dir.name.isdigit():
-        continue
 
-    class_id = int(class_dir.name)
-    imgs = []
-    for ext in ("*.jpg", "*.jpeg", "*.png"):
-        imgs += list(class_dir.glob(ext))
+def collect_jobs(src):
+    """src/0..9 altındaki resimleri (resim yolu, class_id) listesi olarak döndürür."""
+    jobs = []
+    for class_dir in sorted(Path(src).iterdir()):
+        if not class_dir.is_dir() or not class_dir.name.isdigit():
+            continue
+        class_id = int(class_dir.name)
+        imgs = [p for p in class_dir.iterdir() if p.suffix.lower() in IMG_EXTS]
+        jobs += [(img_path, class_id) for img_path in sorted(imgs)]
+    return jobs
+
+
+def place_image(src, dst, mode="link"):
+    """
+    Orijinal byte'ları çıktı klasörüne koyar (yeniden kodlama yok).
+    link: hard link (aynı dosya sistemi değilse kopyaya düşer), copy: byte kopyası.
+    """
+    if dst.exists():
+        if mode == "link" and os.path.samefile(src, dst):
+            return
+        dst.unlink()   # eski çıktı (veya hard link) orijinale yazılmasın
+    if mode == "link":
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+
 
-    for img_path in sorted(imgs):
+def label_line(img_path, class_id, params=BBOX_PARAMS):
+    """Tek resim için YOLO satırı; okunamazsa / bbox yoksa (None, hata mesajı)."""
+    img = cv2.imread(str(img_path))
+    if img is None:
+        return None, "Okunamadı"
+
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    bbox = find_bbox(gray, **params)
+    if bbox is None:
+        return None, "BBox yok"
+
+    x, y, w, h = bbox
+    H, W = gray.shape[:2]
+    xc, yc, ww, hh = to_yolo(x, y, w, h, W, H)
+    return f"{class_id} {xc:.6f} {yc:.6f} {ww:.6f} {hh:.6f}\n", None
+
+
+def out_stem(img_path, class_id):
+    # tekil isim verelim: 1_veri_0001.jpg gibi
+    return f"{class_id}_{img_path.stem}"
+
+
+def _batched_lines(chunk, params):
+    """Aynı boyuttaki resimler tek (N,H,W) yığında bbox_batch.find_bboxes ile etiketlenir."""
+    from bbox_batch import find_bboxes
+
+    if params["blur_k"] != 5 or params["kernel_k"] != 3:
+        raise ValueError("--batched sadece varsayılan blur/kernel ayarlarını destekler")
+    grays, lines = {}, {}
+    for i, (img_path, class_id) in enumerate(chunk):
         img = cv2.imread(str(img_path))
         if img is None:
-            print("Okunamadı:", img_path)
-            fail += 1
+            lines[i] = (None, "Okunamadı")
             continue
-
         gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        bbox = find_bbox(gray)
-        if bbox is None:
-            print("BBox yok:", img_path)
-            fail += 1
+        grays.setdefault(gray.shape, []).append((i, gray))
+
+    for (H, W), items in grays.items():
+        boxes = find_bboxes(np.stack([g for _, g in items]), params["min_area"])
+        for (i, _), (x, y, w, h) in zip(items, boxes.tolist()):
+            if w < 0:
+                lines[i] = (None, "BBox yok")
+                continue
+            xc, yc, ww, hh = to_yolo(x, y, w, h, W, H)
+            lines[i] = (f"{chunk[i][1]} {xc:.6f} {yc:.6f} {ww:.6f} {hh:.6f}\n", None)
+    return [lines[i] for i in range(len(chunk))]
+
+
+def _label_chunk(args):
+    """İşçi süreç: bir parça resmi etiketler ve resimleri yerleştirir; etiket metinlerini döndürür."""
+    chunk, img_out, mode, params, batched = args
+    if batched:
+        lines = _batched_lines(chunk, params)
+    else:
+        lines = [label_line(img_path, class_id, params) for img_path, class_id in chunk]
+    results = []
+    for (img_path, class_id), (line, err) in zip(chunk, lines):
+        stem = out_stem(img_path, class_id)
+        if line is not None:
+            place_image(img_path, img_out / f"{stem}{img_path.suffix.lower()}", mode)
+        results.append((img_path, stem, line, err))
+    return results
+
+
+# =========================
+# MANIFEST (SQLite): yol + mtime + boyut + find_bbox ayarları
+# =========================
+def outputs_exist(row):
+    """Manifest satırındaki çıktılar diskte mi (bbox bulunamayan resimlerin çıktısı yoktur)."""
+    return all(p is None or os.path.exists(p) for p in row[3:5])
+
+def open_manifest(out):
+    db = sqlite3.connect(str(Path(out) / MANIFEST))
+    db.execute("""CREATE TABLE IF NOT EXISTS images (
+                      src TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, params TEXT,
+                      out_img TEXT, out_lbl TEXT)""")
+    return db
+
+
+def remove_outputs(*paths):
+    for p in paths:
+        if p:
+            Path(p).unlink(missing_ok=True)
+
+
+def make_labels(src=SRC, out=OUT, workers=None, chunk=CHUNK, mode="link", verbose=True,
+                params=BBOX_PARAMS, full=False, batched=False):
+    """
+    Veri setini süreç havuzunda etiketler. Manifestteki (mtime, boyut, ayar) kaydı değişmeyen
+    ve çıktıları hâlâ diskte olan resimler atlanır; silinen / artık bbox bulunamayan resimlerin eski çıktıları kaldırılır.
+    full=True ise her şey yeniden etiketlenir. batched=True ise bbox'lar parça başına
+    toplu çekirdekle (bbox_batch.py) bulunur. Dönen: (başarılı, hatalı, atlanan) sayıları.
+    """
+    img_out, lbl_out = Path(out) / "images", Path(out) / "labels"
+    img_out.mkdir(parents=True, exist_ok=True)
+    lbl_out.mkdir(parents=True, exist_ok=True)
+    params_key = json.dumps({**params, "batched": bool(batched), "mode": mode}, sort_keys=True)
+
+    db = open_manifest(out)
+    known = {row[0]: row[1:] for row in
+             db.execute("SELECT src, mtime_ns, size, params, out_img, out_lbl FROM images")}
+
+    jobs, stats, skipped = [], {}, 0
+    for img_path, class_id in collect_jobs(src):
+        key = os.path.abspath(img_path)
+        st = img_path.stat()
+        row = known.pop(key, None)
+        if (not full and row is not None and row[:3] == (st.st_mtime_ns, st.st_size, params_key)
+                and outputs_exist(row)):
+            skipped += 1
             continue
+        stats[key] = (st.st_mtime_ns, st.st_size)
+        jobs.append((img_path, class_id))
+
+    # Kaynağı silinmiş resimlerin çıktıları (bayat) kaldırılır
+    for key, row in known.items():
+        remove_outputs(row[3], row[4])
+    db.executemany("DELETE FROM images WHERE src = ?", [(k,) for k in known])
+    db.commit()
+
+    chunks = [jobs[i:i + chunk] for i in range(0, len(jobs), chunk)]
+    ok, fail, done = 0, 0, 0
+    t0 = time.perf_counter()
 
-        x, y, w, h = bbox
-        H, W = gray.shape[:2]
-        xc, yc, ww, hh = to_yolo(x, y, w, h, W, H)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_label_chunk, (c, img_out, mode, params, batched)) for c in chunks]
+        for fut in as_completed(futures):
+            rows = []
+            for img_path, stem, line, err in fut.result():
+                key = os.path.abspath(img_path)
+                out_img = img_out / f"{stem}{img_path.suffix.lower()}"
+                out_lbl = lbl_out / f"{stem}.txt"
+                if line is None:
+                    print(f"{err}:", img_path)
+                    remove_outputs(out_img, out_lbl)
+                    rows.append((key, *stats[key], params_key, None, None))
+                    fail += 1
+                    continue
+                out_lbl.write_text(line)
+                rows.append((key, *stats[key], params_key, str(out_img), str(out_lbl)))
+                ok += 1
+            # Parça bitince manifeste işlenir: yarıda kesilse bile yapılan iş kaybolmaz
+            db.executemany("INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?, ?, ?)", rows)
+            db.commit()
+            done += len(rows)
+            if verbose and len(chunks) > 1:
+                dt = time.perf_counter() - t0
+                print(f"[{done}/{len(jobs)}] {done / dt:.0f} resim/s")
+    db.close()
 
-        # tekil isim verelim: 1_veri_0001.jpg gibi
-        out_stem = f"{class_id}_{img_path.stem}"
-        out_img = IMG_OUT / f"{out_stem}{img_path.suffix.lower()}"
-        out_lbl = LBL_OUT / f"{out_stem}.txt"
+    dt = time.perf_counter() - t0
+    rate = len(jobs) / dt if dt > 0 else 0.0
+    print(f"✅ Label oluşturuldu: {ok} | ❌ Hata: {fail} | ⏭ Değişmeyen: {skipped} | "
+          f"🗑 Silinen: {len(known)} | ⏱ {dt:.2f} s ({rate:.0f} resim/s, "
+          f"{workers or os.cpu_count()} işçi, mod: {mode})")
+    print("➡️ Çıktı klasörü:", Path(out).resolve())
+    return ok, fail, skipped
 
-        # resmi kopyala (yeniden yaz)
-        cv2.imwrite(str(out_img), img)
 
-        # label yaz
-        out_lbl.write_text(f"{class_id} {xc:.6f} {yc:.6f} {ww:.6f} {hh:.6f}\n")
+def main():
+    parser = argparse.ArgumentParser(description="dataset/0..9 -> YOLO etiketleri")
+    parser.add_argument("--src", default=str(SRC))
+    parser.add_argument("--out", default=str(OUT))
+    parser.add_argument("--workers", type=int, default=None, help="Varsayılan: çekirdek sayısı")
+    parser.add_argument("--chunk", type=int, default=CHUNK)
+    parser.add_argument("--mode", choices=["link", "copy"], default="link",
+                        help="Resimleri hard link ile mi yoksa byte kopyası ile mi yerleştir")
+    parser.add_argument("--full", action="store_true", help="Manifesti yok say, hepsini yeniden etiketle")
+    parser.add_argument("--batched", action="store_true",
+                        help="Küçük, aynı boyutlu kırpıntılar için toplu bbox çekirdeği (bbox_batch.py)")
+    args = parser.parse_args()
+    make_labels(args.src, args.out, args.workers, args.chunk, args.mode, full=args.full,
+                batched=args.batched)
 
-        ok += 1
 
-print(f"✅ Label oluşturuldu: {ok} | ❌ Hata: {fail}")
-print("➡️ Çıktı klasörü:", OUT.resolve())
+if __name__ == "__main__":
+    main()
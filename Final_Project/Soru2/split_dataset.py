@@ -1,37 +1,154 @@
-import random, shutil
+import os
+import shutil
+import hashlib
+import argparse
 from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 BASE = Path("dataset_yolo")
-IMG = BASE/"images"
-LBL = BASE/"labels"
-
 OUT = Path("yolo_data")
-train_img = OUT/"images/train"
-val_img   = OUT/"images/val"
-train_lbl = OUT/"labels/train"
-val_lbl   = OUT/"labels/val"
+IMG_EXTS = (".jpg", ".jpeg", ".png")
+VAL_RATIO = 0.2
+SEED = 42
+
+
+def content_key(img_path, seed=SEED):
+    """Bölmeyi belirleyen anahtar: seed + resim byte'larının SHA-1 özeti (isimden bağımsız, kararlı)."""
+    h = hashlib.sha1(str(seed).encode())
+    with open(img_path, "rb") as f:
+        h.update(f.read())
+    return h.hexdigest()
+
+
+def label_class(lbl_path):
+    """Etiket dosyasındaki ilk nesnenin sınıf id'si (boş dosya: -1 = arka plan)."""
+    with open(lbl_path) as f:
+        first = f.readline().split()
+    return int(first[0]) if first else -1
+
+
+def val_quotas(counts, val_ratio):
+    """
+    Sınıf başına val adedi: val_ratio * n_sınıf'ın tam kısmı + toplam round(val_ratio * N)
+    olacak şekilde artanlar en büyük kesirli kısma sahip sınıflara (en büyük kalan yöntemi).
+    counts: {sınıf: adet} -> {sınıf: val adedi}
+    """
+    exact = {c: val_ratio * n for c, n in counts.items()}
+    quota = {c: int(e) for c, e in exact.items()}
+    left = int(round(val_ratio * sum(counts.values()))) - sum(quota.values())
+    for c in sorted(exact, key=lambda c: (-(exact[c] - quota[c]), c))[:max(0, left)]:
+        quota[c] += 1
+    return quota
+
+
+def stratified_split(base=BASE, val_ratio=VAL_RATIO, seed=SEED, workers=os.cpu_count()):
+    """
+    Her sınıf kendi içinde seed + içerik anahtarına göre sıralanır; ilk val_quotas(...) kadarı
+    val'e gider -> her sınıfta val oranı val_ratio'ya en yakın tamsayı, toplam round(val_ratio * N).
+    Aynı veri + seed her zaman aynı bölmeyi verir (isimden bağımsız). Resim eklemek sınıfın
+    kesme noktasını kaydırabilir; o sınıftaki birkaç resim taraf değiştirebilir.
+    Dönen: (train, val) -> [(resim, etiket), ...]
+    """
+    img_dir, lbl_dir = Path(base) / "images", Path(base) / "labels"
+    pairs = []
+    for p in sorted(img_dir.iterdir()):
+        if p.suffix.lower() not in IMG_EXTS:
+            continue
+        lbl = lbl_dir / (p.stem + ".txt")
+        if not lbl.is_file():
+            print("Etiket yok, atlanıyor:", p)
+            continue
+        pairs.append((p, lbl))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        keys = list(pool.map(lambda pr: content_key(pr[0], seed), pairs))
+        classes = list(pool.map(lambda pr: label_class(pr[1]), pairs))
+
+    by_class = defaultdict(list)
+    for key, cls, pair in zip(keys, classes, pairs):
+        by_class[cls].append((key, pair))
+
+    quota = val_quotas({c: len(v) for c, v in by_class.items()}, val_ratio)
+    train, val = [], []
+    for cls in sorted(by_class):
+        items = [pair for _, pair in sorted(by_class[cls])]
+        val += items[:quota[cls]]
+        train += items[quota[cls]:]
+    return train, val
+
+
+def place(src, dst, mode):
+    """copy: byte kopyası, hardlink: aynı inode, symlink: göreli sembolik bağ."""
+    if dst.is_symlink() or dst.exists():
+        # hardlink: aynı inode mu (yollar farklı olduğundan realpath eşleşmez); symlink: hedef aynı mı
+        if mode == "hardlink" and not dst.is_symlink() and os.path.samefile(src, dst):
+            return
+        if mode == "symlink" and dst.is_symlink() and os.path.realpath(dst) == os.path.realpath(src):
+            return
+        dst.unlink()
+    if mode == "hardlink":
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass  # farklı dosya sistemi -> kopya
+    elif mode == "symlink":
+        os.symlink(os.path.relpath(src, dst.parent), dst)
+        return
+    shutil.copyfile(src, dst)
+
+
+def write_split(train, val, out=OUT, mode="hardlink", workers=os.cpu_count()):
+    """
+    mode: copy / hardlink / symlink -> images/{train,val}, labels/{train,val} klasörleri
+          list -> sadece train.txt / val.txt (YOLO resim listesi; etiketler yerinde okunur)
+    """
+    out = Path(out)
+    if mode == "list":
+        out.mkdir(parents=True, exist_ok=True)
+        for name, items in (("train", train), ("val", val)):
+            (out / f"{name}.txt").write_text("".join(f"{img.resolve()}\n" for img, _ in items))
+        return
+
+    jobs = []
+    for name, items in (("train", train), ("val", val)):
+        img_dst, lbl_dst = out / "images" / name, out / "labels" / name
+        img_dst.mkdir(parents=True, exist_ok=True)
+        lbl_dst.mkdir(parents=True, exist_ok=True)
+        wanted = set()
+        for img, lbl in items:
+            jobs.append((img, img_dst / img.name))
+            jobs.append((lbl, lbl_dst / lbl.name))
+            wanted.update((img.name, lbl.name))
+        # Önceki bölmeden kalan (artık diğer tarafta olan) dosyaları temizle
+        for d in (img_dst, lbl_dst):
+            for p in d.iterdir():
+                if p.name not in wanted:
+                    p.unlink()
 
-for p in [train_img, val_img, train_lbl, val_lbl]:
-    p.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda j: place(j[0], j[1], mode), jobs))
 
-imgs = sorted([p for p in IMG.iterdir() if p.suffix.lower() in [".jpg",".jpeg",".png"]])
-random.seed(42)
-random.shuffle(imgs)
 
-split = int(0.8 * len(imgs))
-train_set = imgs[:split]
-val_set   = imgs[split:]
+def main():
+    parser = argparse.ArgumentParser(description="dataset_yolo -> yolo_data (train/val)")
+    parser.add_argument("--base", default=str(BASE))
+    parser.add_argument("--out", default=str(OUT))
+    parser.add_argument("--val", type=float, default=VAL_RATIO)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--mode", choices=["copy", "hardlink", "symlink", "list"], default="hardlink")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="G/Ç thread sayısı")
+    args = parser.parse_args()
 
-def copy_pair(img_path, img_dst, lbl_dst):
-    lbl_path = LBL / (img_path.stem + ".txt")
-    shutil.copy2(img_path, img_dst / img_path.name)
-    shutil.copy2(lbl_path, lbl_dst / lbl_path.name)
+    train, val = stratified_split(args.base, args.val, args.seed, args.workers)
+    write_split(train, val, args.out, args.mode, args.workers)
 
-for p in train_set:
-    copy_pair(p, train_img, train_lbl)
+    print("✅ Train:", len(train), " Val:", len(val), f"(mod: {args.mode})")
+    print("➡️ Çıktı:", Path(args.out).resolve())
+    if args.mode == "list":
+        print("   data.yaml -> train: train.txt, val: val.txt")
 
-for p in val_set:
-    copy_pair(p, val_img, val_lbl)
 
-print("✅ Train:", len(train_set), " Val:", len(val_set))
-print("➡️ Çıktı:", OUT.resolve())
+if __name__ == "__main__":
+    main()
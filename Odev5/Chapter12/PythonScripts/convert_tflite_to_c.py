@@ -1,15 +1,19 @@
 #!/usr/bin/env python3
 """
 convert_tflite_to_c.py
-Basit TFLite->C array çevirici.
+Basit TFLite->C array çevirici (ortak uygulama: tools/tflite_to_c.py).
 Kullanım:
  python convert_tflite_to_c.py models_kws\kws_cnn_int8.tflite kws_model
 Çıktılar: kws_model.c, kws_model.h
 """
 import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "tools"))
+from tflite_to_c import bayt_metne, onbellekli_cevir
+
 def to_c_array(bytes_data, varname):
-    arr = ",".join(str(b) for b in bytes_data)
-    content_c = f'#include "{varname}.h"\n\nconst unsigned char {varname}[] = {{{arr}}};\nconst unsigned int {varname}_len = {len(bytes_data)};\n'
+    # Geriye dönük uyumluluk: (header, content) string'leri döndürür
+    arr = bayt_metne(bytes_data).decode("ascii")
+    content_c = f'#include "{varname}.h"\n\nconst unsigned char {varname}[] __attribute__((aligned(8))) = {{\n{arr}}};\nconst unsigned int {varname}_len = {len(bytes_data)};\n'
     header = f'#pragma once\nextern const unsigned char {varname}[];\nextern const unsigned int {varname}_len;\n'
     return header, content_c
 
@@ -19,11 +23,6 @@ if __name__ == "__main__":
         sys.exit(1)
     tflite_path = sys.argv[1]
     varname = sys.argv[2]
-    with open(tflite_path, "rb") as f:
-        b = f.read()
-    header, content = to_c_array(b, varname)
-    with open(varname + ".h", "w") as hf:
-        hf.write(header)
-    with open(varname + ".c", "w") as cf:
-        cf.write(content)
-    print("Wrote", varname + ".c and " + varname + ".h")
\ No newline at end of file
+    # Model değişmediyse .c/.h'ye dokunulmaz (zaman damgası korunur, firmware yeniden derlenmez)
+    n, durum = onbellekli_cevir(tflite_path, varname, varname)
+    print(f"[{durum}] {varname}.c and {varname}.h ({n} bytes)")
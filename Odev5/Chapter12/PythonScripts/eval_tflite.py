@@ -0,0 +1,77 @@
+# eval_tflite.py
+# Gönderilen .tflite modellerini test setinde değerlendirir (tools/tflite_eval.py havuzu ile).
+# Kullanım:
+#   python eval_tflite.py mnist                          # models_mnist/mnist_cnn_int8.tflite, 10k test
+#   python eval_tflite.py kws --data_dir FSDD            # models_kws/kws_cnn*.tflite, kws_train ile aynı test bölmesi
+#   python eval_tflite.py mnist --models a.tflite b.tflite --threads 8
+# Önişleme eğitim betikleriyle aynıdır: MNIST /255 + kanal ekseni; KWS MFCC deposu
+# (kws_features.py) + global normalize + train_test_split(test_size=0.2, random_state=42, stratify=y).
+import os
+import sys
+import glob
+import json
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "tools"))
+from tflite_eval import BATCH_SIZE, evaluate_model, print_eval
+
+MODELS_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+
+
+def mnist_test():
+    import tensorflow as tf
+
+    _, (x_test, y_test) = tf.keras.datasets.mnist.load_data()
+    return x_test, y_test, lambda xb: xb.astype(np.float32)[..., np.newaxis] / 255.0
+
+
+def kws_test(data_dir, sr, n_mfcc, time_frames, cache_dir, frontend):
+    from sklearn.model_selection import train_test_split
+    from kws_features import load_features
+
+    X, y = load_features(data_dir, sr, n_mfcc, time_frames, cache_dir, frontend=frontend)
+    X = np.asarray(X, dtype=np.float32)
+    X = ((X - np.mean(X)) / (np.std(X) + 1e-8))[..., np.newaxis]
+    _, X_test, _, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    return X_test, y_test, None
+
+
+if __name__ == "__main__":
+    from kws_features import CACHE_DIR, FRONTENDS
+
+    parser = argparse.ArgumentParser(description="TFLite modellerini test setinde değerlendir")
+    parser.add_argument("dataset", choices=["mnist", "kws"])
+    parser.add_argument("--models", nargs="+", default=None,
+                        help="Varsayılan: models_mnist/mnist_cnn_int8.tflite | models_kws/kws_cnn*.tflite")
+    parser.add_argument("--threads", type=int, default=None, help="Interpreter / thread sayısı (varsayılan: çekirdek)")
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE)
+    parser.add_argument("--json", type=str, default=None, help="Raporları JSON olarak yaz")
+    parser.add_argument("--data_dir", type=str, default="FSDD")
+    parser.add_argument("--sr", type=int, default=8000)
+    parser.add_argument("--n_mfcc", type=int, default=13)
+    parser.add_argument("--time_frames", type=int, default=32)
+    parser.add_argument("--cache_dir", type=str, default=CACHE_DIR)
+    parser.add_argument("--frontend", choices=FRONTENDS, default="librosa")
+    args = parser.parse_args()
+
+    if args.dataset == "mnist":
+        models = args.models or [os.path.join(MODELS_ROOT, "models_mnist", "mnist_cnn_int8.tflite")]
+        x, y, transform = mnist_test()
+    else:
+        models = args.models or sorted(glob.glob(os.path.join(MODELS_ROOT, "models_kws", "kws_cnn*.tflite")))
+        x, y, transform = kws_test(args.data_dir, args.sr, args.n_mfcc, args.time_frames,
+                                   args.cache_dir, args.frontend)
+
+    reports = []
+    for path in models:
+        rep = evaluate_model(path, x, y, args.threads, args.batch, transform, num_classes=10)
+        print_eval(rep)
+        reports.append(rep)
+    if len(reports) > 1:
+        print("\nmodel                        giriş   doğruluk   görüntü/s")
+        for r in reports:
+            print(f"{os.path.basename(r['model']):28s} {r['input_dtype']:7s} {r['accuracy'] * 100:7.2f}%  {r['images_per_sec']:10.0f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
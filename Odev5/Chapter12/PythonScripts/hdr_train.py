@@ -1,12 +1,18 @@
 # hdr_train.py
 # Kullanım: python hdr_train.py --epochs 10
 import os
+import sys
 import argparse
 import tensorflow as tf
 from tensorflow.keras import layers, models
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "tools"))
+from quantize import CALIB_DIR, CALIB_SAMPLES, calibration_set, quantize_and_report
+
 parser = argparse.ArgumentParser()
 parser.add_argument("--epochs", type=int, default=10)
+parser.add_argument("--calib_samples", type=int, default=CALIB_SAMPLES, help="int8 kalibrasyon örneği (tabakalı)")
+parser.add_argument("--calib_dir", type=str, default=CALIB_DIR)
 args = parser.parse_args()
 
 # Load MNIST
@@ -44,20 +50,9 @@ model.save(keras_path)
 print("Saved Keras model:", keras_path)
 
 # Convert and quantize
-converter = tf.lite.TFLiteConverter.from_keras_model(model)
-# Full integer quantization (requires representative dataset)
-def representative_data_gen():
-    for i in range(100):
-        img = train_images[i:i+1]
-        yield [img]
-
-converter.optimizations = [tf.lite.Optimize.DEFAULT]
-converter.representative_dataset = representative_data_gen
-converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
-converter.inference_input_type = tf.uint8
-converter.inference_output_type = tf.uint8
-
-tflite_model = converter.convert()
-with open(os.path.join(out_dir, "mnist_cnn_int8.tflite"), "wb") as f:
-    f.write(tflite_model)
-print("Saved int8 TFLite model.")
\ No newline at end of file
+# Full integer quantization: sınıf başına eşit örnekli kalibrasyon seti (bir kez seçilir, .npy önbellekte)
+calib = calibration_set("mnist_hdr", train_images, train_labels, n=args.calib_samples, cache_dir=args.calib_dir)
+int8_path = os.path.join(out_dir, "mnist_cnn_int8.tflite")
+quantize_and_report(model, calib, test_images, test_labels, int8_path, io_dtype="uint8",
+                    float_path=os.path.join(out_dir, "mnist_cnn.tflite"))
+print("Saved int8 TFLite model:", int8_path)
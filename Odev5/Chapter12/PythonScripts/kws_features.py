@@ -0,0 +1,188 @@
+# kws_features.py
+# MFCC öznitelik deposu: WAV -> (n_mfcc, time_frames) float32, tek memmap .npy içinde.
+#   <cache_dir>/mfcc_sr<sr>_m<n_mfcc>_t<time_frames>/features.npy   (N, n_mfcc, time_frames)
+#                                                   /manifest.json  (satır sırasıyla dosyalar)
+# Manifestte her dosya için boyut + mtime_ns + SHA-1 tutulur. Boyut/mtime aynıysa özet
+# yeniden hesaplanmaz; özet aynıysa (dosya adı değişse bile) eski satır kopyalanır.
+# Sadece yeni/değişen dosyalar süreç havuzunda çözülür -> sonraki çalıştırmalarda ses
+# çözme (librosa.load) hiç yapılmaz.
+# frontend: "librosa" (varsayılan, dosya dosya) | "numpy" (mfcc_frontend.py, toplu, librosa ile
+# ~1e-4 içinde aynı) | "q15" (MCU'daki int16 zincirinin taklidi). Her biri ayrı depo klasörü.
+# Kullanım: python kws_features.py --data_dir FSDD   (depoyu önceden doldurmak için)
+import os
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+CACHE_DIR = ".kws_cache"
+FEATURE_VERSION = 1      # hesap değişirse artır -> eski depo geçersiz
+CHUNK = 64               # süreç başına tek seferde gönderilen dosya sayısı
+FRONTENDS = ("librosa", "numpy", "q15")
+
+
+def file_digest(path, chunk=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(chunk)
+            if not data:
+                break
+            h.update(data)
+    return h.hexdigest()
+
+
+def fix_frames(mfcc, time_frames):
+    # mfcc shape = (n_mfcc, frames). Sabitle: pad veya trim frames
+    if mfcc.shape[1] < time_frames:
+        pad_width = time_frames - mfcc.shape[1]
+        return np.pad(mfcc, ((0, 0), (0, pad_width)), mode='constant')
+    return mfcc[:, :time_frames]
+
+
+def wav_mfcc(path, sr, n_mfcc, time_frames):
+    """Tek dosya: librosa.load + librosa MFCC + pad/trim (kws_train'in eski yolu)."""
+    import librosa
+
+    wav, _ = librosa.load(path, sr=sr)
+    mfcc = librosa.feature.mfcc(y=wav, sr=sr, n_mfcc=n_mfcc)
+    return fix_frames(mfcc, time_frames).astype(np.float32)
+
+
+def compute_mfcc(paths, sr, n_mfcc, time_frames, frontend="librosa"):
+    """Dosya listesinin MFCC'leri, (k, n_mfcc, time_frames) float32 (depo kullanmadan)."""
+    if frontend != "librosa":
+        from mfcc_frontend import wav_mfcc_batch
+        return wav_mfcc_batch(paths, sr, n_mfcc, time_frames, fixed_point=(frontend == "q15"))
+    return np.stack([wav_mfcc(p, sr, n_mfcc, time_frames) for p in paths])
+
+
+def _mfcc_chunk(args):
+    """İşçi süreç: bir parça dosya."""
+    return compute_mfcc(*args)
+
+
+def store_dir(cache_dir, sr, n_mfcc, time_frames, frontend="librosa"):
+    suffix = "" if frontend == "librosa" else f"_{frontend}"
+    return os.path.join(cache_dir, f"mfcc_sr{sr}_m{n_mfcc}_t{time_frames}{suffix}")
+
+
+def _read_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write_manifest(path, man):
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(man, f, indent=1)
+    os.replace(tmp, path)
+
+
+def build_feature_store(data_dir, sr=8000, n_mfcc=13, time_frames=32, cache_dir=CACHE_DIR,
+                        workers=None, chunk=CHUNK, verbose=True, frontend="librosa"):
+    """
+    data_dir'deki .wav dosyalarının MFCC deposunu günceller.
+    Dönen: (X, names) -> X: (N, n_mfcc, time_frames) float32 memmap (salt okunur),
+           names: X satırlarıyla aynı sırada dosya adları (sıralı).
+    """
+    if frontend not in FRONTENDS:
+        raise ValueError(f"Bilinmeyen frontend: {frontend} (seçenekler: {FRONTENDS})")
+    out_dir = store_dir(cache_dir, sr, n_mfcc, time_frames, frontend)
+    npy_path = os.path.join(out_dir, "features.npy")
+    man_path = os.path.join(out_dir, "manifest.json")
+    params = {"version": FEATURE_VERSION, "sr": sr, "n_mfcc": n_mfcc, "time_frames": time_frames,
+              "frontend": frontend}
+
+    man = _read_manifest(man_path)
+    old = None
+    if man.get("params") == params and os.path.exists(npy_path):
+        old = np.load(npy_path, mmap_mode="r")
+        if len(old) != len(man.get("files", [])):
+            old = None
+    old_files = man.get("files", []) if old is not None else []
+    by_name = {e["name"]: e for e in old_files}
+    row_of = {e["sha1"]: i for i, e in enumerate(old_files)}
+
+    names = sorted(f for f in os.listdir(data_dir) if f.endswith(".wav"))
+    entries, todo = [], []
+    for name in names:
+        st = os.stat(os.path.join(data_dir, name))
+        prev = by_name.get(name)
+        if prev and prev["size"] == st.st_size and prev["mtime_ns"] == st.st_mtime_ns:
+            digest = prev["sha1"]
+        else:
+            digest = file_digest(os.path.join(data_dir, name))
+        entries.append({"name": name, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": digest})
+        if digest not in row_of:
+            todo.append(len(entries) - 1)
+
+    unchanged = old is not None and not todo and [e["sha1"] for e in entries] == \
+        [e["sha1"] for e in old_files]
+    if unchanged:
+        if entries != old_files:          # sadece mtime değişmiş: manifesti tazele
+            man["files"] = entries
+            _write_manifest(man_path, man)
+        if verbose:
+            print(f"MFCC deposu güncel: {len(entries)} dosya ({out_dir})")
+        return old, names
+
+    t0 = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    tmp_path = npy_path + f".tmp{os.getpid()}.npy"
+    X = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32,
+                                  shape=(len(entries), n_mfcc, time_frames))
+    # Özeti bilinen satırlar eski depodan kopyalanır (ses çözülmez)
+    for i, e in enumerate(entries):
+        j = row_of.get(e["sha1"])
+        if j is not None:
+            X[i] = old[j]
+
+    # Yeni / değişen dosyalar süreç havuzunda
+    parts = [todo[i:i + chunk] for i in range(0, len(todo), chunk)]
+    tasks = [([os.path.join(data_dir, entries[i]["name"]) for i in p], sr, n_mfcc, time_frames,
+               frontend) for p in parts]
+    if parts:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for p, feats in zip(parts, pool.map(_mfcc_chunk, tasks)):
+                X[p] = feats
+    X.flush()
+    del X, old
+    os.replace(tmp_path, npy_path)
+    _write_manifest(man_path, {"params": params, "files": entries})
+
+    if verbose:
+        print(f"MFCC deposu: {len(todo)} dosya hesaplandı, {len(entries) - len(todo)} önbellekten "
+              f"({time.perf_counter() - t0:.2f} s, {out_dir})")
+    return np.load(npy_path, mmap_mode="r"), names
+
+
+def load_features(data_dir, sr=8000, n_mfcc=13, time_frames=32, cache_dir=CACHE_DIR, workers=None,
+                  frontend="librosa"):
+    """Depodan (X, y): X (N, n_mfcc, time_frames) float32 memmap, y FSDD adından rakam."""
+    X, names = build_feature_store(data_dir, sr, n_mfcc, time_frames, cache_dir, workers,
+                                   frontend=frontend)
+    # FSDD file name formati: <digit>_<speaker>_<index>.wav
+    y = np.array([int(f.split("_")[0]) for f in names], dtype=np.int32)
+    return X, y
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FSDD MFCC öznitelik deposunu oluştur/güncelle")
+    parser.add_argument("--data_dir", type=str, default="FSDD")
+    parser.add_argument("--sr", type=int, default=8000)
+    parser.add_argument("--n_mfcc", type=int, default=13)
+    parser.add_argument("--time_frames", type=int, default=32)
+    parser.add_argument("--cache_dir", type=str, default=CACHE_DIR)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--frontend", choices=FRONTENDS, default="librosa")
+    args = parser.parse_args()
+    X, y = load_features(args.data_dir, args.sr, args.n_mfcc, args.time_frames, args.cache_dir,
+                         args.workers, args.frontend)
+    print("X:", X.shape, "y:", np.bincount(y).tolist())
@@ -1,40 +1,43 @@
 # kws_train.py
 # Kullanım: python kws_train.py --data_dir path/to/FSDD --epochs 30
 import os
+import sys
 import argparse
 import numpy as np
-import librosa
 import tensorflow as tf
 from sklearn.model_selection import train_test_split
 from tensorflow.keras import layers, models
 
+from kws_features import CACHE_DIR, FRONTENDS, load_features, compute_mfcc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "tools"))
+from quantize import CALIB_DIR, CALIB_SAMPLES, calibration_set, quantize_and_report
+
 parser = argparse.ArgumentParser()
 parser.add_argument("--data_dir", type=str, default="FSDD", help="FSDD wav files directory")
 parser.add_argument("--sr", type=int, default=8000)
 parser.add_argument("--n_mfcc", type=int, default=13)
 parser.add_argument("--time_frames", type=int, default=32)  # örnek
 parser.add_argument("--epochs", type=int, default=30)
+parser.add_argument("--cache_dir", type=str, default=CACHE_DIR, help="MFCC deposu (kws_features.py)")
+parser.add_argument("--workers", type=int, default=None, help="MFCC hesaplayan süreç sayısı")
+parser.add_argument("--no_cache", action="store_true", help="Depoyu kullanma, her dosyayı yeniden çöz")
+parser.add_argument("--frontend", choices=FRONTENDS, default="librosa",
+                    help="MFCC hesabı: librosa | numpy (toplu) | q15 (MCU int16 zinciri taklidi)")
+parser.add_argument("--calib_samples", type=int, default=CALIB_SAMPLES, help="int8 kalibrasyon örneği (tabakalı)")
+parser.add_argument("--calib_dir", type=str, default=CALIB_DIR)
 args = parser.parse_args()
 
-def load_wavs_mfcc(data_dir, sr, n_mfcc, time_frames):
-    X = []
-    y = []
-    files = [f for f in os.listdir(data_dir) if f.endswith(".wav")]
-    for f in files:
-        path = os.path.join(data_dir, f)
+def load_wavs_mfcc(data_dir, sr, n_mfcc, time_frames, cache_dir=CACHE_DIR, workers=None,
+                   frontend="librosa"):
+    if cache_dir:
+        # Depodan: değişmeyen dosyalar için ses çözülmez (bkz. kws_features.py)
+        X, y = load_features(data_dir, sr, n_mfcc, time_frames, cache_dir, workers, frontend)
+    else:
+        files = sorted(f for f in os.listdir(data_dir) if f.endswith(".wav"))
+        X = compute_mfcc([os.path.join(data_dir, f) for f in files], sr, n_mfcc, time_frames, frontend)
         # FSDD file name formati: <digit>_<speaker>_<index>.wav
-        label = int(f.split("_")[0])
-        wav, _ = librosa.load(path, sr=sr)
-        # MFCC
-        mfcc = librosa.feature.mfcc(y=wav, sr=sr, n_mfcc=n_mfcc)
-        # mfcc shape = (n_mfcc, frames). Sabitle: pad veya trim frames
-        if mfcc.shape[1] < time_frames:
-            pad_width = time_frames - mfcc.shape[1]
-            mfcc = np.pad(mfcc, ((0,0),(0,pad_width)), mode='constant')
-        else:
-            mfcc = mfcc[:, :time_frames]
-        X.append(mfcc)
-        y.append(label)
+        y = [int(f.split("_")[0]) for f in files]
     X = np.array(X).astype(np.float32)
     y = np.array(y).astype(np.int32)
     # normalize per-feature
@@ -44,7 +47,8 @@ def load_wavs_mfcc(data_dir, sr, n_mfcc, time_frames):
     return X, y
 
 print("Loading data...")
-X, y = load_wavs_mfcc(args.data_dir, args.sr, args.n_mfcc, args.time_frames)
+X, y = load_wavs_mfcc(args.data_dir, args.sr, args.n_mfcc, args.time_frames,
+                      None if args.no_cache else args.cache_dir, args.workers, args.frontend)
 num_classes = len(np.unique(y))
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
 
@@ -87,4 +91,10 @@ converter.optimizations = [tf.lite.Optimize.DEFAULT]
 tflite_quant = converter.convert()
 with open(os.path.join(out_dir, "kws_cnn_quant.tflite"), "wb") as f:
     f.write(tflite_quant)
-print("Saved quantized TFLite model.")
\ No newline at end of file
+print("Saved quantized TFLite model.")
+
+# Full integer quantization (int8 giriş/çıkış, MCU için): X_train'den tabakalı kalibrasyon seti
+calib = calibration_set(f"kws_{args.frontend}", X_train, y_train, n=args.calib_samples, cache_dir=args.calib_dir)
+int8_path = os.path.join(out_dir, "kws_cnn_int8.tflite")
+quantize_and_report(model, calib, X_test, y_test, int8_path, io_dtype="int8")
+print("Saved int8 TFLite model:", int8_path)
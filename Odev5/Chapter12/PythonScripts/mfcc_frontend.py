@@ -0,0 +1,242 @@
+# mfcc_frontend.py
+# Saf NumPy, toplu (N, samples) MFCC: librosa.feature.mfcc varsayılanlarının karşılığı
+#   center=True (sıfır dolgu) -> Hann (periyodik) -> rFFT -> |X|^2 -> mel (Slaney) ->
+#   power_to_db(ref=1, amin=1e-10, top_db=80, klip başına) -> DCT-II (ortho) -> ilk n_mfcc
+# Çerçeveler stride trick ile kopyasız görünüm, FFT tüm yığın için tek np.fft.rfft çağrısı.
+# Mel filtre bankası, Hann penceresi ve DCT matrisi ayar başına bir kez hesaplanır (lru_cache).
+# fixed_point=True: MCU'daki int16 (CMSIS-DSP q15) zincirinin nicemleme noktaları taklit edilir:
+#   int16 örnek, Q15 pencere (>>15), çerçeve başına tam ölçeğe kaydırma (arm_mfcc_q15 gibi),
+#   FFT çıktısı 1/n_fft ölçekli int16 (arm_rfft_q15 gibi),
+#   tamsayı güç, Q15 mel katsayıları ile int64 birikim; log ve DCT float (ölçek log'a eklenir).
+# Bit bit CMSIS değil; float yola göre nicemleme hatasını görmek için. python mfcc_frontend.py
+# librosa ile karşılaştırır ve clip/s ölçer.
+import os
+import time
+import wave
+import argparse
+from functools import lru_cache
+
+import numpy as np
+
+N_FFT = 2048          # librosa varsayılanları (kws_train bunlarla eğitildi)
+HOP_LENGTH = 512
+N_MELS = 128
+TOP_DB = 80.0
+AMIN = 1e-10
+BATCH = 64            # tek FFT çağrısındaki klip sayısı (bellek ~ BATCH * çerçeve * n_fft)
+
+
+# ==========================================
+# ÖNCEDEN HESAPLANAN MATRİSLER
+# ==========================================
+def hz_to_mel(f):
+    """Slaney mel ölçeği (librosa htk=False): 1 kHz altı doğrusal, üstü logaritmik."""
+    f = np.asarray(f, dtype=np.float64)
+    f_sp, min_log_hz, logstep = 200.0 / 3, 1000.0, np.log(6.4) / 27.0
+    log_mel = min_log_hz / f_sp + np.log(np.maximum(f, min_log_hz) / min_log_hz) / logstep
+    return np.where(f >= min_log_hz, log_mel, f / f_sp)
+
+
+def mel_to_hz(m):
+    m = np.asarray(m, dtype=np.float64)
+    f_sp, min_log_hz, logstep = 200.0 / 3, 1000.0, np.log(6.4) / 27.0
+    min_log_mel = min_log_hz / f_sp
+    return np.where(m >= min_log_mel, min_log_hz * np.exp(logstep * (m - min_log_mel)), f_sp * m)
+
+
+@lru_cache(maxsize=None)
+def mel_filterbank(sr, n_fft=N_FFT, n_mels=N_MELS, fmin=0.0, fmax=None):
+    """(n_mels, 1 + n_fft//2) float32 üçgen filtreler, Slaney alan normalizasyonu (salt okunur)."""
+    fmax = sr / 2.0 if fmax is None else fmax
+    fftfreqs = np.linspace(0, sr / 2.0, 1 + n_fft // 2)
+    mel_f = mel_to_hz(np.linspace(hz_to_mel(fmin), hz_to_mel(fmax), n_mels + 2))
+    fdiff = np.diff(mel_f)
+    ramps = mel_f[:, None] - fftfreqs[None, :]
+    lower = -ramps[:-2] / fdiff[:-1, None]
+    upper = ramps[2:] / fdiff[1:, None]
+    weights = np.maximum(0, np.minimum(lower, upper))
+    weights *= (2.0 / (mel_f[2:n_mels + 2] - mel_f[:n_mels]))[:, None]
+    weights = weights.astype(np.float32)
+    weights.flags.writeable = False
+    return weights
+
+
+@lru_cache(maxsize=None)
+def dct_matrix(n_mfcc, n_mels=N_MELS):
+    """(n_mfcc, n_mels) DCT-II ortho satırları (scipy.fftpack.dct(norm='ortho') ile aynı)."""
+    n = np.arange(n_mels)
+    k = np.arange(n_mfcc)[:, None]
+    d = np.cos(np.pi * (2 * n + 1) * k / (2.0 * n_mels)) * np.sqrt(2.0 / n_mels)
+    d[0] /= np.sqrt(2.0)
+    d = d.astype(np.float32)
+    d.flags.writeable = False
+    return d
+
+
+@lru_cache(maxsize=None)
+def hann_window(n_fft):
+    """Periyodik Hann (scipy get_window('hann', fftbins=True))."""
+    w = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(n_fft) / n_fft)).astype(np.float32)
+    w.flags.writeable = False
+    return w
+
+
+# ==========================================
+# TOPLU MFCC
+# ==========================================
+def frame_signals(x, n_fft=N_FFT, hop_length=HOP_LENGTH):
+    """(N, L) -> center dolgulu (N, F, n_fft) kopyasız çerçeve görünümü, F = 1 + L // hop."""
+    pad = n_fft // 2
+    xp = np.pad(x, ((0, 0), (pad, pad)))
+    n_frames = 1 + (xp.shape[1] - n_fft) // hop_length
+    s0, s1 = xp.strides
+    return np.lib.stride_tricks.as_strided(xp, shape=(x.shape[0], n_frames, n_fft),
+                                           strides=(s0, s1 * hop_length, s1), writeable=False)
+
+
+def _power_db_float(frames, sr, n_fft, n_mels):
+    spec = np.fft.rfft(frames * hann_window(n_fft), axis=-1)
+    power = spec.real ** 2 + spec.imag ** 2                               # (N, F, n_fft//2 + 1)
+    mel = power.astype(np.float32) @ mel_filterbank(sr, n_fft, n_mels).T   # (N, F, n_mels)
+    return 10.0 * np.log10(np.maximum(mel, AMIN))
+
+
+def _power_db_fixed(frames_q15, sr, n_fft, n_mels):
+    """int16 örnek çerçeveleri üzerinde q15 zinciri taklidi -> dB (float yol ile aynı birim)."""
+    win_q15 = np.round(hann_window(n_fft).astype(np.float64) * 32767).astype(np.int32)
+    xw = (frames_q15.astype(np.int32) * win_q15) >> 15                    # arm_mult_q15
+    # arm_mfcc_q15 gibi: çerçeve tam ölçeğe kaydırılır (blok kayan nokta), kayma log'da geri alınır
+    peak = np.abs(xw).max(axis=-1, keepdims=True)
+    shift = np.where(peak > 0, np.floor(np.log2(32767.0 / np.maximum(peak, 1))), 0).astype(np.int32)
+    xw <<= shift
+    spec = np.fft.rfft(xw, axis=-1) / n_fft                              # arm_rfft_q15: 1/N ölçek
+    re = np.clip(np.round(spec.real), -32768, 32767).astype(np.int64)
+    im = np.clip(np.round(spec.imag), -32768, 32767).astype(np.int64)
+    power = re * re + im * im                                            # Q30 tamsayı
+    fb = mel_filterbank(sr, n_fft, n_mels).astype(np.float64)
+    fb_max = fb.max()
+    fb_q15 = np.round(fb / fb_max * 32767).astype(np.int64)
+    mel = power @ fb_q15.T                                               # int64 birikim
+    # Gerçek birim: x = q / 32768, X = X_q * n_fft / 32768, W = W_q * fb_max / 32767
+    scale = (n_fft / 32768.0) ** 2 * fb_max / 32767.0
+    db = 10.0 * np.log10(np.maximum(mel * scale, AMIN)) - shift * (20.0 * np.log10(2.0))
+    return db.astype(np.float32)
+
+
+def mfcc_batch(wavs, sr=8000, n_mfcc=13, n_fft=N_FFT, hop_length=HOP_LENGTH, n_mels=N_MELS,
+               lengths=None, time_frames=None, fixed_point=False, top_db=TOP_DB):
+    """
+    wavs   : (N, L) float32 [-1, 1] (fixed_point=True ise int16 de olabilir), sağdan sıfır dolgulu
+    lengths: (N,) gerçek örnek sayıları; klip başına çerçeve sayısı 1 + len // hop, fazlası 0 yapılır
+             (librosa'nın tek tek çalıştırılıp sonra sıfırla doldurulmasıyla aynı sonuç)
+    time_frames: verilirse çıktı (N, n_mfcc, time_frames) olarak kırpılır/doldurulur
+    Dönen: (N, n_mfcc, F) float32
+    """
+    wavs = np.asarray(wavs)
+    n = wavs.shape[0]
+    lengths = np.full(n, wavs.shape[1]) if lengths is None else np.asarray(lengths)
+    if fixed_point:
+        if wavs.dtype != np.int16:
+            wavs = np.clip(np.round(wavs * 32768.0), -32768, 32767).astype(np.int16)
+        frames = frame_signals(wavs, n_fft, hop_length)
+        db = _power_db_fixed(frames, sr, n_fft, n_mels)
+    else:
+        frames = frame_signals(wavs.astype(np.float32, copy=False), n_fft, hop_length)
+        db = _power_db_float(frames, sr, n_fft, n_mels)
+
+    # Klibin gerçek çerçeveleri dışındakiler top_db maksimumuna katılmaz ve sonunda 0 olur
+    n_valid = 1 + lengths // hop_length
+    valid = np.arange(db.shape[1])[None, :] < n_valid[:, None]           # (N, F)
+    if top_db is not None:
+        peak = np.where(valid[..., None], db, -np.inf).max(axis=(1, 2))
+        np.maximum(db, (peak - top_db)[:, None, None], out=db)
+    mfcc = db @ dct_matrix(n_mfcc, n_mels).T                              # (N, F, n_mfcc)
+    mfcc[~valid] = 0.0
+    mfcc = mfcc.transpose(0, 2, 1)
+
+    if time_frames is not None:
+        out = np.zeros((n, n_mfcc, time_frames), dtype=np.float32)
+        k = min(time_frames, mfcc.shape[2])
+        out[:, :, :k] = mfcc[:, :, :k]
+        return out
+    return np.ascontiguousarray(mfcc, dtype=np.float32)
+
+
+# ==========================================
+# WAV OKUMA
+# ==========================================
+def read_wav(path, sr):
+    """PCM WAV -> int16 mono örnekler (wave modülü). Örnekleme hızı farklıysa librosa ile yeniden örneklenir."""
+    with wave.open(path, "rb") as w:
+        rate, ch, width = w.getframerate(), w.getnchannels(), w.getsampwidth()
+        raw = w.readframes(w.getnframes())
+    if width != 2:
+        raise ValueError(f"Sadece 16-bit PCM destekleniyor: {path} ({8 * width}-bit)")
+    x = np.frombuffer(raw, dtype="<i2")
+    if ch > 1:
+        x = x.reshape(-1, ch).mean(axis=1).round().astype(np.int16)
+    if rate != sr:
+        import librosa
+        y = librosa.resample(x.astype(np.float32) / 32768.0, orig_sr=rate, target_sr=sr)
+        x = np.clip(np.round(y * 32768.0), -32768, 32767).astype(np.int16)
+    return x
+
+
+def wav_mfcc_batch(paths, sr, n_mfcc, time_frames, fixed_point=False, batch=BATCH, **kw):
+    """Dosya listesi -> (N, n_mfcc, time_frames) float32. Boya göre sıralı gruplar: dolgu israfı az."""
+    sigs = [read_wav(p, sr) for p in paths]
+    lengths = np.array([len(s) for s in sigs])
+    out = np.empty((len(paths), n_mfcc, time_frames), dtype=np.float32)
+    order = np.argsort(lengths, kind="stable")
+    for i in range(0, len(order), batch):
+        idx = order[i:i + batch]
+        x = np.zeros((len(idx), lengths[idx].max()), dtype=np.int16)
+        for r, j in enumerate(idx):
+            x[r, :lengths[j]] = sigs[j]
+        wavs = x if fixed_point else x.astype(np.float32) / 32768.0
+        out[idx] = mfcc_batch(wavs, sr, n_mfcc, lengths=lengths[idx], time_frames=time_frames,
+                              fixed_point=fixed_point, **kw)
+    return out
+
+
+# ==========================================
+# DOĞRULAMA / BENCHMARK
+# ==========================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NumPy MFCC vs librosa: doğruluk ve clip/s")
+    parser.add_argument("--data_dir", type=str, default="FSDD")
+    parser.add_argument("--sr", type=int, default=8000)
+    parser.add_argument("--n_mfcc", type=int, default=13)
+    parser.add_argument("--time_frames", type=int, default=32)
+    parser.add_argument("--limit", type=int, default=500, help="Karşılaştırılacak dosya sayısı")
+    args = parser.parse_args()
+
+    import librosa
+    from kws_features import wav_mfcc
+
+    files = sorted(f for f in os.listdir(args.data_dir) if f.endswith(".wav"))[:args.limit]
+    paths = [os.path.join(args.data_dir, f) for f in files]
+    n = len(paths)
+
+    t0 = time.perf_counter()
+    ref = np.stack([wav_mfcc(p, args.sr, args.n_mfcc, args.time_frames) for p in paths])
+    t_ref = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    sigs = [read_wav(p, args.sr) for p in paths]
+    t_read = time.perf_counter() - t0
+
+    results = {}
+    for fixed in (False, True):
+        t0 = time.perf_counter()
+        out = wav_mfcc_batch(paths, args.sr, args.n_mfcc, args.time_frames, fixed_point=fixed)
+        results[fixed] = (time.perf_counter() - t0, out)
+
+    print(f"{n} klip, sr={args.sr}, n_mfcc={args.n_mfcc}, time_frames={args.time_frames}")
+    print(f"  librosa (dosya dosya) : {n / t_ref:8.0f} clip/s")
+    for fixed, (dt, out) in results.items():
+        err = np.abs(out - ref)
+        rel = err.max() / np.abs(ref).max()
+        name = "numpy int16/q15     " if fixed else "numpy float (toplu)  "
+        print(f"  {name}: {n / dt:8.0f} clip/s (x{t_ref / dt:.1f}, WAV okuma {t_read / dt * 100:.0f}%)"
+              f" | en büyük fark {err.max():.4f} (göreli {rel:.1e}), ortalama {err.mean():.5f}")
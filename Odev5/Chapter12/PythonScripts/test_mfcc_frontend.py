@@ -0,0 +1,97 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from mfcc_frontend import mfcc_batch
+
+librosa = pytest.importorskip("librosa")
+
+SR = 8000
+N_MFCC = 13
+ATOL = 1e-3           # MFCC değerleri ~±100 aralığında; float yol librosa ile ~1e-5 içinde
+
+
+def tone(n, f, seed=0, amp=0.3, noise=0.05):
+    t = np.arange(n) / SR
+    rng = np.random.default_rng(seed)
+    return (amp * np.sin(2 * np.pi * f * t) + noise * rng.standard_normal(n)).astype(np.float32)
+
+
+def pad_batch(clips):
+    lengths = np.array([len(c) for c in clips])
+    x = np.zeros((len(clips), lengths.max()), dtype=np.float32)
+    for i, c in enumerate(clips):
+        x[i, :len(c)] = c
+    return x, lengths
+
+
+def librosa_mfcc(y, top_db=80.0):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")      # kısa kliplerde "n_fft too large" uyarısı
+        if top_db == 80.0:
+            return librosa.feature.mfcc(y=y, sr=SR, n_mfcc=N_MFCC)
+        S = librosa.power_to_db(librosa.feature.melspectrogram(y=y, sr=SR), top_db=top_db)
+        return librosa.feature.mfcc(S=S, n_mfcc=N_MFCC)
+
+
+def assert_matches_librosa(out, clips, top_db=80.0):
+    for i, c in enumerate(clips):
+        ref = librosa_mfcc(c, top_db)
+        k = ref.shape[1]
+        np.testing.assert_allclose(out[i, :, :k], ref, atol=ATOL)
+        assert not out[i, :, k:].any()       # klibin dışındaki çerçeveler sıfır
+
+
+def test_batch_with_mixed_lengths_matches_librosa():
+    clips = [tone(n, 200 + 100 * i, seed=i) for i, n in enumerate([4000, 6500, 3000, 5120])]
+    x, lengths = pad_batch(clips)
+    assert_matches_librosa(mfcc_batch(x, SR, N_MFCC, lengths=lengths), clips)
+
+
+def test_short_clips_shorter_than_n_fft():
+    clips = [tone(n, 440, seed=n) for n in (300, 800, 1500, 2047)]
+    x, lengths = pad_batch(clips)
+    assert_matches_librosa(mfcc_batch(x, SR, N_MFCC, lengths=lengths), clips)
+
+
+@pytest.mark.parametrize("top_db", [80.0, 40.0, None])
+def test_top_db_floor_per_clip(top_db):
+    # Yüksek ton + neredeyse sessiz bölüm: top_db tabanı devreye girer ve klip başına hesaplanır
+    loud = np.concatenate([tone(2000, 300, amp=0.9), tone(3000, 300, amp=1e-5, noise=1e-6)])
+    quiet = tone(4500, 700, seed=3, amp=0.01, noise=0.001)
+    clips = [loud, quiet]
+    x, lengths = pad_batch(clips)
+    out = mfcc_batch(x, SR, N_MFCC, lengths=lengths, top_db=top_db)
+    assert_matches_librosa(out, clips, top_db)
+
+
+def test_zero_fill_and_silent_clip():
+    silent = np.zeros(3000, dtype=np.float32)
+    clips = [silent, tone(6000, 500)]
+    x, lengths = pad_batch(clips)
+    out = mfcc_batch(x, SR, N_MFCC, lengths=lengths, time_frames=32)
+    assert out.shape == (2, N_MFCC, 32)
+    assert_matches_librosa(out, clips)
+
+
+def test_time_frames_trims_and_pads():
+    clips = [tone(16000, 300), tone(1000, 600)]
+    x, lengths = pad_batch(clips)
+    full = mfcc_batch(x, SR, N_MFCC, lengths=lengths)
+    out = mfcc_batch(x, SR, N_MFCC, lengths=lengths, time_frames=20)
+    np.testing.assert_array_equal(out, full[:, :, :20])
+
+
+def test_fixed_point_error_is_bounded():
+    clips = [tone(n, 250 + 150 * i, seed=i, amp=a)
+             for i, (n, a) in enumerate([(4000, 0.3), (6500, 0.05), (3000, 0.8), (800, 0.2)])]
+    x, lengths = pad_batch(clips)
+    ref = mfcc_batch(x, SR, N_MFCC, lengths=lengths)
+    q15 = mfcc_batch(x, SR, N_MFCC, lengths=lengths, fixed_point=True)
+    err = np.abs(q15 - ref)
+    assert err.mean() < 0.1
+    assert err.max() < 1.0
+    # int16 giriş de aynı sonucu vermeli
+    x16 = np.clip(np.round(x * 32768.0), -32768, 32767).astype(np.int16)
+    np.testing.assert_array_equal(mfcc_batch(x16, SR, N_MFCC, lengths=lengths, fixed_point=True), q15)
@@ -26,6 +26,19 @@
 #define IMG_WIDTH  64
 #define IMG_HEIGHT 64
 #define IMG_SIZE   (IMG_WIDTH * IMG_HEIGHT)
+
+// Cerceve protokolu (PC tarafi: frame_protocol.py)
+// [A5 5A][tip:1][seq:2 LE][uzunluk:2 LE][payload][crc16:2 LE]
+#define FRAME_SYNC0     0xA5
+#define FRAME_SYNC1     0x5A
+#define FRAME_HDR_SIZE  7
+#define FRAME_CRC_SIZE  2
+#define FRAME_IMAGE     0x01
+#define FRAME_PING      0x02
+#define FRAME_NAK       0x03
+
+// RX halka tamponu (2^n). Islem surerken gelen sonraki kareler burada bekler.
+#define RX_RING_SIZE    16384
 /* USER CODE END PD */
 
 /* Private macro -------------------------------------------------------------*/
@@ -38,6 +51,11 @@ UART_HandleTypeDef huart2;
 /* USER CODE BEGIN PV */
 uint8_t image_buffer[IMG_SIZE];
 uint8_t temp_buffer[IMG_SIZE];
+
+uint8_t rx_ring[RX_RING_SIZE];
+volatile uint32_t rx_head = 0;   // ISR yazar
+uint32_t rx_tail = 0;            // ana dongu okur
+uint8_t rx_byte;
 /* USER CODE END PV */
 
 /* Private function prototypes -----------------------------------------------*/
@@ -49,6 +67,9 @@ void Apply_Otsu(uint8_t* img, int size);
 void Apply_Erosion(uint8_t* src, uint8_t* dest);
 void Apply_Dilation(uint8_t* src, uint8_t* dest);
 uint8_t get_pixel(uint8_t* img, int x, int y);
+uint16_t crc16_update(uint16_t crc, const uint8_t* data, int len);
+int Frame_Poll(uint8_t* tip, uint16_t* seq, uint8_t* payload, uint16_t* len);
+void Frame_Send(uint8_t tip, uint16_t seq, const uint8_t* payload, uint16_t len);
 /* USER CODE END PFP */
 
 /* Private user code ---------------------------------------------------------*/
@@ -129,6 +150,93 @@ void Apply_Dilation(uint8_t* src, uint8_t* dest) {
     }
     memcpy(src, dest, IMG_SIZE);
 }
+
+// --- CRC16-CCITT (poly 0x1021, baslangic 0xFFFF) ---
+uint16_t crc16_update(uint16_t crc, const uint8_t* data, int len) {
+    for (int i = 0; i < len; i++) {
+        crc ^= (uint16_t)data[i] << 8;
+        for (int b = 0; b < 8; b++) {
+            crc = (crc & 0x8000) ? (uint16_t)((crc << 1) ^ 0x1021) : (uint16_t)(crc << 1);
+        }
+    }
+    return crc;
+}
+
+// --- UART RX: her byte kesme ile halka tampona yazilir ---
+void HAL_UART_RxCpltCallback(UART_HandleTypeDef *huart) {
+    if (huart->Instance == USART2) {
+        if (rx_head - rx_tail < RX_RING_SIZE) {
+            rx_ring[rx_head & (RX_RING_SIZE - 1)] = rx_byte;
+            rx_head++;
+        }
+        HAL_UART_Receive_IT(&huart2, &rx_byte, 1);
+    }
+}
+
+void HAL_UART_ErrorCallback(UART_HandleTypeDef *huart) {
+    // Overrun vb. hatada alimi yeniden baslat; bozuk kare CRC ile yakalanir
+    if (huart->Instance == USART2) {
+        HAL_UART_Receive_IT(&huart2, &rx_byte, 1);
+    }
+}
+
+static uint8_t ring_peek(uint32_t off) {
+    return rx_ring[(rx_tail + off) & (RX_RING_SIZE - 1)];
+}
+
+// --- Cerceve Cozme ---
+// 1: gecerli kare, 0: veri eksik, -1: CRC hatasi (seq dolu, NAK gonderilmeli)
+int Frame_Poll(uint8_t* tip, uint16_t* seq, uint8_t* payload, uint16_t* len) {
+    while (1) {
+        uint32_t count = rx_head - rx_tail;
+
+        // Senkron byte'larini ara
+        if (count < 2) return 0;
+        if (ring_peek(0) != FRAME_SYNC0 || ring_peek(1) != FRAME_SYNC1) {
+            rx_tail++;
+            continue;
+        }
+        if (count < FRAME_HDR_SIZE) return 0;
+
+        uint8_t hdr[FRAME_HDR_SIZE - 2];
+        for (int i = 0; i < FRAME_HDR_SIZE - 2; i++) hdr[i] = ring_peek(2 + i);
+        uint16_t length = (uint16_t)(hdr[3] | (hdr[4] << 8));
+        if (length > IMG_SIZE) {
+            rx_tail++;  // gecersiz baslik, yeniden senkronize ol
+            continue;
+        }
+        if (count < (uint32_t)(FRAME_HDR_SIZE + length + FRAME_CRC_SIZE)) return 0;
+
+        for (int i = 0; i < length; i++) payload[i] = ring_peek(FRAME_HDR_SIZE + i);
+        uint16_t crc_rx = (uint16_t)(ring_peek(FRAME_HDR_SIZE + length) |
+                                     (ring_peek(FRAME_HDR_SIZE + length + 1) << 8));
+        rx_tail += FRAME_HDR_SIZE + length + FRAME_CRC_SIZE;
+
+        *tip = hdr[0];
+        *seq = (uint16_t)(hdr[1] | (hdr[2] << 8));
+        *len = length;
+
+        uint16_t crc = crc16_update(0xFFFF, hdr, FRAME_HDR_SIZE - 2);
+        crc = crc16_update(crc, payload, length);
+        return (crc == crc_rx) ? 1 : -1;
+    }
+}
+
+// --- Cerceve Gonderme ---
+void Frame_Send(uint8_t tip, uint16_t seq, const uint8_t* payload, uint16_t len) {
+    uint8_t hdr[FRAME_HDR_SIZE] = {
+        FRAME_SYNC0, FRAME_SYNC1, tip,
+        (uint8_t)(seq & 0xFF), (uint8_t)(seq >> 8),
+        (uint8_t)(len & 0xFF), (uint8_t)(len >> 8)
+    };
+    uint16_t crc = crc16_update(0xFFFF, &hdr[2], FRAME_HDR_SIZE - 2);
+    crc = crc16_update(crc, payload, len);
+    uint8_t tail[FRAME_CRC_SIZE] = { (uint8_t)(crc & 0xFF), (uint8_t)(crc >> 8) };
+
+    HAL_UART_Transmit(&huart2, hdr, FRAME_HDR_SIZE, 1000);
+    if (len > 0) HAL_UART_Transmit(&huart2, (uint8_t*)payload, len, 1000);
+    HAL_UART_Transmit(&huart2, tail, FRAME_CRC_SIZE, 1000);
+}
 /* USER CODE END 0 */
 
 /**
@@ -143,10 +251,23 @@ int main(void)
   MX_USART2_UART_Init();
 
   /* USER CODE BEGIN WHILE */
+  // Kesme tabanli alim: kare N islenirken kare N+1 halka tampona dolar
+  HAL_UART_Receive_IT(&huart2, &rx_byte, 1);
+
   while (1)
   {
-    // PC'den 64x64 resim bekle (Timeout: 5000ms)
-    if (HAL_UART_Receive(&huart2, image_buffer, IMG_SIZE, 5000) == HAL_OK)
+    uint8_t tip;
+    uint16_t seq, len;
+    int st = Frame_Poll(&tip, &seq, image_buffer, &len);
+    if (st == 0) continue;
+
+    if (st < 0) {
+        Frame_Send(FRAME_NAK, seq, NULL, 0);
+    }
+    else if (tip == FRAME_PING) {
+        Frame_Send(FRAME_PING, seq, NULL, 0);
+    }
+    else if (tip == FRAME_IMAGE && len == IMG_SIZE)
     {
         // 1. ADIM: Otsu
         Apply_Otsu(image_buffer, IMG_SIZE);
@@ -155,10 +276,12 @@ int main(void)
         Apply_Dilation(image_buffer, temp_buffer);
         Apply_Erosion(image_buffer, temp_buffer);
 
-        // 3. ADIM: Geri Yolla
-        HAL_UART_Transmit(&huart2, image_buffer, IMG_SIZE, 1000);
+        // 3. ADIM: Geri Yolla (ayni seq ile)
+        Frame_Send(FRAME_IMAGE, seq, image_buffer, IMG_SIZE);
+    }
+    else {
+        Frame_Send(FRAME_NAK, seq, NULL, 0);
     }
-    HAL_Delay(50);
   }
   /* USER CODE END WHILE */
 }
@@ -0,0 +1,163 @@
+import os
+import time
+import queue
+import threading
+from collections import deque
+
+import cv2
+import numpy as np
+
+import stm32_ref
+
+# ==========================================
+# TOPLU (BATCH) MOD: KLASÖR / VİDEO -> STM32
+# ==========================================
+# Üretici thread : dosya/video çözme + 64x64 küçültme
+# Seri I/O       : çağıran thread (FrameClient, kayan pencere)
+# Yazıcı thread  : sonuçları diske asenkron yazar
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".pgm")
+_DONE = object()
+VERIFY_CHUNK = 256
+PUT_TIMEOUT = 0.1     # üretici kuyruk doluyken durdurma isteğini bu aralıkla kontrol eder
+
+
+def iter_sources(path):
+    """Klasördeki resimleri veya video karelerini (isim, gri resim) olarak üretir."""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if not name.lower().endswith(IMAGE_EXTS):
+                continue
+            img = cv2.imread(os.path.join(path, name), cv2.IMREAD_GRAYSCALE)
+            if img is None:
+                print(f"[!] Okunamadı, atlanıyor: {name}")
+                continue
+            yield os.path.splitext(name)[0], img
+        return
+
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Klasör veya video açılamadı: {path}")
+    try:
+        i = 0
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            yield f"frame_{i:06d}", cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            i += 1
+    finally:
+        cap.release()
+
+
+def _put(q, item, stop):
+    """Kuyruğa koyar; stop kurulursa (tüketici durdu) beklemeyi bırakıp False döner."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _producer(path, width, height, q, errors, stop):
+    try:
+        for name, img in iter_sources(path):
+            if not _put(q, (name, cv2.resize(img, (width, height))), stop):
+                return
+    except Exception as e:
+        errors.append(e)
+    finally:
+        _put(q, _DONE, stop)
+
+
+def _writer(out_dir, q, errors):
+    while True:
+        item = q.get()
+        if item is _DONE:
+            return
+        if out_dir is None or errors:
+            continue
+        name, img = item
+        try:
+            cv2.imwrite(os.path.join(out_dir, f"{name}.png"), img)
+        except Exception as e:
+            errors.append(e)
+
+
+def run_batch(client, path, out_dir=None, width=64, height=64, queue_size=64, verify=False):
+    """
+    Tek açık seri bağlantı üzerinden tüm klasörü/videoyu işler.
+    out_dir=None ise sonuçlar diske yazılmaz (sadece ölçüm).
+    verify=True ise cihaz çıktıları stm32_ref ile parça parça karşılaştırılır.
+    Dönen değer: işlenen kare sayısı.
+    """
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+
+    in_q = queue.Queue(maxsize=queue_size)
+    out_q = queue.Queue(maxsize=queue_size)
+    errors = []
+    names = deque()
+    stop = threading.Event()   # seri hat / yazıcı hatasında üretici dolu kuyrukta asılı kalmasın
+
+    prod = threading.Thread(target=_producer, args=(path, width, height, in_q, errors, stop), daemon=True)
+    wr = threading.Thread(target=_writer, args=(out_dir, out_q, errors), daemon=True)
+    prod.start()
+    wr.start()
+
+    def frames():
+        while True:
+            item = in_q.get()
+            if item is _DONE:
+                return
+            names.append(item)
+            yield item[1]
+
+    chunk_in, chunk_out, chunk_names = [], [], []
+    bad_frames, bad_pixels = [], 0
+
+    def check_chunk():
+        nonlocal bad_pixels
+        idx, n_pix = stm32_ref.verify(np.stack(chunk_in), np.stack(chunk_out))
+        bad_frames.extend(chunk_names[i] for i in idx)
+        bad_pixels += n_pix
+        chunk_in.clear()
+        chunk_out.clear()
+        chunk_names.clear()
+
+    count = 0
+    t0 = time.perf_counter()
+    try:
+        for result in client.process(frames()):
+            name, img = names.popleft()
+            out_q.put((name, result))
+            count += 1
+            if verify:
+                chunk_in.append(img)
+                chunk_out.append(result)
+                chunk_names.append(name)
+                if len(chunk_in) >= VERIFY_CHUNK:
+                    check_chunk()
+        if verify and chunk_in:
+            check_chunk()
+    finally:
+        stop.set()
+        out_q.put(_DONE)
+        wr.join()
+        prod.join()
+    elapsed = time.perf_counter() - t0
+
+    if errors:
+        raise errors[0]
+
+    fps = count / elapsed if elapsed > 0 else 0.0
+    print(f"[-] Toplu mod: {count} kare / {elapsed:.2f} s -> sürekli {fps:.2f} FPS (okuma+seri+yazma)")
+    print(f"[-] Seri hat: {client.stats.summary()}")
+    if verify:
+        if bad_frames:
+            print(f"[!] Doğrulama: {len(bad_frames)}/{count} kare referanstan farklı ({bad_pixels} piksel)")
+            print(f"    -> İlk hatalı kareler: {', '.join(bad_frames[:10])}")
+        else:
+            print(f"[-] Doğrulama: {count}/{count} kare referansla birebir aynı.")
+    return count
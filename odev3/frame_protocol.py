@@ -0,0 +1,321 @@
+import struct
+import time
+import binascii
+import numpy as np
+
+from stm32_ref import firmware_chain
+
+# ==========================================
+# ÇERÇEVE (FRAME) PROTOKOLÜ
+# ==========================================
+# [A5 5A][tip:1][seq:2 LE][uzunluk:2 LE][payload][crc16:2 LE]
+# CRC16-CCITT (poly 0x1021, başlangıç 0xFFFF); tip..payload üzerinden hesaplanır.
+# STM32 tarafındaki karşılığı: Core/Src/main.c (Frame_Poll / Frame_Send)
+SYNC = b"\xA5\x5A"
+HEADER = struct.Struct("<2sBHH")
+CRC = struct.Struct("<H")
+
+TYPE_IMAGE = 0x01
+TYPE_PING  = 0x02
+TYPE_NAK   = 0x03
+
+# STM32 RX halka tamponu 16 KB -> aynı anda en fazla 3 kare sığar
+MAX_WINDOW = 3
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def crc16(data, crc=0xFFFF):
+    return binascii.crc_hqx(data, crc)
+
+
+def pack_frame(tip, seq, payload=b""):
+    head = HEADER.pack(SYNC, tip, seq & 0xFFFF, len(payload))
+    crc = crc16(payload, crc16(head[2:]))
+    return head + payload + CRC.pack(crc)
+
+
+def read_exact(ser, n):
+    """Timeout dolana kadar tam n byte okumaya çalışır (eksikse kısa döner)."""
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = ser.read(n - len(buf))
+        if not chunk:
+            break
+        buf += chunk
+    return bytes(buf)
+
+
+def read_frame(ser, max_payload):
+    """
+    Bir sonraki geçerli çerçeveyi okur: (tip, seq, payload).
+    Timeout olursa None döner; CRC/uzunluk hatasında ProtocolError fırlatır.
+    """
+    # Senkron byte'larını ara (araya giren çöp byte'ları atla)
+    prev = b""
+    while True:
+        b = ser.read(1)
+        if not b:
+            return None
+        if prev + b == SYNC:
+            break
+        prev = b
+
+    rest = read_exact(ser, HEADER.size - 2)
+    if len(rest) != HEADER.size - 2:
+        return None
+    _, tip, seq, length = HEADER.unpack(SYNC + rest)
+    if length > max_payload:
+        raise ProtocolError(f"Geçersiz uzunluk: {length}")
+
+    body = read_exact(ser, length + CRC.size)
+    if len(body) != length + CRC.size:
+        return None
+    payload, (crc_rx,) = body[:length], CRC.unpack(body[length:])
+    if crc16(payload, crc16(rest)) != crc_rx:
+        raise ProtocolError(f"CRC hatası (seq={seq})")
+    return tip, seq, payload
+
+
+# ==========================================
+# PERFORMANS RAPORU
+# ==========================================
+class LinkStats:
+    def __init__(self):
+        self.rtts = []
+        self.retransmits = 0
+        self.t_start = None
+        self.t_end = None
+
+    def start(self):
+        self.t_start = time.perf_counter()
+
+    def stop(self):
+        self.t_end = time.perf_counter()
+
+    def report(self):
+        elapsed = (self.t_end or time.perf_counter()) - self.t_start
+        n = len(self.rtts)
+        rtt = np.asarray(self.rtts) * 1000.0
+        return {
+            "frames": n,
+            "elapsed_sec": elapsed,
+            "fps": n / elapsed if elapsed > 0 else 0.0,
+            "rtt_p50_ms": float(np.percentile(rtt, 50)) if n else 0.0,
+            "rtt_p99_ms": float(np.percentile(rtt, 99)) if n else 0.0,
+            "retransmits": self.retransmits,
+        }
+
+    def summary(self):
+        r = self.report()
+        return (f"{r['frames']} kare / {r['elapsed_sec']:.2f} s -> {r['fps']:.2f} FPS | "
+                f"RTT p50: {r['rtt_p50_ms']:.1f} ms, p99: {r['rtt_p99_ms']:.1f} ms | "
+                f"tekrar gönderim: {r['retransmits']}")
+
+
+# ==========================================
+# KAYAN PENCERELİ (SLIDING WINDOW) İSTEMCİ
+# ==========================================
+class FrameClient:
+    """
+    Kare N işlenirken kare N+1'i hatta tutar (window > 1).
+    Sonuçlar her zaman gönderim sırasıyla döner.
+    """
+
+    def __init__(self, ser, width=64, height=64, window=2, retries=3):
+        if not 1 <= window <= MAX_WINDOW:
+            raise ValueError(f"window 1..{MAX_WINDOW} aralığında olmalı: {window}")
+        self.ser = ser
+        self.width = width
+        self.height = height
+        self.img_size = width * height
+        self.window = window
+        self.retries = retries
+        self.stats = LinkStats()
+
+    def sync(self, attempts=20):
+        """Sabit time.sleep(2) yerine PING ile kartın hazır olmasını bekler."""
+        self.ser.reset_input_buffer()
+        for i in range(attempts):
+            self.ser.write(pack_frame(TYPE_PING, i))
+            try:
+                frame = read_frame(self.ser, self.img_size)
+            except ProtocolError:
+                continue
+            if frame is not None and frame[0] == TYPE_PING:
+                self.ser.reset_input_buffer()
+                return True
+        return False
+
+    def process(self, images):
+        """images: (H,W) uint8 kareleri üreten iterable. Sonuçları sırayla üretir."""
+        it = iter(images)
+        exhausted = False
+        pending = {}   # seq16 -> [n, payload, t_gonderim, deneme]
+        results = {}   # n -> sonuç
+        n_sent = 0
+        n_next = 0
+        self.stats.start()
+
+        while True:
+            # Pencere dolana kadar yeni kare gönder
+            while not exhausted and len(pending) < self.window:
+                try:
+                    img = next(it)
+                except StopIteration:
+                    exhausted = True
+                    break
+                payload = np.ascontiguousarray(img, dtype=np.uint8).tobytes()
+                if len(payload) != self.img_size:
+                    raise ValueError(f"Kare boyutu {self.width}x{self.height} olmalı")
+                seq = n_sent & 0xFFFF
+                pending[seq] = [n_sent, payload, time.perf_counter(), 0]
+                self.ser.write(pack_frame(TYPE_IMAGE, seq, payload))
+                n_sent += 1
+
+            if not pending:
+                break
+
+            try:
+                frame = read_frame(self.ser, self.img_size)
+            except ProtocolError:
+                frame = None
+
+            if frame is None:
+                # Timeout / bozuk yanıt: sadece en eski onaysız kareyi yeniden gönder.
+                # Hepsini art arda göndermek, firmware'in henüz boşaltmadığı karelerle
+                # birlikte 16 KB RX halkasını taşırıp tek kaybı zincirleme kayba çevirebilir.
+                # Diğer kayıplar, sıraları geldiğinde (en eski olduklarında) tekrar gönderilir.
+                seq, entry = min(pending.items(), key=lambda kv: kv[1][0])
+                entry[3] += 1
+                if entry[3] > self.retries:
+                    raise ProtocolError(f"Kare {entry[0]} için yanıt alınamadı")
+                entry[2] = time.perf_counter()
+                self.ser.write(pack_frame(TYPE_IMAGE, seq, entry[1]))
+                self.stats.retransmits += 1
+                continue
+
+            tip, seq, payload = frame
+            entry = pending.get(seq)
+            if entry is None:
+                continue  # tekrar gönderimden gelen kopya yanıt
+
+            if tip == TYPE_NAK:
+                entry[3] += 1
+                if entry[3] > self.retries:
+                    raise ProtocolError(f"Kare {entry[0]} STM32 tarafından reddedildi")
+                entry[2] = time.perf_counter()
+                self.ser.write(pack_frame(TYPE_IMAGE, seq, entry[1]))
+                self.stats.retransmits += 1
+                continue
+
+            if tip != TYPE_IMAGE or len(payload) != self.img_size:
+                raise ProtocolError(f"Beklenmeyen yanıt (tip={tip}, {len(payload)} byte)")
+
+            del pending[seq]
+            self.stats.rtts.append(time.perf_counter() - entry[2])
+            results[entry[0]] = np.frombuffer(payload, dtype=np.uint8).reshape(self.height, self.width)
+
+            while n_next in results:
+                yield results.pop(n_next)
+                n_next += 1
+
+        self.stats.stop()
+
+
+# ==========================================
+# FIRMWARE TARAFI (main.c Frame_Poll / ana döngü karşılığı)
+# ==========================================
+class FrameParser:
+    """Artımlı çerçeve çözücü: byte akışı feed() ile eklenir, next_frame() ile okunur."""
+
+    def __init__(self, max_payload):
+        self.max_payload = max_payload
+        self.buf = bytearray()
+
+    def __len__(self):
+        return len(self.buf)
+
+    def feed(self, data):
+        self.buf += data
+
+    def next_frame(self):
+        """(tip, seq, payload, crc_ok, toplam_byte) veya veri eksikse None."""
+        while True:
+            idx = self.buf.find(SYNC)
+            if idx < 0:
+                del self.buf[:max(0, len(self.buf) - 1)]
+                return None
+            del self.buf[:idx]
+            if len(self.buf) < HEADER.size:
+                return None
+            _, tip, seq, length = HEADER.unpack_from(self.buf)
+            if length > self.max_payload:
+                del self.buf[:1]  # geçersiz başlık, yeniden senkronize ol
+                continue
+            total = HEADER.size + length + CRC.size
+            if len(self.buf) < total:
+                return None
+            frame = bytes(self.buf[:total])
+            del self.buf[:total]
+
+            payload = frame[HEADER.size:HEADER.size + length]
+            (crc_rx,) = CRC.unpack_from(frame, HEADER.size + length)
+            ok = crc16(payload, crc16(frame[2:HEADER.size])) == crc_rx
+            return tip, seq, payload, ok, total
+
+
+def firmware_reply(frame, width, height, process=firmware_chain):
+    """main.c ana döngüsünün bir kare için ürettiği yanıt çerçevesi."""
+    tip, seq, payload, ok = frame[:4]
+    if not ok:
+        return pack_frame(TYPE_NAK, seq)
+    if tip == TYPE_PING:
+        return pack_frame(TYPE_PING, seq)
+    if tip == TYPE_IMAGE and len(payload) == width * height:
+        img = np.frombuffer(payload, dtype=np.uint8).reshape(height, width)
+        return pack_frame(TYPE_IMAGE, seq, process(img).tobytes())
+    return pack_frame(TYPE_NAK, seq)
+
+
+# ==========================================
+# LOOPBACK (KARTSIZ TEST İÇİN SAHTE SERİ PORT)
+# ==========================================
+class LoopbackSerial:
+    """
+    pyserial arayüzünü taklit eden, STM32 firmware'ini süreç içinde çalıştıran port.
+    Yazılan çerçeveleri çözer ve yanıtları okuma tamponuna koyar (zamanlama modeli yok;
+    gerçekçi baud/işlem süresi için stm32_emulator.py kullanın).
+    """
+
+    def __init__(self, width=64, height=64, process=firmware_chain):
+        self.width = width
+        self.height = height
+        self.process = process
+        self.parser = FrameParser(width * height)
+        self.tx = bytearray()
+        self.is_open = True
+        self.timeout = None
+
+    @property
+    def in_waiting(self):
+        return len(self.tx)
+
+    def write(self, data):
+        self.parser.feed(data)
+        while (frame := self.parser.next_frame()) is not None:
+            self.tx += firmware_reply(frame, self.width, self.height, self.process)
+        return len(data)
+
+    def read(self, n=1):
+        out = bytes(self.tx[:n])
+        del self.tx[:n]
+        return out
+
+    def reset_input_buffer(self):
+        self.tx.clear()
+
+    def close(self):
+        self.is_open = False
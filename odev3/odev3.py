@@ -1,14 +1,21 @@
 import serial
 import cv2
 import numpy as np
-import time
 import sys
 import os
+import argparse
+
+from frame_protocol import FrameClient, LoopbackSerial, ProtocolError, MAX_WINDOW
+from batch_mode import run_batch
+from stm32_emulator import open_loopback, DEFAULT_COMPUTE_MS
+import stm32_ref
 
 # ==========================================
 # AYARLAR
 # ==========================================
 SERIAL_PORT = 'COM3'  # Yarın Aygıt Yöneticisi'nden kontrol edip burayı değiştirin!
+# Kartsız: 'loop://' (süreç içi emülatör), '/dev/pts/N' veya 'socket://localhost:7777'
+# (bkz. stm32_emulator.py)
 BAUD_RATE   = 115200 
 TIMEOUT     = 5       
 
@@ -19,69 +26,121 @@ WIDTH  = 64
 HEIGHT = 64
 IMG_SIZE = WIDTH * HEIGHT
 
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=str, default=SERIAL_PORT)
+    parser.add_argument("--image", type=str, default=IMAGE_NAME)
+    parser.add_argument("--frames", type=int, default=1, help="Aynı resmi N kez gönder (throughput ölçümü)")
+    parser.add_argument("--window", type=int, default=2, help=f"Hatta aynı anda duran kare sayısı (1..{MAX_WINDOW})")
+    parser.add_argument("--loopback", action="store_true", help="Kart yerine süreç içi firmware taklidi kullan (zamanlamasız)")
+    parser.add_argument("--compute-ms", type=float, default=None, help="loop:// emülatöründe STM32 işlem süresi")
+    parser.add_argument("--no-show", action="store_true", help="cv2.imshow penceresi açma")
+    parser.add_argument("--batch", type=str, default=None, help="Klasör veya video dosyası (pencere açmadan toplu işle)")
+    parser.add_argument("--out", type=str, default=None, help="Toplu mod çıktı klasörü (verilmezse diske yazılmaz)")
+    parser.add_argument("--verify", action="store_true", help="Cihaz çıktısını stm32_ref (NumPy) referansıyla karşılaştır")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+
     # 1. Seri Port Bağlantısı
-    print(f"[-] {SERIAL_PORT} portuna bağlanılıyor...")
-    try:
-        ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=TIMEOUT)
-        print(f"[-] Bağlantı başarılı! Port oturması için bekleniyor...")
-        time.sleep(2) 
-    except serial.SerialException:
-        print(f"[!] HATA: {SERIAL_PORT} bulunamadı veya açılamadı.")
-        print("    -> Kabloyu kontrol edin.")
-        print("    -> Aygıt Yöneticisi'nden doğru COM numarasını (Örn: COM5) öğrenin.")
+    emu = None
+    if args.loopback:
+        print("[-] Loopback modu: STM32 firmware'i süreç içinde taklit ediliyor.")
+        ser = LoopbackSerial(WIDTH, HEIGHT)
+    elif args.port == "loop://":
+        compute_ms = args.compute_ms if args.compute_ms is not None else DEFAULT_COMPUTE_MS
+        ser, emu = open_loopback(WIDTH, HEIGHT, BAUD_RATE, compute_ms, timeout=TIMEOUT)
+        print(f"[-] Emülatör modu: {ser.port} ({BAUD_RATE} baud, işlem {compute_ms} ms)")
+    else:
+        print(f"[-] {args.port} portuna bağlanılıyor...")
+        try:
+            ser = serial.serial_for_url(args.port, BAUD_RATE, timeout=TIMEOUT)
+        except serial.SerialException:
+            print(f"[!] HATA: {args.port} bulunamadı veya açılamadı.")
+            print("    -> Kabloyu kontrol edin.")
+            print("    -> Aygıt Yöneticisi'nden doğru COM numarasını (Örn: COM5) öğrenin.")
+            sys.exit()
+
+    client = FrameClient(ser, WIDTH, HEIGHT, window=args.window)
+
+    # Sabit 2 sn beklemek yerine PING ile kartın hazır olmasını bekle
+    ser.timeout = 0.5
+    if not client.sync():
+        print("[!] HATA: STM32 PING'e yanıt vermedi.")
+        print("    -> Kartta çerçeve protokolü destekli firmware olduğundan emin olun.")
+        ser.close()
         sys.exit()
+    ser.timeout = TIMEOUT
+    print(f"[-] Bağlantı başarılı!")
+
+    # Toplu mod: tek bağlantı üzerinden klasör / video
+    if args.batch:
+        try:
+            run_batch(client, args.batch, args.out, WIDTH, HEIGHT, verify=args.verify)
+            if emu is not None:
+                print(f"[-] Emülatör aşamaları: {emu.stats.summary()}")
+        except (ProtocolError, FileNotFoundError) as e:
+            print(f"[!] HATA: {e}")
+        finally:
+            ser.close()
+        return
 
     # 2. Resmi Kontrol Et ve Oku
-    if not os.path.exists(IMAGE_NAME):
-        print(f"[!] HATA: '{IMAGE_NAME}' dosyası bu klasörde yok!")
-        print(f"    -> Lütfen resmin adının kodda yazan '{IMAGE_NAME}' ile aynı olduğundan emin olun.")
+    if not os.path.exists(args.image):
+        print(f"[!] HATA: '{args.image}' dosyası bu klasörde yok!")
+        print(f"    -> Lütfen resmin adının kodda yazan '{args.image}' ile aynı olduğundan emin olun.")
         ser.close()
         sys.exit()
 
-    img = cv2.imread(IMAGE_NAME, 0) # Gri tonlamalı oku
+    img = cv2.imread(args.image, 0) # Gri tonlamalı oku
 
     # Resmi 64x64'e küçült
     img_resized = cv2.resize(img, (WIDTH, HEIGHT))
-    img_data = img_resized.flatten()
 
-    print(f"[-] Resim hazırlandı ve gönderiliyor... ({len(img_data)} byte)")
+    print(f"[-] Resim hazırlandı ve gönderiliyor... ({args.frames} kare x {IMG_SIZE} byte, pencere={args.window})")
 
-    # 3. Gönder ve Al
+    # 3. Gönder ve Al (kayan pencere: kare N işlenirken kare N+1 hatta)
     try:
-        ser.reset_input_buffer()
-        ser.write(img_data.tobytes()) # Gönder
-
-        print("[-] STM32 işliyor... Yanıt bekleniyor...")
-        
-        # Tam veri gelene kadar bekle
-        received_data = ser.read(IMG_SIZE)
-        
-        if len(received_data) != IMG_SIZE:
-            print(f"[!] HATA: Eksik veri! Gelen: {len(received_data)}, Beklenen: {IMG_SIZE}")
-            print("    -> STM32 reset düğmesine basıp tekrar deneyin.")
-        else:
-            print("[-] Veri başarıyla alındı!")
-            
-            # 4. Göster
-            result_img = np.frombuffer(received_data, dtype=np.uint8).reshape((HEIGHT, WIDTH))
+        results = list(client.process(img_resized for _ in range(args.frames)))
+        if not results:
+            print(f"[!] HATA: Hiç kare işlenmedi (--frames {args.frames}); en az 1 kare gönderin.")
+            return
+        result_img = results[-1]
+
+        print("[-] Veri başarıyla alındı!")
+        print(f"[-] {client.stats.summary()}")
+        if emu is not None:
+            print(f"[-] Emülatör aşamaları: {emu.stats.summary()}")
+
+        if args.verify:
+            bad, n_pix = stm32_ref.verify(np.broadcast_to(img_resized, (len(results), HEIGHT, WIDTH)), np.stack(results))
+            if len(bad):
+                print(f"[!] Doğrulama: {len(bad)}/{len(results)} kare referanstan farklı ({n_pix} piksel)")
+            else:
+                print(f"[-] Doğrulama: STM32 çıktısı NumPy referansıyla birebir aynı.")
 
+        # 4. Göster
+        if not args.no_show:
             # Ekranda büyük gözükmesi için 5 kat büyütelim
             scale = 5
             disp_orig = cv2.resize(img_resized, (WIDTH*scale, HEIGHT*scale), interpolation=cv2.INTER_NEAREST)
             disp_res  = cv2.resize(result_img,  (WIDTH*scale, HEIGHT*scale), interpolation=cv2.INTER_NEAREST)
 
-            cv2.imshow(f"Girdi: {IMAGE_NAME}", disp_orig)
+            cv2.imshow(f"Girdi: {args.image}", disp_orig)
             cv2.imshow("Cikti: STM32 Otsu/Morfoloji", disp_res)
             
             print("[-] Sonuç ekranda. Çıkış için bir tuşa basın.")
             cv2.waitKey(0)
             cv2.destroyAllWindows()
 
+    except ProtocolError as e:
+        print(f"[!] HATA: {e}")
+        print("    -> STM32 reset düğmesine basıp tekrar deneyin.")
     except Exception as e:
         print(f"[!] Bir hata oluştu: {e}")
     finally:
         ser.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
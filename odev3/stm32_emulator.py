@@ -0,0 +1,249 @@
+import os
+import sys
+import time
+import socket
+import argparse
+import threading
+import numpy as np
+
+from frame_protocol import FrameParser, firmware_reply, TYPE_IMAGE
+from stm32_ref import firmware_chain
+
+# ==========================================
+# STM32F446 FIRMWARE EMÜLATÖRÜ (KARTSIZ BENCHMARK / CI)
+# ==========================================
+# odev3.py ile aynı çerçeve protokolünü pty veya TCP soket üzerinden konuşur.
+#   pty : python stm32_emulator.py --pty        -> SERIAL_PORT = /dev/pts/N
+#   TCP : python stm32_emulator.py --tcp 7777   -> SERIAL_PORT = socket://localhost:7777
+#   loop: odev3.py --port loop://               -> aynı süreçte pty ile açılır
+# Zamanlama modeli:
+#   * UART 8N1: byte başına 10 bit -> 115200 baud'da 4105 byte'lık kare ~356 ms
+#   * RX kesme ile 16 KB halka tampona alınır (taşarsa byte düşer, main.c gibi)
+#   * İşlem süresi sabit (--compute-ms); 84 MHz'de Otsu + 2x 3x3 morfoloji tahmini
+#   * TX bloklayıcıdır (HAL_UART_Transmit), bu sırada RX devam eder
+RX_RING_SIZE = 16384
+DEFAULT_COMPUTE_MS = 15.0
+
+
+class _FdTransport:
+    def __init__(self, fd):
+        self.fd = fd
+
+    def read(self, n):
+        try:
+            return os.read(self.fd, n)
+        except OSError:
+            return b""  # karşı taraf kapandı (EIO)
+
+    def write(self, data):
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.fd, view):]
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _SocketTransport:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def read(self, n):
+        try:
+            return self.conn.recv(n)
+        except OSError:
+            return b""
+
+    def write(self, data):
+        self.conn.sendall(data)
+
+    def close(self):
+        self.conn.close()
+
+
+class StageStats:
+    """Kare başına aşama süreleri: transfer in / compute / transfer out (ms)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.t_in, self.t_compute, self.t_out = [], [], []
+        self.dropped = 0
+
+    def add(self, t_in, t_compute, t_out):
+        with self.lock:
+            self.t_in.append(t_in * 1000.0)
+            self.t_compute.append(t_compute * 1000.0)
+            self.t_out.append(t_out * 1000.0)
+
+    def report(self):
+        with self.lock:
+            out = {"frames": len(self.t_in), "rx_dropped_bytes": self.dropped}
+            for key, vals in (("transfer_in", self.t_in), ("compute", self.t_compute),
+                              ("transfer_out", self.t_out)):
+                arr = np.asarray(vals)
+                out[f"{key}_mean_ms"] = float(arr.mean()) if len(arr) else 0.0
+                out[f"{key}_p99_ms"] = float(np.percentile(arr, 99)) if len(arr) else 0.0
+            return out
+
+    def summary(self):
+        r = self.report()
+        return (f"{r['frames']} kare | transfer in: {r['transfer_in_mean_ms']:.1f} ms | "
+                f"compute: {r['compute_mean_ms']:.1f} ms | transfer out: {r['transfer_out_mean_ms']:.1f} ms | "
+                f"düşen RX byte: {r['rx_dropped_bytes']}")
+
+
+class Stm32Emulator:
+    def __init__(self, width=64, height=64, baud=115200, compute_ms=DEFAULT_COMPUTE_MS,
+                 process=firmware_chain, verbose=False):
+        self.width = width
+        self.height = height
+        # baud <= 0: kısıtlama yok (sadece protokol/işlem)
+        self.byte_time = 10.0 / baud if baud > 0 else 0.0
+        self.compute_s = compute_ms / 1000.0
+        self.process = process
+        self.verbose = verbose
+        self.stats = StageStats()
+        self._parser = FrameParser(width * height)
+        self._cond = threading.Condition()
+        self._closed = False
+        self._transport = None
+
+    # ---------- Transport kurulumu ----------
+    def serve_pty(self):
+        """Pty açar, emülatörü arka planda başlatır ve bağlanılacak yolu döndürür."""
+        import tty
+        master, slave = os.openpty()
+        tty.setraw(slave)
+        self._slave_fd = slave
+        self.start(_FdTransport(master))
+        return os.ttyname(slave)
+
+    def serve_tcp(self, port, host="localhost"):
+        """Tek istemci kabul eder (bloklar), sonra emülatörü başlatır."""
+        srv = socket.create_server((host, port))
+        print(f"[-] Emülatör dinliyor: socket://{host}:{port}")
+        conn, _ = srv.accept()
+        srv.close()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.start(_SocketTransport(conn))
+
+    def start(self, transport):
+        self._transport = transport
+        self._rx_thread = threading.Thread(target=self._rx_loop, daemon=True)
+        self._fw_thread = threading.Thread(target=self._fw_loop, daemon=True)
+        self._rx_thread.start()
+        self._fw_thread.start()
+
+    def wait(self):
+        self._fw_thread.join()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    # ---------- Zamanlama yardımcıları ----------
+    @staticmethod
+    def _sleep_until(deadline):
+        delay = deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    # ---------- UART RX (kesme + halka tampon) ----------
+    def _rx_loop(self):
+        clock = time.perf_counter()
+        while True:
+            data = self._transport.read(4096)
+            if not data:
+                self.close()
+                return
+            # Byte'lar hattan baud hızında gelir: 64 byte'lık dilimlerle teslim et
+            clock = max(clock, time.perf_counter())
+            for i in range(0, len(data), 64):
+                piece = data[i:i + 64]
+                clock += len(piece) * self.byte_time
+                self._sleep_until(clock)
+                with self._cond:
+                    room = RX_RING_SIZE - len(self._parser)
+                    if room < len(piece):
+                        self.stats.dropped += len(piece) - max(room, 0)
+                        piece = piece[:max(room, 0)]
+                    self._parser.feed(piece)
+                    self._cond.notify()
+
+    # ---------- Ana döngü (Frame_Poll -> işle -> Frame_Send) ----------
+    def _fw_loop(self):
+        while True:
+            with self._cond:
+                frame = self._parser.next_frame()
+                while frame is None and not self._closed:
+                    self._cond.wait()
+                    frame = self._parser.next_frame()
+                if frame is None:
+                    return
+
+            t0 = time.perf_counter()
+            reply = firmware_reply(frame, self.width, self.height, self.process)
+            if frame[0] == TYPE_IMAGE and frame[3]:
+                self._sleep_until(t0 + self.compute_s)
+            t1 = time.perf_counter()
+
+            # Bloklayıcı TX: 64 byte'lık dilimler baud hızında gönderilir
+            clock = t1
+            for i in range(0, len(reply), 64):
+                piece = reply[i:i + 64]
+                clock += len(piece) * self.byte_time
+                self._sleep_until(clock)
+                try:
+                    self._transport.write(piece)
+                except OSError:
+                    self.close()
+                    return
+            t2 = time.perf_counter()
+
+            if frame[0] != TYPE_IMAGE:
+                continue
+            self.stats.add(frame[4] * self.byte_time, t1 - t0, t2 - t1)
+            if self.verbose:
+                print(f"[emu] seq={frame[1]} in={frame[4] * self.byte_time * 1000:.1f} ms "
+                      f"compute={(t1 - t0) * 1000:.1f} ms out={(t2 - t1) * 1000:.1f} ms")
+
+
+def open_loopback(width=64, height=64, baud=115200, compute_ms=DEFAULT_COMPUTE_MS, timeout=5):
+    """
+    SERIAL_PORT = 'loop://' için: emülatörü aynı süreçte pty üzerinde başlatır,
+    (pyserial portu, emülatör) döndürür.
+    """
+    import serial
+    emu = Stm32Emulator(width, height, baud, compute_ms)
+    ser = serial.Serial(emu.serve_pty(), timeout=timeout)
+    return ser, emu
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--pty", action="store_true", help="Pty aç ve yolunu yazdır")
+    group.add_argument("--tcp", type=int, help="TCP port (socket://localhost:PORT)")
+    parser.add_argument("--baud", type=int, default=115200, help="0: kısıtlama yok")
+    parser.add_argument("--compute-ms", type=float, default=DEFAULT_COMPUTE_MS)
+    parser.add_argument("--verbose", action="store_true", help="Her kare için aşama sürelerini yazdır")
+    args = parser.parse_args()
+
+    emu = Stm32Emulator(baud=args.baud, compute_ms=args.compute_ms, verbose=args.verbose)
+    if args.pty:
+        print(f"[-] Emülatör hazır: {emu.serve_pty()}")
+    else:
+        emu.serve_tcp(args.tcp)
+    print(f"[-] {args.baud} baud, işlem {args.compute_ms} ms. Çıkış için Ctrl+C.")
+
+    try:
+        emu.wait()
+    except KeyboardInterrupt:
+        pass
+    print(f"[-] {emu.stats.summary()}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import time
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# ==========================================
+# STM32 FIRMWARE'İNİN BİREBİR (BIT-EXACT) PC KARŞILIĞI
+# ==========================================
+# Core/Src/main.c: Apply_Otsu -> Apply_Dilation -> Apply_Erosion
+# Tüm fonksiyonlar (N,H,W) uint8 yığın (batch) üzerinde çalışır; (H,W) de kabul edilir.
+# Otsu aritmetiği C'deki gibi float32 ve aynı toplama sırasıyla yapılır.
+
+
+def _as_batch(images):
+    images = np.asarray(images, dtype=np.uint8)
+    if images.ndim == 2:
+        return images[np.newaxis], True
+    if images.ndim != 3:
+        raise ValueError(f"(H,W) veya (N,H,W) bekleniyor, gelen: {images.shape}")
+    return images, False
+
+
+def histograms(images):
+    """(N,H,W) -> (N,256) int64 histogram, tek bincount çağrısı ile."""
+    batch, _ = _as_batch(images)
+    n = batch.shape[0]
+    offsets = (np.arange(n, dtype=np.int64) * 256)[:, np.newaxis]
+    flat = batch.reshape(n, -1).astype(np.int64) + offsets
+    return np.bincount(flat.ravel(), minlength=n * 256).reshape(n, 256)
+
+
+def otsu_thresholds(images):
+    """
+    Her kare için Apply_Otsu ile aynı eşiği döndürür: (N,) int.
+    256 eşiğin hepsi tek seferde skorlanır; float32 kümülatif toplam C döngüsüyle
+    aynı sırada (t = 0..255) biriktiği için sonuç bit düzeyinde aynıdır.
+    """
+    batch, _ = _as_batch(images)
+    hist = histograms(batch)
+    size = batch.shape[1] * batch.shape[2]
+
+    t = np.arange(256, dtype=np.int64)
+    w_bg = np.cumsum(hist, axis=1)
+    w_fg = size - w_bg
+    # sum_bg += (float)(t * histogram[t])  -> float32 ardışık toplam
+    sum_bg = np.cumsum((t * hist).astype(np.float32), axis=1, dtype=np.float32)
+    sum_total = sum_bg[:, -1:]
+
+    valid = (w_bg > 0) & (w_fg > 0)
+    wb = np.where(valid, w_bg, 1).astype(np.float32)
+    wf = np.where(valid, w_fg, 1).astype(np.float32)
+    m_bg = sum_bg / wb
+    m_fg = (sum_total - sum_bg) / wf
+    diff = m_bg - m_fg
+    var = wb * wf * diff * diff
+    var = np.where(valid, var, np.float32(0))
+
+    # C: ilk "var_bet > var_max" (başlangıç 0) -> argmax ilk maksimumu verir
+    best = np.argmax(var, axis=1)
+    best[var[np.arange(len(best)), best] <= 0] = 0
+    return best
+
+
+def apply_otsu(images):
+    batch, single = _as_batch(images)
+    th = otsu_thresholds(batch)
+    out = np.where(batch > th[:, np.newaxis, np.newaxis], 255, 0).astype(np.uint8)
+    return out[0] if single else out
+
+
+def _morph(images, op):
+    batch, single = _as_batch(images)
+    # get_pixel(): resim dışı pikseller 0 kabul edilir
+    out = np.pad(batch, ((0, 0), (1, 1), (1, 1)), mode="constant", constant_values=0)
+    # 3x3 kare min/max ayrıştırılabilir: önce satır, sonra sütun yönünde 3'lük pencere
+    for axis in (2, 1):
+        win = sliding_window_view(out, 3, axis=axis)
+        out = op(op(win[..., 0], win[..., 1]), win[..., 2])
+    return out[0] if single else out
+
+
+def apply_erosion(images):
+    return _morph(images, np.minimum)
+
+
+def apply_dilation(images):
+    return _morph(images, np.maximum)
+
+
+def firmware_chain(images):
+    """main.c ana döngüsündeki sıra: Otsu -> Dilation -> Erosion (closing)."""
+    return apply_erosion(apply_dilation(apply_otsu(images)))
+
+
+def verify(inputs, outputs):
+    """
+    Cihaz çıktılarını referansla karşılaştırır.
+    Dönen değer: (hatalı kare indeksleri, toplam hatalı piksel sayısı)
+    """
+    inputs, _ = _as_batch(inputs)
+    outputs, _ = _as_batch(outputs)
+    if inputs.shape != outputs.shape:
+        raise ValueError(f"Boyut uyuşmuyor: {inputs.shape} != {outputs.shape}")
+    mismatch = firmware_chain(inputs) != outputs
+    per_frame = mismatch.reshape(len(mismatch), -1).sum(axis=1)
+    return np.flatnonzero(per_frame), int(per_frame.sum())
+
+
+# ==========================================
+# KARŞILAŞTIRMA İÇİN: main.c'nin piksel piksel birebir çevirisi
+# ==========================================
+def firmware_chain_loop(img):
+    h, w = img.shape
+    size = h * w
+    src = [int(v) for v in img.ravel()]
+
+    histogram = [0] * 256
+    for v in src:
+        histogram[v] += 1
+    sum_total = np.float32(0)
+    for i in range(256):
+        sum_total = np.float32(sum_total + np.float32(i * histogram[i]))
+    sum_bg, w_bg, var_max, threshold = np.float32(0), 0, np.float32(0), 0
+    for t in range(256):
+        w_bg += histogram[t]
+        if w_bg == 0:
+            continue
+        w_fg = size - w_bg
+        if w_fg == 0:
+            break
+        sum_bg = np.float32(sum_bg + np.float32(t * histogram[t]))
+        m_bg = sum_bg / np.float32(w_bg)
+        m_fg = (sum_total - sum_bg) / np.float32(w_fg)
+        var_bet = np.float32(w_bg) * np.float32(w_fg) * (m_bg - m_fg) * (m_bg - m_fg)
+        if var_bet > var_max:
+            var_max, threshold = var_bet, t
+    src = [255 if v > threshold else 0 for v in src]
+
+    def get_pixel(buf, x, y):
+        if x < 0 or x >= w or y < 0 or y >= h:
+            return 0
+        return buf[y * w + x]
+
+    for op in (max, min):
+        dest = [0] * size
+        for y in range(h):
+            for x in range(w):
+                dest[y * w + x] = op(get_pixel(src, x + kx, y + ky)
+                                     for ky in (-1, 0, 1) for kx in (-1, 0, 1))
+        src = dest
+    return np.array(src, dtype=np.uint8).reshape(h, w)
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    for size in (64, 128, 256):
+        batch = rng.integers(0, 256, (64, size, size), dtype=np.uint8)
+
+        t0 = time.perf_counter()
+        ref = firmware_chain(batch)
+        t_vec = (time.perf_counter() - t0) / len(batch)
+
+        t0 = time.perf_counter()
+        loop = firmware_chain_loop(batch[0])
+        t_loop = time.perf_counter() - t0
+
+        same = np.array_equal(ref[0], loop)
+        print(f"{size}x{size}: numpy {t_vec*1000:.3f} ms/kare | döngü {t_loop*1000:.1f} ms/kare | "
+              f"hızlanma x{t_loop / t_vec:.0f} | birebir: {same}")
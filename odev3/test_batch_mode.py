@@ -0,0 +1,46 @@
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from batch_mode import run_batch
+from frame_protocol import FrameClient, LoopbackSerial, ProtocolError
+
+W, H = 16, 8
+
+
+class FailingClient(FrameClient):
+    """İlk n kareden sonra seri hat kopmuş gibi ProtocolError fırlatır."""
+
+    def __init__(self, n):
+        super().__init__(LoopbackSerial(W, H, process=lambda img: 255 - img), W, H)
+        self.n = n
+
+    def process(self, images):
+        for i, out in enumerate(super().process(images)):
+            if i == self.n:
+                raise ProtocolError("hat koptu")
+            yield out
+
+
+@pytest.fixture
+def image_dir(tmp_path):
+    rng = np.random.default_rng(0)
+    for i in range(40):
+        cv2.imwrite(str(tmp_path / f"{i:03d}.png"), rng.integers(0, 256, (H, W), dtype=np.uint8))
+    return tmp_path
+
+
+def test_batch_processes_folder(image_dir, tmp_path_factory):
+    out = tmp_path_factory.mktemp("out")
+    client = FrameClient(LoopbackSerial(W, H, process=lambda img: 255 - img), W, H)
+    assert run_batch(client, str(image_dir), str(out), W, H) == 40
+    assert len(list(out.iterdir())) == 40
+
+
+def test_link_error_does_not_leave_producer_blocked(image_dir):
+    before = threading.active_count()
+    with pytest.raises(ProtocolError):
+        run_batch(FailingClient(3), str(image_dir), None, W, H, queue_size=2)
+    assert threading.active_count() == before      # üretici ve yazıcı thread'leri bitti
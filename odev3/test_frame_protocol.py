@@ -0,0 +1,189 @@
+import numpy as np
+import pytest
+
+from frame_protocol import (HEADER, MAX_WINDOW, TYPE_IMAGE, TYPE_NAK, FrameClient, FrameParser,
+                            LoopbackSerial, ProtocolError, firmware_reply, pack_frame, read_frame)
+from stm32_ref import firmware_chain
+
+W, H = 16, 8
+
+
+def invert(img):
+    return 255 - img
+
+
+def frames(n, seed=0):
+    return list(np.random.default_rng(seed).integers(0, 256, size=(n, H, W), dtype=np.uint8))
+
+
+class BytesSerial:
+    """Sabit byte akışı okuyan port (read_frame testleri için)."""
+
+    def __init__(self, data):
+        self.data = bytearray(data)
+
+    def read(self, n=1):
+        out = bytes(self.data[:n])
+        del self.data[:n]
+        return out
+
+
+class ScriptedSerial(LoopbackSerial):
+    """
+    Yanıtları read() anına erteleyen loopback: hatta bekleyen kare sayısı ölçülür,
+    yanıtlar ters sırayla verilebilir, seçilen seq'lerin ilk yanıtı düşürülür veya
+    ilk gönderimi bozulur (CRC); lost'taki seq'lere hiç yanıt verilmez.
+    """
+
+    def __init__(self, reverse=False, drop=(), corrupt=(), lost=()):
+        super().__init__(W, H, process=invert)
+        self.reverse = reverse
+        self.drop = set(drop)
+        self.lost = set(lost)
+        self.corrupt = set(corrupt)
+        self.queue = []
+        self.sent = []
+        self.max_in_flight = 0
+        self.burst = 0              # son okumadan beri art arda tekrar gönderilen kare
+        self.max_burst = 0
+
+    def write(self, data):
+        data = bytearray(data)
+        _, tip, seq, _ = HEADER.unpack_from(data)
+        if tip == TYPE_IMAGE:
+            if seq in self.sent:
+                self.burst += 1
+                self.max_burst = max(self.max_burst, self.burst)
+            self.sent.append(seq)
+        if seq in self.corrupt:
+            self.corrupt.discard(seq)
+            data[-1] ^= 0xFF
+        self.parser.feed(bytes(data))
+        while (frame := self.parser.next_frame()) is not None:
+            self.queue.append(frame)
+        self.max_in_flight = max(self.max_in_flight, len(self.queue))
+        return len(data)
+
+    def read(self, n=1):
+        if not self.tx:
+            self.burst = 0
+        if not self.tx and self.queue:
+            batch, self.queue = (self.queue[::-1] if self.reverse else self.queue), []
+            for frame in batch:
+                if frame[1] in self.lost:
+                    continue
+                if frame[1] in self.drop:
+                    self.drop.discard(frame[1])
+                    continue
+                self.tx += firmware_reply(frame, self.width, self.height, self.process)
+        return super().read(n)
+
+
+def run(ser, imgs, window=2):
+    client = FrameClient(ser, W, H, window=window)
+    return client, list(client.process(imgs))
+
+
+# ---------- CRC ----------
+def test_read_frame_rejects_bad_crc():
+    frame = bytearray(pack_frame(TYPE_IMAGE, 7, bytes(range(32))))
+    frame[HEADER.size + 3] ^= 0x01
+    with pytest.raises(ProtocolError):
+        read_frame(BytesSerial(frame), 64)
+
+
+def test_firmware_naks_bad_crc():
+    frame = bytearray(pack_frame(TYPE_IMAGE, 5, bytes(W * H)))
+    frame[-1] ^= 0xFF
+    parser = FrameParser(W * H)
+    parser.feed(bytes(frame))
+    parsed = parser.next_frame()
+    assert parsed is not None and parsed[3] is False
+    tip, seq, payload = read_frame(BytesSerial(firmware_reply(parsed, W, H)), W * H)
+    assert (tip, seq, payload) == (TYPE_NAK, 5, b"")
+
+
+def test_corrupted_frame_is_nakked_and_resent():
+    imgs = frames(4)
+    ser = ScriptedSerial(corrupt={1})
+    client, out = run(ser, imgs)
+    assert all(np.array_equal(o, invert(i)) for o, i in zip(out, imgs))
+    assert ser.sent.count(1) == 2
+    assert client.stats.retransmits == 1
+
+
+# ---------- Yeniden senkronizasyon ----------
+def test_read_frame_resyncs_after_garbage():
+    good = pack_frame(TYPE_IMAGE, 3, b"abc")
+    garbage = b"\x00\xA5\x11\xA5\xFF\x5A"
+    assert read_frame(BytesSerial(garbage + good), 64) == (TYPE_IMAGE, 3, b"abc")
+
+
+def test_parser_resyncs_after_garbage_and_bogus_header():
+    good = pack_frame(TYPE_IMAGE, 9, b"xyz")
+    bogus = HEADER.pack(b"\xA5\x5A", TYPE_IMAGE, 1, 60000)     # uzunluk > max_payload
+    parser = FrameParser(64)
+    for i in range(0, len(b"\x13\x37" + bogus + good), 3):    # parça parça gelen akış
+        parser.feed((b"\x13\x37" + bogus + good)[i:i + 3])
+    tip, seq, payload, ok, _ = parser.next_frame()
+    assert (tip, seq, payload, ok) == (TYPE_IMAGE, 9, b"xyz", True)
+    assert parser.next_frame() is None
+
+
+# ---------- Sıra dışı / kayıp kareler ----------
+def test_out_of_order_replies_are_yielded_in_order():
+    imgs = frames(7)
+    ser = ScriptedSerial(reverse=True)
+    client, out = run(ser, imgs, window=3)
+    assert all(np.array_equal(o, invert(i)) for o, i in zip(out, imgs))
+    assert len(out) == 7 and client.stats.retransmits == 0
+
+
+def test_lost_reply_resends_only_oldest_frame():
+    imgs = frames(5)
+    ser = ScriptedSerial(drop={0, 3})
+    client, out = run(ser, imgs, window=3)
+    assert all(np.array_equal(o, invert(i)) for o, i in zip(out, imgs))
+    assert sorted(ser.sent) == [0, 0, 1, 2, 3, 3, 4]
+    assert client.stats.retransmits == 2
+
+
+def test_timeout_does_not_burst_retransmits():
+    # 0 ve 1 aynı anda kayıp: timeout'ta ikisi birden değil, sadece en eskisi gönderilir
+    imgs = frames(3)
+    ser = ScriptedSerial(drop={0, 1})
+    client, out = run(ser, imgs, window=3)
+    assert all(np.array_equal(o, invert(i)) for o, i in zip(out, imgs))
+    assert ser.max_burst == 1
+    assert client.stats.retransmits == 2
+
+
+def test_gives_up_after_retries():
+    ser = ScriptedSerial(lost={0})
+    with pytest.raises(ProtocolError):
+        run(ser, frames(1))
+    assert ser.sent == [0] * 4          # ilk gönderim + 3 deneme
+
+
+# ---------- Pencere ----------
+@pytest.mark.parametrize("window", [0, MAX_WINDOW + 1])
+def test_window_out_of_range_rejected(window):
+    with pytest.raises(ValueError):
+        FrameClient(LoopbackSerial(W, H), W, H, window=window)
+
+
+@pytest.mark.parametrize("window", range(1, MAX_WINDOW + 1))
+def test_in_flight_never_exceeds_window(window):
+    ser = ScriptedSerial(reverse=True, drop={2})
+    run(ser, frames(10), window=window)
+    assert ser.max_in_flight <= window <= 3
+
+
+def test_loopback_matches_firmware_reference():
+    imgs = frames(3)
+    ser = LoopbackSerial(W, H)
+    client = FrameClient(ser, W, H, window=2)
+    assert client.sync()
+    out = list(client.process(imgs))
+    for o, i in zip(out, imgs):
+        np.testing.assert_array_equal(o, firmware_chain(i))
@@ -1,7 +1,20 @@
+import gzip
+import json
 import struct
+import hashlib
 import numpy as np
 import os
 
+# IDX veri tipi kodları (magic'in 3. byte'ı) -> big-endian numpy dtype
+IDX_DTYPES = {
+    0x08: np.dtype(">u1"),
+    0x09: np.dtype(">i1"),
+    0x0B: np.dtype(">i2"),
+    0x0C: np.dtype(">i4"),
+    0x0D: np.dtype(">f4"),
+    0x0E: np.dtype(">f8"),
+}
+
 def load_idx_images(path: str) -> np.ndarray:
     """
     IDX3 formatındaki görüntü dosyasını okur.
@@ -50,6 +63,315 @@ def load_idx_labels(path: str) -> np.ndarray:
         
     return labels
 
+def _open_idx(path: str):
+    """Düz veya .gz IDX dosyasını açar (gzip akış olarak çözülür)."""
+    with open(path, "rb") as f:
+        is_gzip = f.read(2) == b"\x1f\x8b"
+    return (gzip.open(path, "rb") if is_gzip else open(path, "rb")), is_gzip
+
+
+class IdxDataset:
+    """
+    Herhangi bir IDX dosyası için tembel (lazy) okuyucu.
+    Düz dosyalar np.memmap ile eşlenir: ds[i] / ds[a:b] O(1), dosya boyutundan bağımsız
+    sabit bellek. .gz dosyalar akış halinde çözülür: iter_batches() sıralı okur,
+    rastgele erişim (ds[i]) desteklenir ama geriye doğru atlamada baştan çözer.
+
+        ds = IdxDataset("MNIST-dataset/train-images.idx3-ubyte")
+        ds.shape, ds[0], ds[100:200]
+        for batch in ds.iter_batches(1024): ...
+    """
+
+    def __init__(self, path: str):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Dosya bulunamadı: {path}")
+        self.path = path
+
+        f, self.compressed = _open_idx(path)
+        with f:
+            zero, code, ndim = struct.unpack(">HBB", f.read(4))
+            if zero != 0 or code not in IDX_DTYPES or ndim == 0:
+                raise ValueError(f"Geçersiz IDX başlığı: {path}")
+            dims = struct.unpack(f">{ndim}I", f.read(4 * ndim))
+
+        self.magic = (code << 8) | ndim          # 2051 = görüntü, 2049 = etiket
+        self.dtype = IDX_DTYPES[code]
+        self.shape = tuple(dims)
+        self.header_size = 4 + 4 * ndim
+        self.item_shape = self.shape[1:]
+        self.item_bytes = int(np.prod(self.item_shape, dtype=np.int64)) * self.dtype.itemsize
+
+        self._data = None
+        self._stream = None
+        if not self.compressed:
+            expected = self.header_size + len(self) * self.item_bytes
+            if os.path.getsize(path) < expected:
+                raise ValueError(f"Dosya eksik: {path} ({os.path.getsize(path)} < {expected} byte)")
+            self._data = np.memmap(path, dtype=self.dtype, mode="r",
+                                   offset=self.header_size, shape=self.shape)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __repr__(self):
+        return f"IdxDataset({self.path!r}, shape={self.shape}, dtype={self.dtype})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        self._data = None
+
+    # ---------- Rastgele erişim ----------
+    def __getitem__(self, idx):
+        if self._data is not None:
+            return self._data[idx]
+        # .gz: tamsayı / adımsız dilim akıştan okunur, diğerleri tek tek toplanır
+        if isinstance(idx, (int, np.integer)):
+            i = int(idx) + len(self) if idx < 0 else int(idx)
+            if not 0 <= i < len(self):
+                raise IndexError(idx)
+            return self._read_range(i, i + 1)[0]
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(len(self))
+            if step == 1:
+                return self._read_range(start, max(start, stop))
+            idx = range(start, stop, step)
+        rows = [self[int(i)] for i in np.asarray(idx).ravel()]
+        return np.stack(rows) if rows else np.empty((0,) + self.item_shape, dtype=self.dtype)
+
+    def _read_range(self, start, stop):
+        """gzip akışından [start, stop) kayıtlarını okur (ileri atlama ucuz, geri atlama baştan)."""
+        if self._stream is None:
+            self._stream, _ = _open_idx(self.path)
+        self._stream.seek(self.header_size + start * self.item_bytes)
+        n = stop - start
+        buf = self._stream.read(n * self.item_bytes)
+        if len(buf) != n * self.item_bytes:
+            raise ValueError(f"Dosya eksik: {self.path}")
+        return np.frombuffer(buf, dtype=self.dtype).reshape((n,) + self.item_shape)
+
+    # ---------- Sıralı erişim ----------
+    def iter_batches(self, batch_size: int = 1024, start: int = 0, stop: int = None):
+        """
+        [start, stop) aralığını batch_size'lık (B, ...) dizilere bölerek üretir.
+        Düz dosyada memmap görünümleri (kopyasız), .gz'de akıştan okunan parçalar döner.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        if self._data is not None:
+            for i in range(start, stop, batch_size):
+                yield self._data[i:min(i + batch_size, stop)]
+            return
+        f, _ = _open_idx(self.path)
+        with f:
+            f.seek(self.header_size + start * self.item_bytes)
+            for i in range(start, stop, batch_size):
+                n = min(batch_size, stop - i)
+                buf = f.read(n * self.item_bytes)
+                if len(buf) != n * self.item_bytes:
+                    raise ValueError(f"Dosya eksik: {self.path}")
+                yield np.frombuffer(buf, dtype=self.dtype).reshape((n,) + self.item_shape)
+
+
+_IDX_CODES = {np.dtype(v).newbyteorder("=").str: k for k, v in IDX_DTYPES.items()}
+
+
+class IdxWriter:
+    """
+    IDX dosyasına parça parça (streaming) yazar; tüm veri hiç bellekte tutulmaz.
+    Kayıt sayısı başlığa close() sırasında yazılır. append=True ile var olan dosyanın
+    sonuna eklenir (tip ve kayıt şekli uyuşmalı; mevcut sayı dosya boyutundan hesaplanır,
+    böylece kapatılmamış dosyaya da eklenebilir). item_shape verilmezse ilk write() tek
+    kayıt kabul edilir.
+
+        with IdxWriter("imgs.idx3-ubyte", (28, 28)) as w:
+            for frame in camera_frames():      # tek kayıt veya (B, 28, 28) parti
+                w.write(frame)
+    """
+
+    def __init__(self, path: str, item_shape=None, dtype=np.uint8, append: bool = False,
+                 buffer_items: int = 4096):
+        self.path = path
+        self.dtype = np.dtype(dtype).newbyteorder(">")
+        code = _IDX_CODES.get(np.dtype(dtype).newbyteorder("=").str)
+        if code is None:
+            raise ValueError(f"IDX'te desteklenmeyen tip: {dtype}")
+        self.code = code
+        self.item_shape = tuple(item_shape) if item_shape is not None else None
+        self.count = 0
+        self.buffer_items = buffer_items
+        self._pending = []
+        self._f = None
+
+        if append and os.path.exists(path):
+            ds = IdxDataset(path)
+            if ds.compressed:
+                raise ValueError(f".gz dosyaya ekleme yapılamaz: {path}")
+            if ds.dtype != self.dtype or (self.item_shape is not None and ds.item_shape != self.item_shape):
+                raise ValueError(f"Ekleme uyumsuz: dosya {ds.dtype}{ds.item_shape}, "
+                                 f"yazılan {self.dtype}{self.item_shape}")
+            self.item_shape = ds.item_shape
+            # Kayıt sayısı başlıktan değil dosya boyutundan: close() edilmemiş (çökmüş) bir
+            # yazıcının başlığı hâlâ 0 der, ona güvenilirse diskteki kayıtlar silinirdi
+            body = os.path.getsize(path) - ds.header_size
+            self.count, partial = divmod(body, ds.item_bytes) if ds.item_bytes else (len(ds), 0)
+            ds.close()
+            if partial:
+                raise ValueError(f"Yarım kalmış son kayıt ({partial} byte): {path}")
+            self._f = open(path, "r+b")
+            self._f.seek(ds.header_size + self.count * ds.item_bytes)
+        elif self.item_shape is not None:
+            self._open_new()
+
+    def _open_new(self):
+        self._f = open(self.path, "wb")
+        ndim = 1 + len(self.item_shape)
+        self._f.write(struct.pack(">HBB", 0, self.code, ndim))
+        self._f.write(struct.pack(f">{ndim}I", 0, *self.item_shape))   # sayı close()'da
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, data):
+        """Tek kayıt (item_shape) veya parti (B, *item_shape)."""
+        arr = np.asarray(data)
+        if self.item_shape is None:
+            self.item_shape = arr.shape      # verilmediyse ilk yazılan tek kayıt kabul edilir
+            self._open_new()
+        if arr.shape == self.item_shape:
+            self._pending.append(arr)
+            if len(self._pending) >= self.buffer_items:
+                self._flush_pending()
+            return
+        if arr.shape[1:] != self.item_shape:
+            raise ValueError(f"Kayıt şekli {self.item_shape} olmalı, gelen: {arr.shape}")
+        self._flush_pending()
+        self._write_batch(arr)
+
+    def write_from(self, iterable):
+        """Üreteçten (generator) gelen kayıtları/partileri yazar. Yazılan toplam sayıyı döndürür."""
+        for item in iterable:
+            self.write(item)
+        return self.count + len(self._pending)
+
+    def _flush_pending(self):
+        if self._pending:
+            batch = np.stack(self._pending)
+            self._pending = []
+            self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        # Sadece bu parça dönüştürülür (uint8'de kopya yok); memoryview ile doğrudan yazılır
+        out = np.ascontiguousarray(batch, dtype=self.dtype)
+        self._f.write(memoryview(out).cast("B"))
+        self.count += len(out)
+
+    def close(self):
+        if self._f is None:
+            return
+        self._flush_pending()
+        self._f.seek(4)
+        self._f.write(struct.pack(">I", self.count))   # başlıktaki kayıt sayısını yamala
+        self._f.close()
+        self._f = None
+
+
+# ==========================================
+# ÖNBELLEKLİ YÜKLEYİCİLER (train_mlp_mnist.py bunları kullanır)
+# ==========================================
+# 1. çağrı : IDX ayrıştırılır -> <veri klasörü>/.idx_cache/<ad>.<özet>.npy yazılır
+# sonraki  : aynı süreçte sözlükten, yeni süreçte .npy mmap ile (ms mertebesi)
+# Geçersiz kılma: dosya boyutu/mtime değiştiyse içerik özeti (SHA-1) yeniden hesaplanır;
+# özet değiştiyse eski .npy silinip yeniden üretilir.
+CACHE_DIR = ".idx_cache"
+_memo = {}
+
+
+def file_digest(path: str, chunk: int = 1 << 20) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(chunk)
+            if not data:
+                break
+            h.update(data)
+    return h.hexdigest()
+
+
+def _cached_load(path: str, expected_magic: int, mmap: bool = True) -> np.ndarray:
+    path = os.path.abspath(path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Dosya bulunamadı: {path}")
+    st = os.stat(path)
+    key = (path, st.st_size, st.st_mtime_ns, expected_magic, mmap)
+    if key in _memo:
+        return _memo[key]
+
+    cache_dir = os.path.join(os.path.dirname(path), CACHE_DIR)
+    meta_path = os.path.join(cache_dir, os.path.basename(path) + ".json")
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        meta = {}
+
+    # Boyut/mtime aynıysa özet yeniden hesaplanmaz; farklıysa içerik gerçekten değişmiş mi bak
+    if meta.get("size") == st.st_size and meta.get("mtime_ns") == st.st_mtime_ns:
+        digest = meta["sha1"]
+    else:
+        digest = file_digest(path)
+    npy_path = os.path.join(cache_dir, f"{os.path.basename(path)}.{digest[:16]}.npy")
+
+    if meta.get("sha1") != digest or not os.path.exists(npy_path):
+        ds = IdxDataset(path)
+        if ds.magic != expected_magic:
+            raise ValueError(f"Geçersiz dosya! Beklenen: {expected_magic}, Okunan: {ds.magic}")
+        os.makedirs(cache_dir, exist_ok=True)
+        if meta.get("npy") and meta["npy"] != os.path.basename(npy_path):
+            try:
+                os.remove(os.path.join(cache_dir, meta["npy"]))
+            except FileNotFoundError:
+                pass
+        out = np.lib.format.open_memmap(npy_path + ".tmp", mode="w+", dtype=ds.dtype.newbyteorder("="),
+                                        shape=ds.shape)
+        for i, batch in zip(range(0, len(ds), 8192), ds.iter_batches(8192)):
+            out[i:i + len(batch)] = batch
+        out.flush()
+        del out
+        os.replace(npy_path + ".tmp", npy_path)
+        ds.close()
+
+    if meta.get("size") != st.st_size or meta.get("mtime_ns") != st.st_mtime_ns or meta.get("sha1") != digest:
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": digest,
+                       "npy": os.path.basename(npy_path)}, f)
+
+    arr = np.load(npy_path, mmap_mode="r" if mmap else None)
+    if (arr.ndim == 3) != (expected_magic == 2051):
+        raise ValueError(f"Geçersiz dosya! Beklenen: {expected_magic}, Okunan şekil: {arr.shape}")
+    _memo[key] = arr
+    return arr
+
+
+def load_images(path: str, mmap: bool = True) -> np.ndarray:
+    """IDX3 görüntüleri (N, Rows, Cols); önbellekli. mmap=False ise belleğe tam kopya."""
+    return _cached_load(path, 2051, mmap)
+
+
+def load_labels(path: str, mmap: bool = True) -> np.ndarray:
+    """IDX1 etiketleri (N,); önbellekli."""
+    return _cached_load(path, 2049, mmap)
+
+
 # --- Kullanım Örneği ---
 if __name__ == "__main__":
     # Önceki adımda oluşturduğun klasör yolu
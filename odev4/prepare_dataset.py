@@ -1,57 +1,78 @@
 import os
-import struct
+import itertools
 import numpy as np
-import matplotlib.pyplot as plt
-from tensorflow.keras.datasets import mnist
 
-def write_idx_images(path, images):
-    """Görüntüleri (Images) IDX3 formatında kaydeder."""
-    print(f"Yazılıyor: {path} | Boyut: {images.shape}")
+from mnist import IdxWriter
+
+CHUNK = 8192   # tek seferde diske yazılan kayıt sayısı
+
+
+def _chunks(data):
+    """Dizi ise CHUNK'lık dilimler (kopyasız), değilse üretecin kendisi (kayıt veya parti)."""
+    if isinstance(data, np.ndarray):
+        return (data[i:i + CHUNK] for i in range(0, len(data), CHUNK))
+    return data
+
+
+def write_idx_images(path, images, append=False, item_shape=None):
+    """
+    Görüntüleri (Images) IDX3 formatında kaydeder.
+    images: (N, H, W) dizi veya (H, W) kare / (B, H, W) parti üreten generator (örn. kamera).
+    Parça parça yazılır; kayıt sayısı başlığa en sonda yazılır. Yazılan toplam sayıyı döndürür.
+    """
     # IDX3 magic number = 2051 (0x00000803)
     # Header: Magic(4) + Count(4) + Height(4) + Width(4)
-    with open(path, "wb") as f:
-        f.write(struct.pack(">IIII", 2051, images.shape[0], images.shape[1], images.shape[2]))
-        f.write(images.astype(np.uint8).tobytes())
+    if isinstance(images, np.ndarray):
+        print(f"Yazılıyor: {path} | Boyut: {images.shape}")
+        item_shape = images.shape[1:]
+    else:
+        print(f"Yazılıyor (akış): {path}")
+        if item_shape is None:
+            # İlk eleman şekli belirler: (H, W) tek kare, (B, H, W) parti
+            images = iter(images)
+            first = next(images, None)
+            if first is not None:
+                first = np.asarray(first)
+                item_shape = first.shape[1:] if first.ndim == 3 else first.shape
+                images = itertools.chain([first], images)
+    with IdxWriter(path, item_shape, np.uint8, append=append) as w:
+        w.write_from(_chunks(images))
+    return w.count
 
-def write_idx_labels(path, labels):
-    """Etiketleri (Labels) IDX1 formatında kaydeder."""
-    print(f"Yazılıyor: {path} | Adet: {labels.shape[0]}")
+
+def write_idx_labels(path, labels, append=False):
+    """Etiketleri (Labels) IDX1 formatında kaydeder (dizi veya generator)."""
     # IDX1 magic number = 2049 (0x00000801)
     # Header: Magic(4) + Count(4)
-    with open(path, "wb") as f:
-        f.write(struct.pack(">II", 2049, labels.shape[0]))
-        f.write(labels.astype(np.uint8).tobytes())
+    if isinstance(labels, np.ndarray):
+        print(f"Yazılıyor: {path} | Adet: {labels.shape[0]}")
+    else:
+        print(f"Yazılıyor (akış): {path}")
+    with IdxWriter(path, (), np.uint8, append=append) as w:
+        w.write_from(_chunks(labels))
+    return w.count
 
 def verify_and_visualize(image_path, label_path, num_samples=5):
-    """Oluşturulan dosyaları okuyup sağlamasını yapar ve örnek gösterir."""
+    """Oluşturulan dosyaları memmap ile denetler ve sınıf başına örnekleri tek mozaikte gösterir."""
+    import matplotlib.pyplot as plt
+    from verify_idx import verify_idx, print_report, render_samples
+
     print("\n--- Doğrulama ve Görselleştirme ---")
-    
-    # Görüntü dosyasını okuma (Test amaçlı)
-    with open(image_path, 'rb') as f_img:
-        magic, num, rows, cols = struct.unpack(">IIII", f_img.read(16))
-        # Kalan veriyi oku
-        buffer = f_img.read(num * rows * cols)
-        data = np.frombuffer(buffer, dtype=np.uint8).reshape(num, rows, cols)
-    
-    # Etiket dosyasını okuma
-    with open(label_path, 'rb') as f_lbl:
-        magic_lbl, num_lbl = struct.unpack(">II", f_lbl.read(8))
-        buffer_lbl = f_lbl.read(num_lbl)
-        labels = np.frombuffer(buffer_lbl, dtype=np.uint8)
-
-    print(f"Dosyadan okunan: {num} görüntü, {rows}x{cols} piksel.")
-    
-    # İlk 'num_samples' kadar örneği çizdir
-    fig, axes = plt.subplots(1, num_samples, figsize=(10, 3))
-    for i in range(num_samples):
-        axes[i].imshow(data[i], cmap='gray')
-        axes[i].set_title(f"Label: {labels[i]}")
-        axes[i].axis('off')
-    
-    plt.suptitle(f"{os.path.basename(image_path)} Dosyasından İlk {num_samples} Örnek")
+    report = verify_idx(image_path, label_path)
+    print_report(report)
+
+    # Her satır bir sınıf: tek imshow çağrısı (subplot başına çizim yok)
+    img, _ = render_samples(image_path, label_path, per_class=num_samples)
+    plt.figure(figsize=(num_samples, 10))
+    plt.imshow(img, cmap='gray', interpolation='nearest')
+    plt.axis('off')
+    plt.title(f"{os.path.basename(image_path)}: satır başına bir sınıf, {num_samples} örnek")
     plt.show()
+    return report
 
 def main():
+    from tensorflow.keras.datasets import mnist
+
     # 1. Veri setini yükle
     print("MNIST veri seti indiriliyor/yükleniyor...")
     (train_images, train_labels), (test_images, test_labels) = mnist.load_data()
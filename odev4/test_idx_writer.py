@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from mnist import IdxDataset, IdxWriter
+from prepare_dataset import write_idx_images
+
+
+def _images(n, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, size=(n, 28, 28), dtype=np.uint8)
+
+
+def test_generator_of_batches_reads_back(tmp_path):
+    imgs = _images(12)
+    path = str(tmp_path / "imgs.idx3-ubyte")
+    n = write_idx_images(path, (imgs[i:i + 4] for i in range(0, 12, 4)))
+    assert n == 12
+    with IdxDataset(path) as ds:
+        assert ds.magic == 2051
+        assert ds.shape == (12, 28, 28)
+        np.testing.assert_array_equal(ds[:], imgs)
+
+
+def test_generator_of_single_frames_reads_back(tmp_path):
+    imgs = _images(5)
+    path = str(tmp_path / "imgs.idx3-ubyte")
+    write_idx_images(path, iter(imgs))
+    with IdxDataset(path) as ds:
+        assert ds.shape == (5, 28, 28)
+        np.testing.assert_array_equal(ds[:], imgs)
+
+
+def test_append_to_unclosed_file_keeps_records(tmp_path):
+    imgs = _images(100)
+    path = str(tmp_path / "imgs.idx3-ubyte")
+    w = IdxWriter(path, (28, 28))
+    w.write(imgs)
+    w._f.flush()                       # close() yok: başlıktaki sayı hâlâ 0 (çökmüş yazıcı)
+    w._f.close()
+    w._f = None
+
+    extra = _images(3, seed=1)
+    with IdxWriter(path, (28, 28), append=True) as w2:
+        w2.write(extra)
+    with IdxDataset(path) as ds:
+        assert len(ds) == 103
+        np.testing.assert_array_equal(ds[:100], imgs)
+        np.testing.assert_array_equal(ds[100:], extra)
+
+
+def test_append_rejects_partial_record(tmp_path):
+    imgs_path = str(tmp_path / "imgs.idx3-ubyte")
+    write_idx_images(imgs_path, _images(2))
+    with open(imgs_path, "ab") as f:
+        f.write(b"\x00" * 10)          # yarım kayıt
+    with pytest.raises(ValueError):
+        IdxWriter(imgs_path, (28, 28), append=True)
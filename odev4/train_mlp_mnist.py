@@ -1,8 +1,8 @@
 import os
 import numpy as np
-import cv2
 from sklearn.metrics import confusion_matrix, ConfusionMatrixDisplay
 from mnist import load_images, load_labels
+from hu_features import hu_features
 
 import keras
 from keras.callbacks import EarlyStopping, ModelCheckpoint
@@ -21,16 +21,11 @@ test_images  = load_images(test_img_path)
 test_labels  = load_labels(test_label_path)
 
 # --- Feature extraction: Hu moments (7 features) ---
-train_huMoments = np.empty((len(train_images), 7), dtype=np.float64)
-test_huMoments  = np.empty((len(test_images), 7), dtype=np.float64)
-
-for i, img in enumerate(train_images):
-    m = cv2.moments(img, binaryImage=True)
-    train_huMoments[i] = cv2.HuMoments(m).reshape(7)
-
-for i, img in enumerate(test_images):
-    m = cv2.moments(img, binaryImage=True)
-    test_huMoments[i] = cv2.HuMoments(m).reshape(7)
+# cv2.moments + cv2.HuMoments ile aynı sonuç; tüm yığın vektörel hesaplanır ve
+# MNIST-dataset/.idx_cache altında saklanır (sonraki çalıştırmalarda diskten okunur)
+feature_cache = os.path.join("MNIST-dataset", ".idx_cache")
+train_huMoments = hu_features(train_images, cache_dir=feature_cache)
+test_huMoments  = hu_features(test_images, cache_dir=feature_cache)
 
 # --- (ÖNEMLİ) Standardization: 10.9'da yaptığımız gibi ---
 mean = np.mean(train_huMoments, axis=0)
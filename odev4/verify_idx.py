@@ -0,0 +1,181 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+from mnist import IdxDataset
+
+# ==========================================
+# IDX DOĞRULAMA + MOZAİK (büyük veri setleri için)
+# ==========================================
+# Dosyalar IdxDataset ile memmap/akış olarak okunur (tamamı belleğe alınmaz).
+# Kontroller parça parça ve vektörel: başlık/boyut, görüntü-etiket sayısı, etiket aralığı,
+# sınıf sayımları (bincount), boş (tamamen sıfır) görüntüler, piksel aralığı.
+# Örnekler subplot yerine tek bir (H, W) uint8 karo resme dizilir -> binlerce örnek tek çizim.
+NUM_CLASSES = 10
+CHUNK = 16384      # 28x28'de ~12 MB'lık parçalar
+
+
+def verify_idx(image_path, label_path, num_classes=NUM_CLASSES, chunk=CHUNK):
+    """
+    Görüntü/etiket IDX çiftini denetler. Dönen sözlük: sayılar + 'errors' (boşsa dosyalar tutarlı)
+    + 'warnings' (boş görüntü gibi hata olmayan ama bakılması gereken durumlar).
+    """
+    errors, warnings = [], []
+    with IdxDataset(image_path) as imgs, IdxDataset(label_path) as lbls:
+        if imgs.magic != 2051:
+            errors.append(f"Görüntü dosyası IDX3 uint8 değil (magic {imgs.magic})")
+        if lbls.magic != 2049:
+            errors.append(f"Etiket dosyası IDX1 uint8 değil (magic {lbls.magic})")
+        if len(imgs) != len(lbls):
+            errors.append(f"Sayı uyuşmuyor: {len(imgs)} görüntü, {len(lbls)} etiket")
+
+        for ds in (imgs, lbls):
+            if not ds.compressed:
+                extra = os.path.getsize(ds.path) - ds.header_size - len(ds) * ds.item_bytes
+                if extra:
+                    errors.append(f"{os.path.basename(ds.path)}: sonda {extra} fazla byte")
+
+        counts = np.zeros(num_classes, dtype=np.int64)
+        out_of_range = 0
+        for b in lbls.iter_batches(chunk):
+            c = np.bincount(b.astype(np.int64, copy=False).ravel(), minlength=num_classes)
+            counts += c[:num_classes]
+            out_of_range += int(c[num_classes:].sum())
+        if out_of_range:
+            errors.append(f"{out_of_range} etiket [0, {num_classes}) aralığı dışında")
+
+        blank, lo, hi = 0, None, None
+        for b in imgs.iter_batches(chunk):
+            flat = b.reshape(len(b), -1)
+            mx = flat.max(axis=1)
+            blank += int((mx == 0).sum())
+            bmin, bmax = flat.min(), mx.max()
+            lo = bmin if lo is None else min(lo, bmin)
+            hi = bmax if hi is None else max(hi, bmax)
+        if blank:
+            warnings.append(f"{blank} görüntü tamamen boş (sıfır)")
+
+        return {
+            "images": len(imgs), "labels": len(lbls), "shape": imgs.item_shape,
+            "class_counts": counts, "blank": blank,
+            "pixel_range": (None if lo is None else (int(lo), int(hi))),
+            "errors": errors, "warnings": warnings,
+        }
+
+
+def sample_indices(labels, per_class=None, count=100, seed=None, num_classes=NUM_CLASSES):
+    """
+    per_class=k -> (num_classes * k,) indeks, sınıf sınıf ilk k örnek (eksikse -1), satır = sınıf.
+    Değilse ilk 'count' örnek (seed verilirse rastgele 'count' örnek).
+    """
+    labels = np.asarray(labels)
+    if per_class:
+        order = np.argsort(labels, kind="stable")             # sınıfa göre, dosya sırası korunur
+        counts = np.bincount(labels, minlength=num_classes)[:num_classes]
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        k = np.arange(per_class)
+        pos = starts[:, None] + k[None, :]
+        idx = np.where(k[None, :] < counts[:, None], order[np.minimum(pos, len(order) - 1)], -1)
+        return idx.ravel()
+    if seed is not None:
+        rng = np.random.default_rng(seed)
+        return np.sort(rng.choice(len(labels), size=min(count, len(labels)), replace=False))
+    return np.arange(min(count, len(labels)))
+
+
+def mosaic(images, cols, pad=1, fill=0):
+    """(N, H, W) -> tek (rows*(H+pad)+pad, cols*(W+pad)+pad) uint8 karo resim (reshape/transpose)."""
+    n, h, w = images.shape
+    rows = max(1, -(-n // cols))
+    tiles = np.full((rows * cols, h + pad, w + pad), fill, dtype=np.uint8)
+    tiles[:n, pad:, pad:] = images
+    grid = tiles.reshape(rows, cols, h + pad, w + pad).transpose(0, 2, 1, 3)
+    out = np.full((rows * (h + pad) + pad, cols * (w + pad) + pad), fill, dtype=np.uint8)
+    out[:-pad or None, :-pad or None] = grid.reshape(rows * (h + pad), cols * (w + pad))
+    return out
+
+
+def render_samples(image_path, label_path, per_class=None, count=100, cols=None, seed=None,
+                   num_classes=NUM_CLASSES):
+    """Seçilen örnekleri memmap'ten tek seferde (fancy index) çekip mozaik yapar. Dönen: (resim, indeksler)."""
+    with IdxDataset(image_path) as imgs, IdxDataset(label_path) as lbls:
+        idx = sample_indices(lbls[:], per_class, count, seed, num_classes)
+        valid = idx >= 0
+        tiles = np.zeros((len(idx),) + imgs.item_shape, dtype=np.uint8)
+        if valid.any():
+            tiles[valid] = imgs[idx[valid]]
+    cols = cols or (per_class if per_class else int(np.ceil(np.sqrt(len(idx)))))
+    return mosaic(tiles, cols), idx
+
+
+def save_image(path, img):
+    """.pgm/.npy bağımlılıksız yazılır, diğer uzantılar (png, jpg) cv2 ile."""
+    if path.endswith(".npy"):
+        np.save(path, img)
+    elif path.endswith(".pgm"):
+        with open(path, "wb") as f:
+            f.write(f"P5 {img.shape[1]} {img.shape[0]} 255\n".encode())
+            f.write(np.ascontiguousarray(img).tobytes())
+    else:
+        import cv2
+        if not cv2.imwrite(path, img):
+            raise ValueError(f"Yazılamadı: {path}")
+
+
+def print_report(rep):
+    print(f"Görüntü: {rep['images']} x {rep['shape']} | Etiket: {rep['labels']} | "
+          f"Piksel aralığı: {rep['pixel_range']} | Boş: {rep['blank']}")
+    total = max(1, int(rep["class_counts"].sum()))
+    print("Sınıf sayıları: " + "  ".join(f"{c}:{n} ({100 * n / total:.1f}%)"
+                                         for c, n in enumerate(rep["class_counts"].tolist())))
+    for w in rep["warnings"]:
+        print("⚠️", w)
+    if rep["errors"]:
+        for e in rep["errors"]:
+            print("❌", e)
+    else:
+        print("✅ Dosyalar tutarlı")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IDX görüntü/etiket doğrulama ve örnek mozaiği")
+    parser.add_argument("images")
+    parser.add_argument("labels")
+    parser.add_argument("--classes", type=int, default=NUM_CLASSES)
+    parser.add_argument("--per-class", type=int, default=None, help="Her sınıftan k örnek (satır = sınıf)")
+    parser.add_argument("--count", type=int, default=100, help="--per-class yoksa örnek sayısı")
+    parser.add_argument("--seed", type=int, default=None, help="Verilirse rastgele örnekler")
+    parser.add_argument("--cols", type=int, default=None)
+    parser.add_argument("--out", default=None, help="Mozaik dosyası (.png/.pgm/.npy)")
+    parser.add_argument("--show", action="store_true", help="Mozaiği matplotlib ile göster (tek imshow)")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    rep = verify_idx(args.images, args.labels, args.classes)
+    t1 = time.perf_counter()
+    print_report(rep)
+    print(f"⏱ Doğrulama: {t1 - t0:.2f} s")
+
+    if args.out or args.show:
+        img, idx = render_samples(args.images, args.labels, args.per_class, args.count,
+                                  args.cols, args.seed, args.classes)
+        print(f"⏱ Mozaik: {len(idx)} örnek, {img.shape[1]}x{img.shape[0]} piksel, "
+              f"{time.perf_counter() - t1:.2f} s")
+        if args.out:
+            save_image(args.out, img)
+            print("➡️ Kaydedildi:", args.out)
+        if args.show:
+            import matplotlib.pyplot as plt
+            plt.figure(figsize=(10, 10 * img.shape[0] / img.shape[1]))
+            plt.imshow(img, cmap="gray", interpolation="nearest")
+            plt.axis("off")
+            plt.title(os.path.basename(args.images))
+            plt.show()
+    sys.exit(1 if rep["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
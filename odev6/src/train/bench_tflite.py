@@ -0,0 +1,221 @@
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+import tensorflow as tf
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "tools"))
+from quantize import convert_int8, quantize_input
+
+
+# -------------------------
+# TFLite gecikme / bellek benchmark'ı (gömülü hedef için çıkarım maliyeti)
+# Kullanım: python src/train/train_tf.py benchmark --models squeezenet efficientnet_b0
+# Her results/<model>/saved_model için float, dynamic-range ve full-int8 .tflite üretilir
+# (results/<model>/tflite/), CPU'da 1..N interpreter thread ile tek görüntü ve batch gecikmesi
+# (p50/p95/p99) ve throughput ölçülür; boyut ve bellek bilgisiyle metrics.json["tflite"]'a eklenir.
+# Bellek:
+#   arena_bytes_est : ara tensörlerin yaşam aralıklarından hesaplanan eşzamanlı en büyük toplam
+#                     (TFLM arena planlayıcısının ulaşabileceği alt sınır, hizalama/scratch hariç)
+#   rss_delta_bytes : interpreter oluşturma + allocate + ilk invoke süresince süreç RSS artışı
+# -------------------------
+VARIANTS = ("float", "dynamic", "int8")
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def representative_images(img_size: int, n: int = None, cache_dir: str = None, seed: int = 42):
+    """
+    Eğitim setinden sınıf başına eşit n görüntü, float32 (n,img,img,3); varsayılan n ve önbellek
+    train_tf --quantize ile aynı (train_tf.mnist_calibration) -> int8 modeller aynı setle kalibre edilir.
+    """
+    from train_tf import CACHE_DIR, CALIB_SAMPLES, mnist_calibration
+
+    return mnist_calibration(img_size, n or CALIB_SAMPLES, cache_dir or CACHE_DIR, seed)
+
+
+def convert(saved_model_dir: str, variant: str, calib=None) -> bytes:
+    # int8: train_tf --quantize ile aynı dönüştürücü (tools/quantize.py), aynı kalibrasyon seti
+    if variant == "int8":
+        return convert_int8(saved_model_dir, calib, io_dtype="int8")
+    converter = tf.lite.TFLiteConverter.from_saved_model(saved_model_dir)
+    if variant == "dynamic":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    return converter.convert()
+
+
+def ensure_tflite(results_dir: str, model_name: str, img_size: int, reconvert: bool = False,
+                  cache_dir: str = None) -> dict:
+    """results/<model>/tflite/<model>_<variant>.tflite dosyaları; varsa ve saved_model'den yeniyse tekrar üretilmez."""
+    saved = os.path.join(results_dir, "saved_model")
+    out_dir = os.path.join(results_dir, "tflite")
+    os.makedirs(out_dir, exist_ok=True)
+    saved_mtime = max(os.path.getmtime(os.path.join(r, f)) for r, _, fs in os.walk(saved) for f in fs)
+
+    paths, calib = {}, None
+    for variant in VARIANTS:
+        path = os.path.join(out_dir, f"{model_name}_{variant}.tflite")
+        paths[variant] = path
+        if not reconvert and os.path.exists(path) and os.path.getmtime(path) >= saved_mtime:
+            continue
+        if variant == "int8" and calib is None:
+            calib = representative_images(img_size, cache_dir=cache_dir)
+        t0 = time.time()
+        data = convert(saved, variant, calib)
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+        print(f"  {variant:8s} -> {path} ({len(data) / 1024:.0f} KB, {time.time() - t0:.1f} s)")
+    return paths
+
+
+def arena_bytes_est(interp) -> int:
+    """
+    Ara tensör yaşam aralıklarından en büyük eşzamanlı bellek (model girdileri + op çıktıları).
+    Sabitler (ağırlıklar) hiçbir op'un çıktısı olmadığından sayılmaz.
+    """
+    ops = interp._get_ops_details()
+    sizes = {t["index"]: int(np.prod(t["shape"])) * np.dtype(t["dtype"]).itemsize
+             for t in interp.get_tensor_details()}
+    first, last = {}, {}
+    for d in interp.get_input_details():
+        first[d["index"]] = 0
+    for i, op in enumerate(ops):
+        for t in op["outputs"]:
+            first.setdefault(t, i)
+        for t in op["inputs"]:
+            if t in first:
+                last[t] = i
+    end = len(ops)
+    for d in interp.get_output_details():
+        last[d["index"]] = end
+    live = np.zeros(end + 1, dtype=np.int64)
+    for t, a in first.items():
+        live[a:last.get(t, a) + 1] += sizes.get(t, 0)
+    return int(live.max()) if len(live) else 0
+
+
+def _percentiles(times) -> dict:
+    t = np.asarray(times) * 1000.0
+    return {"p50_ms": float(np.percentile(t, 50)), "p95_ms": float(np.percentile(t, 95)),
+            "p99_ms": float(np.percentile(t, 99)), "mean_ms": float(t.mean())}
+
+
+def time_invokes(interp, x, runs: int, warmup: int):
+    inp = interp.get_input_details()[0]
+    interp.set_tensor(inp["index"], quantize_input(x, inp))
+    for _ in range(warmup):
+        interp.invoke()
+    times = np.empty(runs)
+    for i in range(runs):
+        t0 = time.perf_counter()
+        interp.invoke()
+        times[i] = time.perf_counter() - t0
+    return times
+
+
+def bench_variant(path: str, sample, threads, batch: int, runs: int, warmup: int) -> dict:
+    res = {"size_bytes": os.path.getsize(path), "single": {}, "batched": {"batch": batch}}
+
+    rss0 = _rss_bytes()
+    interp = tf.lite.Interpreter(model_path=path, num_threads=1)
+    interp.allocate_tensors()
+    time_invokes(interp, sample[:1], 1, 0)
+    res["rss_delta_bytes"] = max(0, _rss_bytes() - rss0)
+    res["arena_bytes_est"] = arena_bytes_est(interp)
+    res["input_dtype"] = np.dtype(interp.get_input_details()[0]["dtype"]).name
+    del interp
+
+    xb = np.resize(sample, (batch,) + sample.shape[1:])
+    for t in threads:
+        interp = tf.lite.Interpreter(model_path=path, num_threads=t)
+        interp.allocate_tensors()
+        r = _percentiles(time_invokes(interp, sample[:1], runs, warmup))
+        r["images_per_sec"] = 1000.0 / r["mean_ms"]
+        res["single"][str(t)] = r
+
+        inp = interp.get_input_details()[0]
+        interp.resize_tensor_input(inp["index"], list(xb.shape))
+        interp.allocate_tensors()
+        r = _percentiles(time_invokes(interp, xb, max(5, runs // batch), min(warmup, 2)))
+        r["images_per_sec"] = batch * 1000.0 / r["mean_ms"]
+        res["batched"][str(t)] = r
+        del interp
+    return res
+
+
+def benchmark_model(model_name: str, results_root: str, threads, batch: int, runs: int, warmup: int,
+                    reconvert: bool = False, cache_dir: str = None) -> dict:
+    results_dir = os.path.join(results_root, model_name)
+    metrics_path = os.path.join(results_dir, "metrics.json")
+    with open(metrics_path, encoding="utf-8") as f:
+        metrics = json.load(f)
+    img = int(metrics.get("img", 96))
+
+    print(f"\n=== {model_name} (img={img}) ===")
+    paths = ensure_tflite(results_dir, model_name, img, reconvert, cache_dir)
+    sample = representative_images(img, n=max(batch, 8), cache_dir=cache_dir, seed=0)
+
+    out = {"threads": list(threads), "runs": runs}
+    for variant, path in paths.items():
+        r = bench_variant(path, sample, threads, batch, runs, warmup)
+        out[variant] = r
+        s1 = r["single"][str(threads[0])]
+        print(f"  {variant:8s} {r['size_bytes'] / 1024:8.0f} KB | arena~{r['arena_bytes_est'] / 1024:7.0f} KB"
+              f" | 1 img p50 {s1['p50_ms']:.2f} ms p99 {s1['p99_ms']:.2f} ms"
+              f" | batch{batch}@{threads[-1]}t {r['batched'][str(threads[-1])]['images_per_sec']:.0f} img/s")
+
+    metrics["tflite"] = out
+    from train_tf import save_json
+    save_json(metrics_path, metrics)
+    return out
+
+
+def print_table(results: dict, threads):
+    print("\nmodel            variant   size KB  arena KB  " +
+          "  ".join(f"p50@{t}t ms" for t in threads) + "  img/s(batch)")
+    for model_name, out in results.items():
+        for variant in VARIANTS:
+            r = out[variant]
+            lat = "  ".join(f"{r['single'][str(t)]['p50_ms']:10.2f}" for t in threads)
+            ips = r["batched"][str(threads[-1])]["images_per_sec"]
+            print(f"{model_name:16s} {variant:8s} {r['size_bytes'] / 1024:8.0f} "
+                  f"{r['arena_bytes_est'] / 1024:9.0f}  {lat}  {ips:12.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="train_tf.py benchmark",
+                                     description="results/<model>/saved_model -> TFLite gecikme/bellek ölçümü")
+    parser.add_argument("--models", nargs="+", default=["squeezenet", "efficientnet_b0"])
+    parser.add_argument("--results", type=str, default="results")
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1,
+                        help="1..N interpreter thread (N dahil, ikinin kuvvetleri + N)")
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--runs", type=int, default=200, help="Tek görüntü ölçüm tekrarı")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--reconvert", action="store_true", help="Var olan .tflite dosyalarını yeniden üret")
+    parser.add_argument("--cache_dir", type=str, default=None)
+    args = parser.parse_args(argv)
+
+    threads = sorted({t for t in (1, 2, 4, 8, 16, 32, 64) if t < args.threads} | {args.threads})
+    results = {}
+    for name in args.models:
+        if not os.path.isdir(os.path.join(args.results, name, "saved_model")):
+            print(f"Atlanıyor ({name}): {os.path.join(args.results, name, 'saved_model')} yok")
+            continue
+        results[name] = benchmark_model(name, args.results, threads, args.batch, args.runs,
+                                        args.warmup, args.reconvert, args.cache_dir)
+    if results:
+        print_table(results, threads)
+
+
+if __name__ == "__main__":
+    main()
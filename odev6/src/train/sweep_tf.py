@@ -0,0 +1,292 @@
+import os
+import csv
+import json
+import time
+import argparse
+import itertools
+import contextlib
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+
+# -------------------------
+# Çoklu model / hiperparametre taraması (CPU-only eğitim makineleri için)
+# Kullanım:
+#   python src/train/train_tf.py sweep --models squeezenet efficientnet_b0 --img 64 96 \
+#          --batch 32 64 --lr 1e-3 3e-4 --epochs 3 --workers 4
+#   python src/train/train_tf.py sweep --grid grid.json      (aynı anahtarlarla liste sözlüğü)
+# Her kombinasyon results/sweep/<koşu adı>/ altına train_tf.train_and_save ile eğitilir.
+# İşçiler 'spawn' ile başlar; her biri kendi CPU dilimine sabitlenir (sched_setaffinity) ve
+# TensorFlow intra/inter-op thread sayıları dilime göre ayarlanır -> işçiler birbirini ezmez.
+# metrics.json'ı aynı ayarlarla (ızgara + --cache) zaten olan koşular atlanır (kaldığı yerden devam).
+# --quantize: her koşudan sonra int8 .tflite + parite raporu (train_tf --quantize); özetteki
+# int8 doğruluk / gecikme sütunları bundan dolar.
+# Bir işçi ölürse (örn. OOM) havuz yeniden kurulur; yarım kalan koşular bir kez daha denenir,
+# yine olmazsa hata satırı olarak özete yazılır.
+# Sonunda tüm koşular tek tabloda: results/sweep/summary.csv (+ ekrana).
+# -------------------------
+GRID_KEYS = ("model", "img", "batch", "lr", "epochs")
+MAX_ATTEMPTS = 2      # havuz çökmesinde (BrokenProcessPool) koşu başına deneme
+CONFIG_KEYS = GRID_KEYS + ("cache",)
+SWEEP_DIR = os.path.join("results", "sweep")
+
+
+def expand_grid(grid: dict) -> list:
+    """{"model": [...], "img": [...], ...} -> kartezyen çarpım, [{model, img, batch, lr, epochs}, ...]"""
+    values = [grid[k] if isinstance(grid[k], (list, tuple)) else [grid[k]] for k in GRID_KEYS]
+    return [dict(zip(GRID_KEYS, combo)) for combo in itertools.product(*values)]
+
+
+def run_name(cfg: dict) -> str:
+    return f"{cfg['model']}_img{cfg['img']}_b{cfg['batch']}_lr{cfg['lr']:g}_e{cfg['epochs']}"
+
+
+def cost_estimate(cfg: dict) -> float:
+    """Kabaca süre: piksel * epoch (EfficientNet ~5x). Uzun koşular önce planlanır."""
+    return cfg["img"] ** 2 * cfg["epochs"] * (5.0 if cfg["model"] == "efficientnet_b0" else 1.0)
+
+
+def load_done(run_dir: str, cfg: dict):
+    """Aynı ayarlarla (CONFIG_KEYS; quantize istendiyse int8 raporu da) tamamlanmış koşunun metrics.json'ı; yoksa None."""
+    try:
+        with open(os.path.join(run_dir, "metrics.json"), encoding="utf-8") as f:
+            metrics = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    # Eski koşularda cache sadece data_pipeline altında
+    metrics.setdefault("cache", metrics.get("data_pipeline", {}).get("cache"))
+    for k in CONFIG_KEYS:
+        if metrics.get(k) != cfg[k]:
+            return None
+    if cfg.get("quantize") and "int8" not in metrics:
+        return None
+    if not os.path.isdir(os.path.join(run_dir, "saved_model")):
+        return None
+    return metrics
+
+
+# -------------------------
+# İşçi süreç
+# -------------------------
+def _init_worker(cpu_slices, inter_op: int):
+    """
+    Her işçi kuyruktan bir CPU dilimi alır. 'spawn' çocuğu giriş betiğini (train_tf.py,
+    __mp_main__) yeniden import ettiğinden TF bu noktada zaten yüklüdür: OMP_/TF_NUM_* ortam
+    değişkenleri burada değil, havuz kurulmadan önce ebeveynde (worker_env) ayarlanır.
+    Burada sadece CPU sabitleme ve TF thread ayarları (henüz bağlam oluşmadığı için geçerli).
+    """
+    cpus = cpu_slices.get()
+    n = len(cpus)
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(n)
+    tf.config.threading.set_inter_op_parallelism_threads(inter_op)
+    global _WORKER_CPUS
+    _WORKER_CPUS = list(cpus)
+
+
+_WORKER_CPUS = None
+
+
+def _run(cfg: dict, run_dir: str, cache_dir: str) -> dict:
+    from train_tf import train_and_save
+
+    args = argparse.Namespace(cache_dir=cache_dir, **cfg)
+    t0 = time.time()
+    try:
+        metrics = train_and_save(args, run_dir, verbose=2)
+    except Exception as e:  # tek koşunun hatası taramayı durdurmasın
+        return {**cfg, "status": "error", "error": f"{type(e).__name__}: {e}"}
+    metrics["sweep"] = {"cpus": _WORKER_CPUS, "wall_sec": time.time() - t0}
+    from train_tf import save_json
+    save_json(os.path.join(run_dir, "metrics.json"), metrics)
+    return {**metrics, "status": "done"}
+
+
+def cpu_slices(workers: int, threads: int):
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else \
+        list(range(os.cpu_count() or 1))
+    if threads * workers > len(cpus):
+        threads = max(1, len(cpus) // workers)
+    # Çekirdek sayısı işçiye yetmiyorsa dilimler örtüşür (yine de thread sınırı geçerli)
+    return [[cpus[(w * threads + i) % len(cpus)] for i in range(threads)] for w in range(workers)]
+
+
+@contextlib.contextmanager
+def worker_env(threads: int, inter_op: int):
+    """İşçilerin miras alacağı thread ortam değişkenleri; havuz boyunca kurulur, sonra geri alınır."""
+    env = {"OMP_NUM_THREADS": str(threads), "TF_NUM_INTRAOP_THREADS": str(threads),
+           "TF_NUM_INTEROP_THREADS": str(inter_op),
+           "TF_CPP_MIN_LOG_LEVEL": os.environ.get("TF_CPP_MIN_LOG_LEVEL", "2")}
+    saved = {k: os.environ.get(k) for k in env}
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+def run_sweep(configs: list, out_dir: str = SWEEP_DIR, workers: int = None, threads: int = None,
+              inter_op: int = 1, cache: str = "memmap", cache_dir: str = None, force: bool = False,
+              quantize: bool = False) -> list:
+    n_cpu = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    if workers is None:
+        workers = max(1, n_cpu // (threads or 4))
+    threads = threads or max(1, n_cpu // workers)
+
+    rows, todo = [], []
+    for cfg in configs:
+        cfg = {**cfg, "cache": cache, "quantize": quantize}
+        run_dir = os.path.join(out_dir, run_name(cfg))
+        done = None if force else load_done(run_dir, cfg)
+        if done is not None:
+            rows.append({**done, "status": "resumed"})
+        else:
+            todo.append((cfg, run_dir))
+    todo.sort(key=lambda t: -cost_estimate(t[0]))
+    print(f"Sweep: {len(configs)} koşu | {len(rows)} tamamlanmış (atlandı) | {len(todo)} çalışacak | "
+          f"{min(workers, max(1, len(todo)))} işçi x {threads} thread")
+
+    if todo:
+        from train_tf import CACHE_DIR
+        cache_dir = cache_dir or CACHE_DIR
+        workers = min(workers, len(todo))
+        slices = cpu_slices(workers, threads)
+        ctx = mp.get_context("spawn")
+        t0 = time.time()
+        total, done, attempts = len(todo), 0, {}
+        while todo:
+            queue = ctx.Queue()
+            for s in slices:
+                queue.put(s)
+            retry = []
+            with worker_env(len(slices[0]), inter_op), \
+                    ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker,
+                                        initargs=(queue, inter_op)) as pool:
+                futures = {pool.submit(_run, cfg, run_dir, cache_dir): (cfg, run_dir) for cfg, run_dir in todo}
+                for fut in as_completed(futures):
+                    cfg, run_dir = futures[fut]
+                    try:
+                        row = fut.result()
+                    except BrokenProcessPool as e:
+                        # Bir işçi öldü (OOM vb.): havuzdaki tüm bekleyen koşular buraya düşer
+                        attempts[run_name(cfg)] = attempts.get(run_name(cfg), 0) + 1
+                        if attempts[run_name(cfg)] < MAX_ATTEMPTS:
+                            retry.append((cfg, run_dir))
+                            continue
+                        row = {**cfg, "status": "error", "error": f"işçi süreç öldü ({type(e).__name__})"}
+                    rows.append(row)
+                    done += 1
+                    acc = row.get("test_accuracy")
+                    print(f"[{done}/{total}] {run_name(cfg)}: {row['status']}"
+                          + (f" acc={acc:.4f}" if acc is not None else f" ({row.get('error')})")
+                          + f" | {time.time() - t0:.0f} s")
+            if retry:
+                print(f"⚠️ İşçi havuzu çöktü; {len(retry)} koşu yeni havuzda tekrar denenecek")
+            todo = retry
+    return rows
+
+
+# -------------------------
+# Özet tablo
+# -------------------------
+SUMMARY_COLS = ("model", "img", "batch", "lr", "epochs", "test_accuracy", "test_loss", "params",
+                "train_time_sec", "int8_accuracy", "int8_p50_ms", "status")
+
+
+def summary_rows(rows: list) -> list:
+    out = []
+    for r in rows:
+        row = {k: r.get(k) for k in SUMMARY_COLS}
+        q = r.get("int8", {}).get("int8", {})            # train_tf --quantize parite raporu
+        row["int8_accuracy"] = q.get("accuracy")
+        row["int8_p50_ms"] = q.get("latency_p50_ms")
+        tfl = r.get("tflite", {}).get("int8", {}).get("single", {})
+        if tfl:                                           # benchmark çalıştırıldıysa onun p50'si
+            row["int8_p50_ms"] = tfl[min(tfl, key=int)]["p50_ms"]
+        out.append(row)
+    out.sort(key=lambda r: -(r["test_accuracy"] if r["test_accuracy"] is not None else -1))
+    return out
+
+
+def write_summary(rows: list, out_dir: str = SWEEP_DIR) -> str:
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, "summary.csv")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=SUMMARY_COLS)
+        w.writeheader()
+        w.writerows(rows)
+    return path
+
+
+def print_summary(rows: list):
+    def fmt(v, spec=""):
+        return "-" if v is None else format(v, spec)
+
+    print(f"\n{'model':16s} {'img':>4s} {'batch':>5s} {'lr':>8s} {'ep':>3s} {'acc':>7s} {'loss':>7s} "
+          f"{'params':>9s} {'train s':>8s} {'int8 acc':>8s} {'int8 ms':>8s}  status")
+    for r in rows:
+        print(f"{r['model']:16s} {r['img']:4d} {r['batch']:5d} {r['lr']:8g} {r['epochs']:3d} "
+              f"{fmt(r['test_accuracy'], '7.4f'):>7s} {fmt(r['test_loss'], '7.4f'):>7s} "
+              f"{fmt(r['params'], '9d'):>9s} {fmt(r['train_time_sec'], '8.0f'):>8s} "
+              f"{fmt(r['int8_accuracy'], '8.4f'):>8s} {fmt(r['int8_p50_ms'], '8.2f'):>8s}  {r['status']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="train_tf.py sweep",
+                                     description="Model/hiperparametre ızgarasını süreç havuzunda eğit")
+    parser.add_argument("--grid", type=str, default=None, help="JSON: {model: [...], img: [...], ...}")
+    parser.add_argument("--models", nargs="+", default=["squeezenet", "efficientnet_b0"])
+    parser.add_argument("--img", nargs="+", type=int, default=[96])
+    parser.add_argument("--batch", nargs="+", type=int, default=[32])
+    parser.add_argument("--lr", nargs="+", type=float, default=[1e-3])
+    parser.add_argument("--epochs", nargs="+", type=int, default=[3])
+    parser.add_argument("--workers", type=int, default=None, help="Eşzamanlı koşu (varsayılan: çekirdek / threads)")
+    parser.add_argument("--threads", type=int, default=None, help="Koşu başına intra-op thread / CPU")
+    parser.add_argument("--inter_op", type=int, default=1)
+    parser.add_argument("--cache", type=str, default="memmap", choices=["memmap", "snapshot", "none"])
+    parser.add_argument("--cache_dir", type=str, default=None)
+    parser.add_argument("--out", type=str, default=SWEEP_DIR)
+    parser.add_argument("--force", action="store_true", help="Tamamlanmış koşuları da yeniden eğit")
+    parser.add_argument("--quantize", action="store_true",
+                        help="Her koşudan sonra int8 .tflite üret (özette int8 doğruluk / gecikme)")
+    args = parser.parse_args(argv)
+
+    if args.grid:
+        with open(args.grid, encoding="utf-8") as f:
+            grid = json.load(f)
+        if "models" in grid:
+            grid["model"] = grid.pop("models")
+    else:
+        grid = {"model": args.models, "img": args.img, "batch": args.batch, "lr": args.lr,
+                "epochs": args.epochs}
+    missing = [k for k in GRID_KEYS if k not in grid]
+    if missing:
+        parser.error(f"grid'de eksik anahtar: {missing}")
+
+    configs = expand_grid(grid)
+    # Önişleme önbelleği işçiler başlamadan bir kez üretilsin (aynı dosyaya yarışmasınlar)
+    if args.cache == "memmap":
+        import tensorflow as tf
+        from train_tf import CACHE_DIR, resized_cache
+        (x_train, _), (x_test, _) = tf.keras.datasets.mnist.load_data()
+        for img in sorted({c["img"] for c in configs}):
+            resized_cache(x_train, img, args.cache_dir or CACHE_DIR, "train")
+            resized_cache(x_test, img, args.cache_dir or CACHE_DIR, "test")
+
+    rows = run_sweep(configs, args.out, args.workers, args.threads, args.inter_op, args.cache,
+                     args.cache_dir, args.force, args.quantize)
+    table = summary_rows(rows)
+    print_summary(table)
+    print("\n➡️ Özet:", write_summary(table, args.out))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
 import os
+import sys
 import json
 import time
+import hashlib
 import argparse
 import numpy as np
 import tensorflow as tf
 from sklearn.metrics import confusion_matrix
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "tools"))
+from quantize import CALIB_SAMPLES, calibration_set, quantize_and_report
+
 
 # -------------------------
 # Helpers
@@ -23,12 +28,121 @@ def save_json(path: str, data: dict):
 # Dataset (MNIST baseline, RAM şişirmeden tf.data ile)
 # Not: Kitaptaki "offline dataset" farklıysa sadece bu fonksiyonu değiştiririz.
 # -------------------------
-def make_mnist_datasets(img_size: int = 96, batch_size: int = 32):
+# Önişleme önbelleği: resize her epoch / her model için tekrar yapılmaz.
+#   memmap  : <cache_dir>/mnist_<img>/<split>_<özet>.npy, (N,img,img,1) uint8 -> float32 3 kanala
+#             göre 12x az yer; batch, karıştırılmış indekslerle memmap'ten toplanır
+#   snapshot: aynı uint8 tek kanallı tensörler tf.data snapshot olarak (<cache_dir>/snapshot_...)
+#   none    : eski yol (her örnek için cast + resize + repeat)
+# Her iki önbellekte de float'a çevirme ve 3 kanala çoğaltma sadece batch anında yapılır.
+# uint8'e yuvarlama, float resize'a göre en fazla 0.5/255 fark getirir.
+CACHE_DIR = ".tf_cache"
+PREPROC_VERSION = 1     # resize/yuvarlama değişirse artır -> eski önbellek kullanılmaz
+RESIZE_BATCH = 1024
+
+
+def data_digest(*arrays) -> str:
+    h = hashlib.sha1(f"v{PREPROC_VERSION}".encode())
+    for a in arrays:
+        h.update(np.ascontiguousarray(a).data)
+    return h.hexdigest()[:16]
+
+
+def resize_u8(x, img_size: int):
+    """(…,28,28) uint8 -> (…,img,img,1) uint8 (bilinear resize, [0,255]'e yuvarlanmış)."""
+    x = tf.image.resize(tf.cast(x, tf.float32)[..., tf.newaxis] / 255.0, (img_size, img_size))
+    return tf.cast(tf.round(tf.clip_by_value(x, 0.0, 1.0) * 255.0), tf.uint8)
+
+
+def to_model_input(x, y):
+    # Batch anında: uint8 (B,img,img,1) -> float32 (B,img,img,3) -> CNN'ler için
+    x = tf.cast(x, tf.float32) / 255.0
+    x = tf.repeat(x, 3, axis=-1)
+    return x, y
+
+
+def resized_cache(x, img_size: int, cache_dir: str, name: str):
+    """Resize edilmiş uint8 yığının memmap .npy önbelleği; yoksa parça parça üretilir."""
+    out_dir = os.path.join(cache_dir, f"mnist_{img_size}")
+    path = os.path.join(out_dir, f"{name}_{data_digest(x)}.npy")
+    if os.path.exists(path):
+        return np.load(path, mmap_mode="r")
+
+    ensure_dir(out_dir)
+    t0 = time.time()
+    tmp = f"{path}.tmp{os.getpid()}.npy"
+    out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.uint8,
+                                    shape=(len(x), img_size, img_size, 1))
+    for i in range(0, len(x), RESIZE_BATCH):
+        out[i:i + RESIZE_BATCH] = resize_u8(x[i:i + RESIZE_BATCH], img_size).numpy()
+    out.flush()
+    del out
+    os.replace(tmp, path)
+    print(f"Önişleme önbelleği yazıldı: {path} ({time.time() - t0:.1f} s)")
+    return np.load(path, mmap_mode="r")
+
+
+def memmap_dataset(x, y, batch_size: int, shuffle: bool, seed: int = 42):
+    """Önbellekteki (N,img,img,1) uint8 memmap'ten batch'ler: indeksler karıştırılır, örnekler toplanır."""
+    ds = tf.data.Dataset.range(len(x))
+    if shuffle:
+        ds = ds.shuffle(len(x), seed=seed, reshuffle_each_iteration=True)
+    ds = ds.batch(batch_size)
+
+    def take(idx):
+        idx = np.sort(idx)            # memmap'te sıralı erişim (batch içi sıra önemsiz)
+        return x[idx], y[idx]
+
+    def gather(idx):
+        xb, yb = tf.numpy_function(take, [idx], (tf.uint8, tf.as_dtype(y.dtype)))
+        xb.set_shape((None,) + x.shape[1:])
+        yb.set_shape((None,))
+        return xb, yb
+
+    return (
+        ds
+        .map(gather, num_parallel_calls=tf.data.AUTOTUNE)
+        .map(to_model_input, num_parallel_calls=tf.data.AUTOTUNE)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+
+
+def make_mnist_datasets(img_size: int = 96, batch_size: int = 32, cache: str = "memmap",
+                        cache_dir: str = CACHE_DIR):
     (x_train, y_train), (x_test, y_test) = tf.keras.datasets.mnist.load_data()
 
+    if cache == "memmap":
+        train_ds = memmap_dataset(resized_cache(x_train, img_size, cache_dir, "train"), y_train,
+                                  batch_size, shuffle=True)
+        test_ds = memmap_dataset(resized_cache(x_test, img_size, cache_dir, "test"), y_test,
+                                 batch_size, shuffle=False)
+        return train_ds, test_ds, y_test
+
     train_ds = tf.data.Dataset.from_tensor_slices((x_train, y_train))
     test_ds = tf.data.Dataset.from_tensor_slices((x_test, y_test))
 
+    if cache == "snapshot":
+        def resize(x, y):
+            return resize_u8(x, img_size), y
+
+        def snapshot(ds, x, name):
+            path = os.path.join(cache_dir, f"snapshot_{img_size}_{name}_{data_digest(x)}")
+            return ds.map(resize, num_parallel_calls=tf.data.AUTOTUNE).snapshot(path)
+
+        train_ds = (
+            snapshot(train_ds, x_train, "train")
+            .shuffle(20000)
+            .batch(batch_size)
+            .map(to_model_input, num_parallel_calls=tf.data.AUTOTUNE)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+        test_ds = (
+            snapshot(test_ds, x_test, "test")
+            .batch(batch_size)
+            .map(to_model_input, num_parallel_calls=tf.data.AUTOTUNE)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+        return train_ds, test_ds, y_test
+
     def preprocess(x, y):
         # x: (28,28) uint8
         x = tf.cast(x, tf.float32) / 255.0           # (28,28)
@@ -55,6 +169,54 @@ def make_mnist_datasets(img_size: int = 96, batch_size: int = 32):
     return train_ds, test_ds, y_test
 
 
+# -------------------------
+# Veri hattı darboğaz (stall) ölçümü
+# -------------------------
+# input_ms : veri hattının tek başına (model olmadan) bir batch üretme süresi
+# step_ms  : fit sırasındaki gerçek adım süresi (hesap + veri bekleme), medyan
+# input_ms / step_ms ~ 1 ise adım veri hattını bekliyor (girdi sınırlı); << 1 ise hesap sınırlı.
+class StepTimer(tf.keras.callbacks.Callback):
+    def __init__(self):
+        super().__init__()
+        self.step_times = []
+        self._t = None
+
+    def on_train_batch_begin(self, batch, logs=None):
+        self._t = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        self.step_times.append(time.perf_counter() - self._t)
+
+
+def input_pipeline_ms(ds, batches: int = 50, warmup: int = 5) -> float:
+    """Veri hattını modelsiz tüketip batch başına ms döndürür (ilk 'warmup' batch sayılmaz)."""
+    it = iter(ds)
+    n, t0 = 0, None
+    for i in range(warmup + batches):
+        try:
+            next(it)
+        except StopIteration:
+            break
+        if i == warmup - 1:
+            t0 = time.perf_counter()
+        elif i >= warmup:
+            n += 1
+    if t0 is None or n == 0:
+        return float("nan")
+    return (time.perf_counter() - t0) * 1000.0 / n
+
+
+def data_stall_report(train_ds, timer: StepTimer, batches: int = 50) -> dict:
+    step_ms = float(np.median(timer.step_times[1:] or timer.step_times)) * 1000.0 if timer.step_times \
+        else float("nan")
+    input_ms = input_pipeline_ms(train_ds, batches)
+    return {
+        "input_ms_per_batch": input_ms,
+        "train_step_ms": step_ms,
+        "input_to_step_ratio": input_ms / step_ms if step_ms > 0 else float("nan"),
+    }
+
+
 # -------------------------
 # Models
 # -------------------------
@@ -113,27 +275,53 @@ def build_model(model_name: str, input_shape, num_classes: int):
 
 
 # -------------------------
-# Main
+# int8 kuantizasyon (tools/quantize.py)
+# Kalibrasyon: eğitim setinden sınıf başına eşit örnek, modelin girdisine çevrilmiş halde
+# <cache_dir>/calib/ altında .npy (bench_tflite.py de aynı seti kullanır).
 # -------------------------
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--model", type=str, default="squeezenet",
-                        choices=["squeezenet", "efficientnet_b0"])
-    parser.add_argument("--epochs", type=int, default=3)
-    parser.add_argument("--batch", type=int, default=32)
-    parser.add_argument("--lr", type=float, default=1e-3)
-    parser.add_argument("--img", type=int, default=96)  # 96 ile başla (RAM/Speed iyi)
-    args = parser.parse_args()
+def mnist_calibration(img_size: int, n: int = CALIB_SAMPLES, cache_dir: str = CACHE_DIR, seed: int = 42):
+    (x_train, y_train), _ = tf.keras.datasets.mnist.load_data()
+    return calibration_set(f"mnist_{img_size}", x_train, y_train, n=n, cache_dir=os.path.join(cache_dir, "calib"),
+                           transform=lambda x: to_model_input(resize_u8(x, img_size), None)[0].numpy(),
+                           key=f"img{img_size}-v{PREPROC_VERSION}", seed=seed)
+
+
+def quantize_int8(results_dir: str, model_name: str, img_size: int, cache_dir: str = CACHE_DIR) -> dict:
+    """saved_model -> results_dir/tflite/<model>_{int8,float}.tflite + float/int8 parite raporu."""
+    _, (x_test, y_test) = tf.keras.datasets.mnist.load_data()
+    out_dir = os.path.join(results_dir, "tflite")
+    return quantize_and_report(os.path.join(results_dir, "saved_model"), mnist_calibration(img_size, cache_dir=cache_dir),
+                               resized_cache(x_test, img_size, cache_dir, "test"), y_test,
+                               os.path.join(out_dir, f"{model_name}_int8.tflite"),
+                               float_path=os.path.join(out_dir, f"{model_name}_float.tflite"),
+                               eval_transform=lambda x: to_model_input(x, None)[0].numpy())
 
+
+# -------------------------
+# Train + save (tek koşu; sweep_tf.py işçileri de bunu çağırır)
+# -------------------------
+def save_saved_model(model, path: str):
+    # Keras 2: model.save(dizin) SavedModel yazar; Keras 3'te SavedModel sadece model.export ile
+    if int(tf.keras.__version__.split(".")[0]) >= 3:
+        model.export(path)
+    else:
+        model.save(path)
+
+
+def train_and_save(args, results_dir: str, verbose: int = 1) -> dict:
+    """
+    Tek eğitim koşusu: args -> model, epochs, batch, lr, img, cache, cache_dir.
+    saved_model, metrics.json ve confusion_matrix.csv results_dir'e yazılır; metrics döner.
+    """
     # Reproducibility
     tf.random.set_seed(42)
     np.random.seed(42)
 
-    results_dir = os.path.join("results", args.model)
     ensure_dir(results_dir)
 
     # Dataset
-    train_ds, test_ds, y_test = make_mnist_datasets(img_size=args.img, batch_size=args.batch)
+    train_ds, test_ds, y_test = make_mnist_datasets(img_size=args.img, batch_size=args.batch,
+                                                    cache=args.cache, cache_dir=args.cache_dir)
 
     # Model
     model = build_model(args.model, input_shape=(args.img, args.img, 3), num_classes=10)
@@ -144,9 +332,13 @@ def main():
     )
 
     # Train
+    timer = StepTimer()
     t0 = time.time()
-    history = model.fit(train_ds, epochs=args.epochs, validation_data=test_ds, verbose=1)
+    history = model.fit(train_ds, epochs=args.epochs, validation_data=test_ds, verbose=verbose,
+                        callbacks=[timer])
     train_time = time.time() - t0
+    stall = data_stall_report(train_ds, timer)
+    stall["cache"] = args.cache
 
     # Evaluate
     test_loss, test_acc = model.evaluate(test_ds, verbose=0)
@@ -156,7 +348,7 @@ def main():
     cm = confusion_matrix(y_test, y_pred)
 
     # Save artifacts
-    model.save(os.path.join(results_dir, "saved_model"))
+    save_saved_model(model, os.path.join(results_dir, "saved_model"))
 
     metrics = {
         "model": args.model,
@@ -164,11 +356,15 @@ def main():
         "batch": args.batch,
         "lr": args.lr,
         "img": args.img,
+        "cache": args.cache,
         "test_loss": float(test_loss),
         "test_accuracy": float(test_acc),
         "train_time_sec": float(train_time),
         "params": int(model.count_params()),
+        "data_pipeline": stall,
     }
+    if getattr(args, "quantize", False):
+        metrics["int8"] = quantize_int8(results_dir, args.model, args.img, args.cache_dir)
     save_json(os.path.join(results_dir, "metrics.json"), metrics)
     np.savetxt(os.path.join(results_dir, "confusion_matrix.csv"), cm, fmt="%d", delimiter=",")
 
@@ -178,7 +374,44 @@ def main():
     print(f"Test Acc: {test_acc:.4f}")
     print(f"Params: {model.count_params()}")
     print(f"Train time (s): {train_time:.1f}")
+    print(f"Data pipeline ({args.cache}): {stall['input_ms_per_batch']:.1f} ms/batch input vs "
+          f"{stall['train_step_ms']:.1f} ms/step (ratio {stall['input_to_step_ratio']:.2f})")
+    if stall["input_to_step_ratio"] > 0.8:
+        print("⚠️ Eğitim veri hattını bekliyor (input-bound): --cache memmap/snapshot deneyin")
     print(f"Saved to: {results_dir}")
+    return metrics
+
+
+# -------------------------
+# Main
+# -------------------------
+def main():
+    # Alt komutlar: python train_tf.py benchmark ... (TFLite gecikme/bellek, bkz. bench_tflite.py)
+    #               python train_tf.py sweep ...     (çoklu model/hiperparametre, bkz. sweep_tf.py)
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        from bench_tflite import main as benchmark_main
+        benchmark_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "sweep":
+        from sweep_tf import main as sweep_main
+        sweep_main(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", type=str, default="squeezenet",
+                        choices=["squeezenet", "efficientnet_b0"])
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--lr", type=float, default=1e-3)
+    parser.add_argument("--img", type=int, default=96)  # 96 ile başla (RAM/Speed iyi)
+    parser.add_argument("--cache", type=str, default="memmap", choices=["memmap", "snapshot", "none"],
+                        help="Resize edilmiş veri önbelleği (memmap .npy / tf.data snapshot) ya da yok")
+    parser.add_argument("--cache_dir", type=str, default=CACHE_DIR)
+    parser.add_argument("--quantize", action="store_true",
+                        help="Eğitimden sonra int8 .tflite üret ve float/int8 doğruluk farkını raporla")
+    args = parser.parse_args()
+
+    train_and_save(args, os.path.join("results", args.model))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+quantize.py
+Ortak tam tamsayı (int8) kuantizasyon hattı: hdr_train.py, kws_train.py, odev6 train_tf.py.
+
+  calib = calibration_set("mnist_hdr", x_train, y_train, n=500)   # tabakalı, önbellekli (.npy memmap)
+  rapor = quantize_and_report(model, calib, x_test, y_test, "models_mnist/mnist_cnn_int8.tflite")
+
+Kalibrasyon seti sınıf başına eşit sayıda (tabakalı) örnekle bir kez seçilir ve
+<cache_dir>/<ad>_<özet>.npy olarak saklanır; özet veri + etiket + n + seed'den hesaplanır,
+sonraki çalıştırmalarda seçim/önişleme yapılmadan memmap ile açılır.
+quantize_and_report: float ve int8 .tflite üretir, ikisini aynı test setinde çalıştırır;
+doğruluk, top-1 uyuşma oranı, dosya boyutu ve tek görüntü gecikmesini döndürür
+(<çıktı>.json olarak da yazar).
+
+Komut satırı (hazır kalibrasyon dosyasıyla, örn. Final_Project/Soru2/calibration_*.npy):
+ python quantize.py <saved_model dizini | .h5 | .keras> --calib calib.npy --out model_int8.tflite
+        [--eval-x x.npy --eval-y y.npy] [--io int8|uint8|float32]
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+
+import numpy as np
+
+CALIB_DIR = ".calib_cache"
+CALIB_SAMPLES = 500
+CALIB_VERSION = 2     # seçim/önişleme mantığı değişirse artır
+
+
+# =========================
+# KALİBRASYON SETİ
+# =========================
+def stratified_indices(labels, n, seed=42):
+    """
+    Her sınıftan ~n/K örnek (az örnekli sınıfın açığı diğerlerinden), sıralı indeksler.
+    Eşit bölünmeyen artık (ve n < K ise hangi sınıfların örnek alacağı) rng ile rastgele seçilir.
+    """
+    labels = np.asarray(labels).ravel()
+    rng = np.random.default_rng(seed)
+    classes, counts = np.unique(labels, return_counts=True)
+    n = min(n, len(labels))
+    # Kota: eşit pay, sınıfta yoksa artan pay kalan sınıflara dağıtılır
+    quota = np.zeros(len(classes), dtype=np.int64)
+    left = n
+    open_ = np.ones(len(classes), dtype=bool)
+    while left > 0 and open_.any():
+        share = max(1, left // int(open_.sum()))
+        for k in rng.permutation(np.flatnonzero(open_)):
+            take = min(share, counts[k] - quota[k], left)
+            quota[k] += take
+            left -= take
+            if quota[k] == counts[k]:
+                open_[k] = False
+            if left == 0:
+                break
+    picks = [rng.choice(np.flatnonzero(labels == c), size=q, replace=False)
+             for c, q in zip(classes, quota) if q]
+    return np.sort(np.concatenate(picks)) if picks else np.empty(0, dtype=np.int64)
+
+
+def _digest(*arrays, extra=""):
+    h = hashlib.sha1(f"calib-v{CALIB_VERSION}-{extra}".encode())
+    for a in arrays:
+        if a is None:
+            continue
+        a = np.asarray(a)
+        h.update(str((a.shape, a.dtype.str)).encode())
+        for i in range(0, len(a), 4096):
+            h.update(np.ascontiguousarray(a[i:i + 4096]).data)
+    return h.hexdigest()[:16]
+
+
+def calibration_set(name, x, y=None, n=CALIB_SAMPLES, cache_dir=CALIB_DIR, transform=None,
+                    key="", seed=42):
+    """
+    x'ten n örneklik kalibrasyon seti, float32 memmap (salt okunur).
+    y verilirse tabakalı seçim, yoksa rastgele. transform: seçilen ham örneklere uygulanır
+    (örn. resize); sonucu değiştiriyorsa 'key' ile belirtin (önbellek anahtarına girer).
+    """
+    path = os.path.join(cache_dir, f"{name}_{_digest(x, y, extra=f'{n}-{seed}-{key}')}.npy")
+    if os.path.exists(path):
+        return np.load(path, mmap_mode="r")
+
+    if y is not None:
+        idx = stratified_indices(y, n, seed)
+    else:
+        idx = np.sort(np.random.default_rng(seed).choice(len(x), size=min(n, len(x)), replace=False))
+    sel = np.asarray(x[idx])
+    if transform is not None:
+        sel = np.asarray(transform(sel))
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}.npy"
+    np.save(tmp, sel.astype(np.float32))
+    os.replace(tmp, path)
+    return np.load(path, mmap_mode="r")
+
+
+def load_calibration(path):
+    """Hazır kalibrasyon dizisi (.npy), memmap ile."""
+    return np.load(path, mmap_mode="r")
+
+
+# =========================
+# DÖNÜŞTÜRME
+# =========================
+def _converter(model):
+    """Keras modeli, SavedModel dizini veya .h5/.keras yolu -> TFLiteConverter."""
+    import tensorflow as tf
+
+    if isinstance(model, (str, os.PathLike)):
+        if os.path.isdir(model):
+            return tf.lite.TFLiteConverter.from_saved_model(str(model))
+        model = tf.keras.models.load_model(str(model), compile=False)
+    return tf.lite.TFLiteConverter.from_keras_model(model)
+
+
+def convert_float(model):
+    return _converter(model).convert()
+
+
+def convert_int8(model, calib, io_dtype="int8"):
+    """
+    Tam tamsayı dönüşüm (TFLITE_BUILTINS_INT8). io_dtype: giriş/çıkış tipi
+    ("int8" MCU için, "uint8" eski arayüz, "float32" giriş/çıkışta float kalır).
+    """
+    import tensorflow as tf
+
+    converter = _converter(model)
+
+    def representative_data_gen():
+        for i in range(len(calib)):
+            yield [np.asarray(calib[i:i + 1], dtype=np.float32)]
+
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_data_gen
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    if io_dtype != "float32":
+        converter.inference_input_type = getattr(tf, io_dtype)
+        converter.inference_output_type = getattr(tf, io_dtype)
+    return converter.convert()
+
+
+# =========================
+# ÇALIŞTIRMA / KARŞILAŞTIRMA
+# =========================
+def _interpreter(model_content, num_threads=None):
+    import tensorflow as tf
+
+    if isinstance(model_content, (bytes, bytearray)):
+        return tf.lite.Interpreter(model_content=bytes(model_content), num_threads=num_threads)
+    return tf.lite.Interpreter(model_path=str(model_content), num_threads=num_threads)
+
+
+def quantize_input(x, detail):
+    """float -> modelin giriş tipi (int8/uint8 ise giriş ayrıntılarındaki scale/zero_point ile)."""
+    dtype = detail["dtype"]
+    if dtype in (np.int8, np.uint8):
+        scale, zero = detail["quantization"]
+        info = np.iinfo(dtype)
+        return np.clip(np.round(np.asarray(x, dtype=np.float32) / scale + zero), info.min, info.max).astype(dtype)
+    return np.asarray(x, dtype=dtype)
+
+
+def dequantize_output(y, detail):
+    if detail["dtype"] in (np.int8, np.uint8):
+        scale, zero = detail["quantization"]
+        return (y.astype(np.float32) - zero) * scale
+    return y
+
+
+def tflite_predict(model_content, x, batch_size=256, transform=None):
+    """
+    TFLite modelini (bytes veya yol) x üzerinde batch'ler halinde çalıştırır -> float çıktılar.
+    transform: her batch'e modele vermeden önce uygulanır (örn. uint8 önbellek -> float 3 kanal).
+    """
+    interp = _interpreter(model_content)
+    inp, out = interp.get_input_details()[0], interp.get_output_details()[0]
+    results, cur = [], None
+    for i in range(0, len(x), batch_size):
+        xb = np.asarray(x[i:i + batch_size])
+        if transform is not None:
+            xb = np.asarray(transform(xb))
+        if cur != len(xb):
+            interp.resize_tensor_input(inp["index"], [len(xb)] + list(inp["shape"][1:]))
+            interp.allocate_tensors()
+            cur = len(xb)
+        interp.set_tensor(inp["index"], quantize_input(xb, inp))
+        interp.invoke()
+        results.append(dequantize_output(interp.get_tensor(out["index"]), out))
+    return np.concatenate(results)
+
+
+def single_latency_ms(model_content, sample, runs=100, warmup=10):
+    interp = _interpreter(model_content, num_threads=1)
+    interp.allocate_tensors()
+    inp = interp.get_input_details()[0]
+    interp.set_tensor(inp["index"], quantize_input(np.asarray(sample[:1]), inp))
+    for _ in range(warmup):
+        interp.invoke()
+    t = np.empty(runs)
+    for i in range(runs):
+        t0 = time.perf_counter()
+        interp.invoke()
+        t[i] = time.perf_counter() - t0
+    return float(np.median(t) * 1000.0)
+
+
+def parity_report(float_content, int8_content, x, y, batch_size=256, transform=None):
+    """Float ve int8 TFLite: doğruluk, top-1 uyuşma, boyut, tek görüntü gecikmesi (p50)."""
+    rep = {}
+    preds = {}
+    sample = np.asarray(x[:1]) if transform is None else np.asarray(transform(np.asarray(x[:1])))
+    for name, content in (("float", float_content), ("int8", int8_content)):
+        out = tflite_predict(content, x, batch_size, transform)
+        preds[name] = out.argmax(axis=-1)
+        size = len(content) if isinstance(content, (bytes, bytearray)) else os.path.getsize(content)
+        rep[name] = {
+            "accuracy": float((preds[name] == np.asarray(y).ravel()).mean()),
+            "size_bytes": int(size),
+            "latency_p50_ms": single_latency_ms(content, sample),
+        }
+    rep["top1_agreement"] = float((preds["float"] == preds["int8"]).mean())
+    rep["accuracy_drop"] = rep["float"]["accuracy"] - rep["int8"]["accuracy"]
+    rep["size_ratio"] = rep["int8"]["size_bytes"] / rep["float"]["size_bytes"]
+    rep["eval_samples"] = int(len(x))
+    return rep
+
+
+def print_report(rep, title="int8 kuantizasyon"):
+    f, q = rep["float"], rep["int8"]
+    print(f"--- {title} ({rep['eval_samples']} örnek) ---")
+    print(f"  float: acc {f['accuracy'] * 100:6.2f}% | {f['size_bytes'] / 1024:7.0f} KB | {f['latency_p50_ms']:.3f} ms")
+    print(f"  int8 : acc {q['accuracy'] * 100:6.2f}% | {q['size_bytes'] / 1024:7.0f} KB | {q['latency_p50_ms']:.3f} ms")
+    print(f"  fark: {rep['accuracy_drop'] * 100:+.2f} puan | top-1 uyuşma {rep['top1_agreement'] * 100:.2f}% | "
+          f"boyut x{rep['size_ratio']:.2f}")
+
+
+def quantize_and_report(model, calib, x_eval, y_eval, out_path, io_dtype="int8", float_path=None,
+                        eval_transform=None, verbose=True):
+    """
+    int8 (ve float) .tflite üretir, yazar, parite raporunu döndürür (<out_path>.json).
+    float_path verilirse float model de oraya yazılır; eval_transform test batch'lerine uygulanır.
+    """
+    t0 = time.time()
+    int8 = convert_int8(model, calib, io_dtype)
+    flt = convert_float(model)
+    for path, data in ((out_path, int8), (float_path, flt)):
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+    rep = parity_report(flt, int8, x_eval, y_eval, transform=eval_transform) if x_eval is not None else {}
+    rep.update({"calibration_samples": int(len(calib)), "io_dtype": io_dtype,
+                "convert_sec": time.time() - t0, "tflite": out_path})
+    with open(out_path + ".json", "w", encoding="utf-8") as f:
+        json.dump(rep, f, indent=2)
+    if verbose and "int8" in rep:
+        print_report(rep, os.path.basename(out_path))
+    return rep
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keras/SavedModel -> int8 TFLite + float/int8 parite raporu")
+    parser.add_argument("model", help="SavedModel dizini, .h5 veya .keras")
+    parser.add_argument("--calib", required=True, help="Kalibrasyon .npy (N, ...) float32")
+    parser.add_argument("--out", required=True, help="int8 .tflite çıktı yolu")
+    parser.add_argument("--float-out", default=None, help="float .tflite de yazılsın")
+    parser.add_argument("--eval-x", default=None)
+    parser.add_argument("--eval-y", default=None)
+    parser.add_argument("--io", choices=["int8", "uint8", "float32"], default="int8")
+    args = parser.parse_args()
+
+    calib = load_calibration(args.calib)
+    x_eval = np.load(args.eval_x, mmap_mode="r") if args.eval_x else None
+    y_eval = np.load(args.eval_y) if args.eval_y else None
+    if (x_eval is None) != (y_eval is None):
+        sys.exit("--eval-x ve --eval-y birlikte verilmeli")
+    rep = quantize_and_report(args.model, calib, x_eval, y_eval, args.out, args.io, args.float_out)
+    print(f"[{len(calib)} kalibrasyon örneği] -> {args.out} ({os.path.getsize(args.out)} bytes)")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+tflite_eval.py
+Çok iş parçacıklı, batch'li TFLite değerlendirme motoru (gönderdiğimiz .tflite gerçekten doğru mu?).
+
+  havuz = InterpreterPool("models_mnist/mnist_cnn_int8.tflite", threads=8)
+  rapor = evaluate(havuz, x_test, y_test, transform=lambda x: x[..., None] / 255.0)
+
+Her iş parçacığının kendi tf.lite.Interpreter'ı vardır (interpreter'lar thread-safe değildir;
+invoke sırasında GIL bırakıldığından thread'ler gerçekten paralel çalışır). Test seti
+batch'ler halinde akıtılır: aynı anda en fazla 2 x thread batch bellekte/işte olur, x bir
+memmap ise tamamı RAM'e alınmaz. int8/uint8 girişli modellerde float girdi, giriş
+ayrıntılarındaki scale/zero_point ile kuantize edilir (quantize.quantize_input).
+Rapor: doğruluk, karışıklık matrisi, sınıf başına recall, görüntü/s.
+
+Komut satırı:
+ python tflite_eval.py model.tflite --x x_test.npy --y y_test.npy [--scale 255] [--threads N]
+"""
+import os
+import sys
+import json
+import time
+import threading
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from quantize import quantize_input, dequantize_output
+
+BATCH_SIZE = 64
+
+
+class InterpreterPool:
+    """Thread başına bir interpreter (ilk kullanımda oluşturulur), batch boyutuna göre yeniden boyutlanır."""
+
+    def __init__(self, model_path, threads=None, batch_size=BATCH_SIZE):
+        self.model_path = str(model_path)
+        self.threads = threads or (len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity")
+                                   else os.cpu_count() or 1)
+        self.batch_size = batch_size
+        with open(self.model_path, "rb") as f:
+            self.model_content = f.read()     # her thread dosyayı tekrar okumasın
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="tflite")
+        info = self._interpreter()            # giriş/çıkış ayrıntıları için (çağıran thread)
+        self.input_detail = info["inp"]
+        self.output_detail = info["out"]
+
+    def _interpreter(self):
+        st = getattr(self._local, "state", None)
+        if st is None:
+            import tensorflow as tf
+
+            interp = tf.lite.Interpreter(model_content=self.model_content, num_threads=1)
+            interp.allocate_tensors()
+            st = {"interp": interp, "inp": interp.get_input_details()[0],
+                  "out": interp.get_output_details()[0], "batch": 1}
+            self._local.state = st
+        return st
+
+    def _run(self, xb):
+        st = self._interpreter()
+        interp, inp, out = st["interp"], st["inp"], st["out"]
+        if st["batch"] != len(xb):
+            interp.resize_tensor_input(inp["index"], [len(xb)] + list(inp["shape"][1:]))
+            interp.allocate_tensors()
+            st["batch"] = len(xb)
+        interp.set_tensor(inp["index"], quantize_input(xb, inp))
+        interp.invoke()
+        return dequantize_output(interp.get_tensor(out["index"]), out)
+
+    def predict(self, x, transform=None):
+        """x'i batch'ler halinde thread'lere dağıtır -> (N, sınıf) float çıktılar (sıra korunur)."""
+        def job(i):
+            xb = np.asarray(x[i:i + self.batch_size])
+            if transform is not None:
+                xb = np.asarray(transform(xb))
+            return self._run(xb)
+
+        results, pending = [], deque()
+        for i in range(0, len(x), self.batch_size):
+            if len(pending) >= 2 * self.threads:
+                results.append(pending.popleft().result())
+            pending.append(self._executor.submit(job, i))
+        while pending:
+            results.append(pending.popleft().result())
+        return np.concatenate(results) if results else np.empty((0,))
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def confusion(y_true, y_pred, num_classes):
+    """(K, K) karışıklık matrisi, satır = gerçek, sütun = tahmin."""
+    idx = np.asarray(y_true, dtype=np.int64).ravel() * num_classes + np.asarray(y_pred, dtype=np.int64)
+    return np.bincount(idx, minlength=num_classes * num_classes).reshape(num_classes, num_classes)
+
+
+def evaluate(pool, x, y, transform=None, num_classes=None):
+    """Havuzla tüm test seti -> accuracy, confusion_matrix, per_class_recall, images_per_sec."""
+    y = np.asarray(y).ravel()
+    pool.predict(x[:pool.batch_size], transform)      # ısınma (interpreter'lar oluşsun)
+    t0 = time.perf_counter()
+    out = pool.predict(x, transform)
+    sec = time.perf_counter() - t0
+    pred = out.argmax(axis=-1)
+    k = num_classes or max(out.shape[-1], int(y.max()) + 1)
+    cm = confusion(y, pred, k)
+    support = cm.sum(axis=1)
+    return {
+        "model": pool.model_path,
+        "input_dtype": np.dtype(pool.input_detail["dtype"]).name,
+        "input_quantization": [float(v) for v in pool.input_detail["quantization"]],
+        "samples": int(len(y)),
+        "accuracy": float((pred == y).mean()),
+        "per_class_recall": [float(v) for v in np.diag(cm) / np.maximum(support, 1)],
+        "confusion_matrix": cm.tolist(),
+        "seconds": sec,
+        "images_per_sec": len(y) / sec if sec > 0 else float("inf"),
+        "threads": pool.threads,
+        "batch_size": pool.batch_size,
+    }
+
+
+def evaluate_model(model_path, x, y, threads=None, batch_size=BATCH_SIZE, transform=None, num_classes=None):
+    with InterpreterPool(model_path, threads, batch_size) as pool:
+        return evaluate(pool, x, y, transform, num_classes)
+
+
+def print_eval(rep):
+    q = rep["input_quantization"]
+    qs = f" scale={q[0]:.6g} zp={int(q[1])}" if rep["input_dtype"] in ("int8", "uint8") else ""
+    print(f"--- {os.path.basename(rep['model'])} (giriş {rep['input_dtype']}{qs}) ---")
+    print(f"  doğruluk {rep['accuracy'] * 100:.2f}% ({rep['samples']} örnek) | "
+          f"{rep['images_per_sec']:.0f} görüntü/s ({rep['seconds']:.2f} s, {rep['threads']} thread x batch {rep['batch_size']})")
+    cm = np.asarray(rep["confusion_matrix"])
+    w = max(4, len(str(cm.max())) + 1)
+    print("  karışıklık matrisi (satır = gerçek, sütun = tahmin):")
+    print("      " + "".join(f"{j:>{w}d}" for j in range(cm.shape[1])) + "  recall")
+    for i, row in enumerate(cm):
+        print(f"  {i:3d} " + "".join(f"{v:>{w}d}" for v in row) + f"  {rep['per_class_recall'][i] * 100:5.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TFLite modelini test setinde çok thread'li değerlendir")
+    parser.add_argument("model", nargs="+", help=".tflite dosya(lar)ı")
+    parser.add_argument("--x", required=True, help="Test girdileri .npy (modelin float girdisi ya da --scale ile ham)")
+    parser.add_argument("--y", required=True, help="Etiketler .npy")
+    parser.add_argument("--scale", type=float, default=None, help="Girdi bölücü (örn. ham MNIST için 255)")
+    parser.add_argument("--add-channel", action="store_true", help="Sona kanal ekseni ekle (N,H,W) -> (N,H,W,1)")
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE)
+    parser.add_argument("--json", default=None, help="Raporları JSON olarak yaz")
+    args = parser.parse_args()
+
+    def transform(xb):
+        xb = xb.astype(np.float32)
+        if args.scale:
+            xb /= args.scale
+        return xb[..., None] if args.add_channel else xb
+
+    x = np.load(args.x, mmap_mode="r")
+    y = np.load(args.y)
+    reports = []
+    for path in args.model:
+        if not os.path.exists(path):
+            sys.exit(f"Model yok: {path}")
+        reports.append(evaluate_model(path, x, y, args.threads, args.batch, transform))
+        print_eval(reports[-1])
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
@@ -0,0 +1,665 @@
+#!/usr/bin/env python3
+"""
+tflite_to_c.py
+Ortak TFLite -> C dizisi çevirici (Odev5 ve Final_Project betikleri bunu kullanır).
+
+Byte'lar tek tek Python string'ine çevrilmez: 256 girişlik sabit genişlikli
+tablo (LUT) ile NumPy üzerinde satır satır metin üretilir ve dosyaya parça
+parça (streaming) yazılır. Çok MB'lık modellerde bellek kullanımı sabittir.
+
+Kullanım:
+ python tools/tflite_to_c.py model.tflite --name kws_model               # kws_model.h + kws_model.c
+ python tools/tflite_to_c.py model.tflite --name resnet_data --header-only  # tek .h (Arduino)
+ python tools/tflite_to_c.py models/*.tflite --out-dir include/             # toplu, önbellekli
+ python tools/tflite_to_c.py --bench Final_Project/Soru4/resnet_model.h
+ python tools/tflite_to_c.py model.tflite --compare                       # kodlama karşılaştırması
+
+Kodlamalar (--encoding) ve biçimler (--format):
+ raw + hex/dec : klasik '0x1c, 0x00, ...' başlatıcı (Soru4 başlıklarıyla aynı)
+ raw + str     : "\x1c\x00..." string literal; derleyici token başına değil satır başına
+                 çalışır -> çok daha hızlı derleme, ~%35 daha küçük başlık
+ lz4           : LZ4 blok sıkıştırılmış dizi + başlıkta küçük C açıcı (<ad>_unpack);
+                 flash'ta daha az yer, açılış için RAM/PSRAM'de <ad>_len byte gerekir
+ incbin        : .incbin ile .tflite dosyası doğrudan assembler'a gömülür; C tarafında
+                 metin yoktur (derleme ~anlık). Derlerken -Wa,-I<çıktı klasörü> gerekir.
+
+Önbellek: model byte'larının SHA-256 özeti + çıktı ayarları anahtardır. Değişmeyen
+modeller atlanır; diskteki .h/.c yalnızca içerik gerçekten değiştiyse yeniden
+yazılır, böylece zaman damgaları (ve firmware derlemesi) artımlı kalır. Önbellekte
+sadece manifestin hâlâ gösterdiği girdiler tutulur; eski model/ayar kopyaları silinir.
+"""
+import os
+import re
+import sys
+import json
+import time
+import filecmp
+import shutil
+import hashlib
+import argparse
+import numpy as np
+
+SATIR_BASINA = 12
+GIRINTI = "    "
+PARCA_SATIR = 65536   # her yazımda işlenen satır sayısı (~768 KB girdi)
+ONBELLEK_DIZINI = ".tflite_to_c_cache"
+
+_LUT = {}
+
+
+def _tablo(bicim):
+    """Her byte için sabit genişlikli hücre metni: (256, genislik) uint8."""
+    if bicim not in _LUT:
+        if bicim == "hex":
+            hucreler = [f"0x{b:02x}, " for b in range(256)]
+        elif bicim == "dec":
+            hucreler = [f"{b:3d}, " for b in range(256)]
+        elif bicim == "str":
+            hucreler = [f"\\x{b:02x}" for b in range(256)]
+        else:
+            raise ValueError(f"Bilinmeyen biçim: {bicim}")
+        _LUT[bicim] = np.frombuffer("".join(hucreler).encode("ascii"), dtype=np.uint8).reshape(256, -1)
+    return _LUT[bicim]
+
+
+def bayt_metne(veri, bicim="hex", satir_basina=SATIR_BASINA, girinti=GIRINTI):
+    """
+    Byte dizisini C başlatıcı gövdesine çevirir (vektörel). Her satır:
+    '<girinti>0x1c, 0x00, ... \\n' ('str' biçiminde '<girinti>"\\x1c\\x00..."\\n').
+    Dönen değer ASCII bytes.
+    """
+    arr = np.frombuffer(veri, dtype=np.uint8) if not isinstance(veri, np.ndarray) else veri
+    if arr.size == 0:
+        return b""
+    lut = _tablo(bicim)
+    g = lut.shape[1]
+    n = arr.size
+    tam = n // satir_basina
+    tirnak = '"' if bicim == "str" else ""
+    bas = np.frombuffer((girinti + tirnak).encode("ascii"), dtype=np.uint8)
+    son = np.frombuffer((tirnak + "\n").encode("ascii"), dtype=np.uint8)
+
+    parcalar = []
+    if tam:
+        # Hücreler doğrudan satır tamponunun içine toplanır (ara kopya yok)
+        satirlar = np.empty((tam, len(bas) + satir_basina * g + len(son)), dtype=np.uint8)
+        satirlar[:, :len(bas)] = bas
+        satirlar[:, -len(son):] = son
+        govde = satirlar[:, len(bas):-len(son)].reshape(tam, satir_basina, g)
+        np.take(lut, arr[:tam * satir_basina].reshape(tam, satir_basina), axis=0, out=govde, mode="clip")
+        parcalar.append(satirlar.tobytes())
+    if n % satir_basina:
+        kalan = np.take(lut, arr[tam * satir_basina:], axis=0)
+        parcalar.append(bas.tobytes() + kalan.tobytes() + son.tobytes())
+    return b"".join(parcalar)
+
+
+def dizi_govdesi_yaz(f, girdi_yolu, bicim="hex", satir_basina=SATIR_BASINA, girinti=GIRINTI):
+    """Girdi dosyasını parça parça okuyup biçimlenmiş metni f'ye (ikili mod) yazar. Byte sayısını döndürür."""
+    toplam = 0
+    parca = satir_basina * PARCA_SATIR
+    with open(girdi_yolu, "rb") as g:
+        while True:
+            veri = g.read(parca)
+            if not veri:
+                break
+            f.write(bayt_metne(veri, bicim, satir_basina, girinti))
+            toplam += len(veri)
+    return toplam
+
+
+def _nitelikler(hizalama, bolum, cpp):
+    """Dizi tanımı için hizalama / bölüm (section) nitelikleri."""
+    on, arka = "", ""
+    if hizalama:
+        if cpp:
+            on = f"alignas({hizalama}) "
+        else:
+            arka += f" __attribute__((aligned({hizalama})))"
+    if bolum:
+        arka += f' __attribute__((section("{bolum}")))'
+    return on, arka
+
+
+def _dizi_ac(ad, bicim, on, arka, n):
+    if bicim == "str":
+        # "..." literal'in sonundaki NUL için +1 (C++ boyutu tam ister)
+        return f"{on}const unsigned char {ad}[{n + 1}]{arka} =\n" + ("" if n else f'{GIRINTI}""\n')
+    return f"{on}const unsigned char {ad}[]{arka} = {{\n"
+
+
+def _dizi_kapa(bicim):
+    return ";\n" if bicim == "str" else "};\n"
+
+
+# ==========================================
+# LZ4 BLOK SIKIŞTIRMA (+ C AÇICI)
+# ==========================================
+# Standart LZ4 blok biçimi: [token][literal uzunluk+][literaller][offset:2 LE][eşleşme uzunluk+]
+# TFLite dosyalarındaki sıfır dolguları / tekrar eden tensör başlıkları iyi sıkışır.
+LZ4_MIN_ESLESME = 4
+
+_LZ4_ACICI = """\
+#ifndef TFLITE_LZ4_UNPACK_DEFINED
+#define TFLITE_LZ4_UNPACK_DEFINED
+/* LZ4 blok acici: dst en az <ad>_len byte olmali. Acilan byte sayisini dondurur. */
+static inline unsigned int tflite_lz4_unpack(const unsigned char *src, unsigned int src_len,
+                                             unsigned char *dst)
+{
+    const unsigned char *end = src + src_len;
+    unsigned char *o = dst;
+    while (src < end) {
+        unsigned int tok = *src++, n = tok >> 4, s;
+        if (n == 15) do { s = *src++; n += s; } while (s == 255);
+        while (n--) *o++ = *src++;
+        if (src >= end) break;
+        const unsigned char *m = o - (src[0] | (src[1] << 8));
+        src += 2;
+        n = (tok & 15) + 4;
+        if ((tok & 15) == 15) do { s = *src++; n += s; } while (s == 255);
+        while (n--) *o++ = *m++;
+    }
+    return (unsigned int)(o - dst);
+}
+#endif
+"""
+
+
+def _lz4_uzunluk(out, n):
+    while n >= 255:
+        out.append(255)
+        n -= 255
+    out.append(n)
+
+
+def _lz4_blok(out, literal, offset=0, eslesme=0):
+    nl, nm = len(literal), eslesme - LZ4_MIN_ESLESME
+    out.append((min(nl, 15) << 4) | (min(nm, 15) if eslesme else 0))
+    if nl >= 15:
+        _lz4_uzunluk(out, nl - 15)
+    out += literal
+    if eslesme:
+        out += offset.to_bytes(2, "little")
+        if nm >= 15:
+            _lz4_uzunluk(out, nm - 15)
+
+
+def lz4_sikistir(veri):
+    """Açgözlü (greedy) LZ4 blok sıkıştırıcı; son 5 byte her zaman literal (LZ4 kuralı)."""
+    veri = bytes(veri)
+    n = len(veri)
+    out = bytearray()
+    tablo = {}
+    i = lit = 0
+    sinir = n - 12          # son eşleşme bu konumdan önce başlamalı
+    eslesme_sonu = n - 5    # son 5 byte literal kalmalı
+    while i < sinir:
+        anahtar = veri[i:i + 4]
+        aday = tablo.get(anahtar)
+        tablo[anahtar] = i
+        if aday is None or i - aday > 0xFFFF:
+            i += 1
+            continue
+        m = LZ4_MIN_ESLESME
+        while i + m < eslesme_sonu and veri[aday + m] == veri[i + m]:
+            m += 1
+        _lz4_blok(out, veri[lit:i], i - aday, m)
+        i += m
+        lit = i
+    _lz4_blok(out, veri[lit:])
+    return bytes(out)
+
+
+def lz4_ac(blob):
+    """C açıcının Python karşılığı (doğrulama için)."""
+    out = bytearray()
+    i, n = 0, len(blob)
+    while i < n:
+        tok = blob[i]
+        i += 1
+        uz = tok >> 4
+        if uz == 15:
+            while True:
+                s = blob[i]
+                i += 1
+                uz += s
+                if s != 255:
+                    break
+        out += blob[i:i + uz]
+        i += uz
+        if i >= n:
+            break
+        m = len(out) - (blob[i] | (blob[i + 1] << 8))
+        i += 2
+        uz = (tok & 15) + LZ4_MIN_ESLESME
+        if tok & 15 == 15:
+            while True:
+                s = blob[i]
+                i += 1
+                uz += s
+                if s != 255:
+                    break
+        for k in range(uz):     # örtüşen kopya (offset < uzunluk) byte byte olmalı
+            out.append(out[m + k])
+    return bytes(out)
+
+
+def _lz4_tanim(girdi_yolu, ad, bicim, on, arka, satir_basina):
+    veri = open(girdi_yolu, "rb").read()
+    blob = lz4_sikistir(veri)
+    if lz4_ac(blob) != veri:
+        raise RuntimeError(f"LZ4 doğrulaması başarısız: {girdi_yolu}")
+    # Sıkıştırılmış veri byte byte okunur: hizalama ('on') sadece açılmış diziye gerekir
+    metin = (_dizi_ac(f"{ad}_lz4", bicim, "", arka, len(blob)).encode("ascii")
+             + bayt_metne(blob, bicim, satir_basina)
+             + _dizi_kapa(bicim).encode("ascii")
+             + f"const unsigned int {ad}_lz4_len = {len(blob)};\n"
+               f"const unsigned int {ad}_len = {len(veri)};\n"
+               f"/* Kullanim: {on}static unsigned char {ad}[{len(veri)}];\n"
+               f"   tflite_lz4_unpack({ad}_lz4, {ad}_lz4_len, {ad}); */\n".encode("ascii"))
+    return metin, len(veri)
+
+
+# ==========================================
+# .incbin (ASSEMBLER İLE DOĞRUDAN GÖMME)
+# ==========================================
+def _incbin_tanim(girdi_yolu, hedef_dizin, ad, hizalama, bolum):
+    """Üst düzey asm bloğu: sembol + .incbin + _len. Yol, hedef_dizin'e (çıktının klasörü) görelidir."""
+    yol = os.path.relpath(os.path.abspath(girdi_yolu), os.path.abspath(hedef_dizin or "."))
+    yol = yol.replace(os.sep, "/")
+    n = os.path.getsize(girdi_yolu)
+    satirlar = [
+        f'.section {bolum or ".rodata." + ad}, "a"',
+        f".global {ad}",
+        f".balign {hizalama or 1}",
+        f"{ad}:",
+        f'.incbin "{yol}"',
+        f".global {ad}_len",
+        ".balign 4",
+        f"{ad}_len:",
+        f".long {n}",
+        ".previous",
+    ]
+    govde = "".join('    "' + x.replace('"', '\\"') + '\\n"\n' for x in satirlar)
+    metin = (f"/* Derleme: -Wa,-I<bu klasor> ({yol} assembler tarafindan okunur).\n"
+             f"   Tanim tek ceviri biriminde (tek .c/.cpp) olmalidir. */\n"
+             f"__asm__(\n{govde});\n")
+    return metin, n
+
+
+def _extern_bildirimler(ad, kodlama):
+    """extern "C" korumalı bildirimler (.h dosyası veya incbin tek başlığı için)."""
+    if kodlama == "lz4":
+        adlar = [f"extern const unsigned char {ad}_lz4[];", f"extern const unsigned int {ad}_lz4_len;",
+                 f"extern const unsigned int {ad}_len;"]
+    else:
+        adlar = [f"extern const unsigned char {ad}[];", f"extern const unsigned int {ad}_len;"]
+    return ("#ifdef __cplusplus\nextern \"C\" {\n#endif\n\n" + "\n".join(adlar)
+            + "\n\n#ifdef __cplusplus\n}\n#endif\n")
+
+
+def tek_baslik_yaz(girdi_yolu, cikti_yolu, ad, bicim="hex", hizalama=8, bolum=None,
+                   cstdint=False, satir_basina=SATIR_BASINA, kodlama="raw", hedef_dizin=None):
+    """
+    Tanımın kendisini içeren tek .h (Arduino / C++ projeleri, Soru4 başlıklarıyla aynı düzen).
+    hedef_dizin: incbin yolunun göreli olacağı klasör (varsayılan: çıktının klasörü).
+    """
+    on, arka = _nitelikler(hizalama, bolum, cpp=True)
+    with open(cikti_yolu, "wb") as f:
+        f.write(b"#pragma once\n")
+        if cstdint:
+            f.write(b"#include <cstdint>\n\n")
+        if kodlama == "lz4":
+            metin, n = _lz4_tanim(girdi_yolu, ad, bicim, on, arka, satir_basina)
+            f.write(_LZ4_ACICI.encode("ascii") + b"\n" + metin)
+        elif kodlama == "incbin":
+            metin, n = _incbin_tanim(girdi_yolu, hedef_dizin or os.path.dirname(str(cikti_yolu)), ad,
+                                     hizalama, bolum)
+            f.write(_extern_bildirimler(ad, kodlama).encode("ascii") + b"\n" + metin.encode("ascii"))
+        else:
+            f.write(_dizi_ac(ad, bicim, on, arka, os.path.getsize(girdi_yolu)).encode("ascii"))
+            n = dizi_govdesi_yaz(f, girdi_yolu, bicim, satir_basina)
+            f.write(f"{_dizi_kapa(bicim)}const unsigned int {ad}_len = {n};\n".encode("ascii"))
+    return n
+
+
+def c_ve_h_yaz(girdi_yolu, cikti_oneki, ad, bicim="hex", hizalama=8, bolum=None,
+               satir_basina=SATIR_BASINA, kodlama="raw", hedef_dizin=None):
+    """<önek>.h (extern bildirimler) + <önek>.c (tanım) üretir."""
+    h_yolu, c_yolu = cikti_oneki + ".h", cikti_oneki + ".c"
+    on, arka = _nitelikler(hizalama, bolum, cpp=False)
+    with open(h_yolu, "w", encoding="ascii") as f:
+        f.write("#pragma once\n" + _extern_bildirimler(ad, kodlama))
+        if kodlama == "lz4":
+            f.write("\n" + _LZ4_ACICI)
+    with open(c_yolu, "wb") as f:
+        f.write(f'#include "{os.path.basename(h_yolu)}"\n\n'.encode("ascii"))
+        if kodlama == "lz4":
+            metin, n = _lz4_tanim(girdi_yolu, ad, bicim, on, arka, satir_basina)
+            f.write(metin)
+        elif kodlama == "incbin":
+            metin, n = _incbin_tanim(girdi_yolu, hedef_dizin or os.path.dirname(c_yolu), ad,
+                                     hizalama, bolum)
+            f.write(metin.encode("ascii"))
+        else:
+            f.write(_dizi_ac(ad, bicim, on, arka, os.path.getsize(girdi_yolu)).encode("ascii"))
+            n = dizi_govdesi_yaz(f, girdi_yolu, bicim, satir_basina)
+            f.write(f"{_dizi_kapa(bicim)}const unsigned int {ad}_len = {n};\n".encode("ascii"))
+    return n
+
+
+# ==========================================
+# İÇERİK ÖZETLİ (CONTENT-HASHED) ÖNBELLEK
+# ==========================================
+def dosya_ozeti(yol, parca=1 << 20):
+    h = hashlib.sha256()
+    with open(yol, "rb") as f:
+        while True:
+            veri = f.read(parca)
+            if not veri:
+                break
+            h.update(veri)
+    return h.hexdigest()
+
+
+def _degisirse_yaz(hedef, kaynak):
+    """hedef, kaynak ile birebir aynıysa dokunmaz (mtime korunur). Yazdıysa True."""
+    if (os.path.isfile(hedef) and os.path.getsize(hedef) == os.path.getsize(kaynak)
+            and filecmp.cmp(hedef, kaynak, shallow=False)):
+        return False
+    os.makedirs(os.path.dirname(os.path.abspath(hedef)), exist_ok=True)
+    gecici = f"{hedef}.tmp{os.getpid()}"
+    with open(kaynak, "rb") as k, open(gecici, "wb") as g:
+        while True:
+            veri = k.read(1 << 20)
+            if not veri:
+                break
+            g.write(veri)
+    os.replace(gecici, hedef)
+    return True
+
+
+def _manifest_oku(onbellek):
+    try:
+        with open(os.path.join(onbellek, "manifest.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _manifest_yaz(onbellek, manifest):
+    yol = os.path.join(onbellek, "manifest.json")
+    gecici = f"{yol}.tmp{os.getpid()}"
+    with open(gecici, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(gecici, yol)
+
+
+def _onbellegi_temizle(onbellek, manifest):
+    """Manifestte artık hiçbir çıktının göstermediği <özet>/ girdilerini siler (yeniden eğitim /
+    ayar değişikliği sonrası eski tam başlık kopyaları birikmesin). Silinen girdi sayısını döndürür."""
+    kullanilan = {k.get("ozet") for k in manifest.values()}
+    silinen = 0
+    for isim in os.listdir(onbellek):
+        yol = os.path.join(onbellek, isim)
+        if len(isim) == 64 and isim not in kullanilan and os.path.isdir(yol):
+            shutil.rmtree(yol, ignore_errors=True)
+            silinen += 1
+    return silinen
+
+
+def onbellekli_cevir(girdi_yolu, cikti, ad, tek_baslik=False, bicim="hex", hizalama=8,
+                     bolum=None, cstdint=False, satir_basina=SATIR_BASINA, onbellek=ONBELLEK_DIZINI,
+                     kodlama="raw"):
+    """
+    tek_baslik_yaz / c_ve_h_yaz'ın artımlı sürümü.
+    cikti: tek_baslik ise .h yolu, değilse çıktı öneki (.h/.c eklenir).
+    Dönen: (byte sayısı, durum) -> durum: "atlandı" | "aynı" | "önbellekten" | "yeni"
+    """
+    ayar = {"ad": ad, "tek_baslik": tek_baslik, "bicim": bicim, "hizalama": hizalama,
+            "bolum": bolum, "cstdint": cstdint, "satir_basina": satir_basina, "kodlama": kodlama}
+    ciktilar = [str(cikti)] if tek_baslik else [f"{cikti}.h", f"{cikti}.c"]
+    if kodlama == "incbin":
+        # Üretilen metin girdinin çıktıya göre yolunu içerir -> anahtarın parçası
+        ayar["incbin_yolu"] = os.path.relpath(os.path.abspath(girdi_yolu),
+                                              os.path.abspath(os.path.dirname(ciktilar[0]) or "."))
+    anahtar = os.path.abspath(ciktilar[0])
+    os.makedirs(onbellek, exist_ok=True)
+    manifest = _manifest_oku(onbellek)
+    st = os.stat(girdi_yolu)
+
+    # 1) Girdi (boyut, mtime), ayarlar ve çıktı dosyaları değişmediyse özet bile hesaplanmaz
+    kayit = manifest.get(anahtar)
+    if (kayit and kayit["ayar"] == ayar and kayit["boyut"] == st.st_size
+            and kayit["mtime_ns"] == st.st_mtime_ns
+            and all(os.path.isfile(c) and os.stat(c).st_mtime_ns == m
+                    for c, m in zip(ciktilar, kayit["cikti_mtime_ns"]))):
+        return kayit["n"], "atlandı"
+
+    # 2) İçerik özeti + ayarlar -> önbellek girdisi (yoksa üret)
+    ozet = hashlib.sha256((dosya_ozeti(girdi_yolu) + json.dumps(ayar, sort_keys=True)).encode()).hexdigest()
+    girdi_dizini = os.path.join(onbellek, ozet)
+    onbellek_ciktilari = [os.path.join(girdi_dizini, os.path.basename(c)) for c in ciktilar]
+    durum = "önbellekten"
+    if not all(os.path.isfile(c) for c in onbellek_ciktilari):
+        gecici_dizin = f"{girdi_dizini}.tmp{os.getpid()}"
+        os.makedirs(gecici_dizin, exist_ok=True)
+        if tek_baslik:
+            tek_baslik_yaz(girdi_yolu, os.path.join(gecici_dizin, os.path.basename(ciktilar[0])), ad,
+                           bicim, hizalama, bolum, cstdint, satir_basina, kodlama,
+                           hedef_dizin=os.path.dirname(ciktilar[0]))
+        else:
+            c_ve_h_yaz(girdi_yolu, os.path.join(gecici_dizin, os.path.basename(str(cikti))), ad,
+                       bicim, hizalama, bolum, satir_basina, kodlama,
+                       hedef_dizin=os.path.dirname(ciktilar[0]))
+        if os.path.isdir(girdi_dizini):
+            shutil.rmtree(girdi_dizini)
+        os.replace(gecici_dizin, girdi_dizini)
+        durum = "yeni"
+
+    # 3) Diskteki çıktıya sadece içerik farklıysa dokun
+    yazildi = [_degisirse_yaz(c, k) for c, k in zip(ciktilar, onbellek_ciktilari)]
+    if not any(yazildi) and durum == "önbellekten":
+        durum = "aynı"
+
+    n = st.st_size
+    manifest[anahtar] = {"ayar": ayar, "boyut": st.st_size, "mtime_ns": st.st_mtime_ns, "n": n,
+                         "ozet": ozet, "cikti_mtime_ns": [os.stat(c).st_mtime_ns for c in ciktilar]}
+    _manifest_yaz(onbellek, manifest)
+    _onbellegi_temizle(onbellek, manifest)
+    return n, durum
+
+
+# ==========================================
+# BENCHMARK
+# ==========================================
+def basliktan_bayt(yol):
+    """Mevcut bir C başlığındaki (0x.. veya ondalık) dizi verisini bytes olarak geri okur."""
+    metin = open(yol, encoding="utf-8", errors="ignore").read()
+    govde = metin[metin.index("{") + 1:metin.index("}")]
+    return bytes(int(t, 0) for t in re.findall(r"0x[0-9a-fA-F]+|\d+", govde))
+
+
+def _eski_join(veri):
+    # Odev5 to_c_array: ",".join(str(b) ...)
+    return ",".join(str(b) for b in veri)
+
+
+def _eski_tek_tek(veri, yol):
+    # Final_Project/Soru2 main: byte başına f.write(str(b))
+    with open(yol, "w", encoding="utf-8") as f:
+        for i, b in enumerate(veri):
+            f.write(str(b))
+            if i != len(veri) - 1:
+                f.write(", ")
+            if (i + 1) % 12 == 0:
+                f.write("\n  ")
+
+
+def benchmark(kaynak=None, boyut=None, tekrar=3):
+    import tempfile
+    if kaynak and kaynak.endswith(".h"):
+        veri = basliktan_bayt(kaynak)
+    elif kaynak:
+        veri = open(kaynak, "rb").read()
+    else:
+        veri = np.random.default_rng(0).integers(0, 256, boyut or 4 * 1024 * 1024, dtype=np.uint8).tobytes()
+
+    with tempfile.TemporaryDirectory() as d:
+        girdi = os.path.join(d, "model.tflite")
+        open(girdi, "wb").write(veri)
+
+        def olc(fn):
+            en_iyi = float("inf")
+            for _ in range(tekrar):
+                t0 = time.perf_counter()
+                fn()
+                en_iyi = min(en_iyi, time.perf_counter() - t0)
+            return en_iyi
+
+        t_join = olc(lambda: _eski_join(veri))
+        t_tek = olc(lambda: _eski_tek_tek(veri, os.path.join(d, "eski.h")))
+        t_yeni = olc(lambda: tek_baslik_yaz(girdi, os.path.join(d, "yeni.h"), "model_data"))
+
+        esit = None
+        if kaynak and kaynak.endswith(".h"):
+            ad = re.search(r"unsigned char (\w+)\[\]", open(kaynak, encoding="utf-8").read()).group(1)
+            tek_baslik_yaz(girdi, os.path.join(d, "tekrar.h"), ad)
+            esit = open(kaynak, "rb").read() == open(os.path.join(d, "tekrar.h"), "rb").read()
+
+    mb = len(veri) / 1e6
+    print(f"Girdi: {len(veri)} byte ({kaynak or 'rastgele'})")
+    print(f"  eski join (Odev5)        : {t_join * 1000:8.1f} ms  ({mb / t_join:6.1f} MB/s)")
+    print(f"  eski byte byte (Soru2)   : {t_tek * 1000:8.1f} ms  ({mb / t_tek:6.1f} MB/s)")
+    print(f"  yeni vektörel + streaming: {t_yeni * 1000:8.1f} ms  ({mb / t_yeni:6.1f} MB/s)"
+          f"  -> x{t_tek / t_yeni:.0f} / x{t_join / t_yeni:.0f}")
+    if esit is not None:
+        print(f"  mevcut başlıkla birebir aynı çıktı: {esit}")
+
+
+# (etiket, kodlama, biçim, satır başına byte)
+KARSILASTIRMA = [
+    ("raw dec x12", "raw", "dec", 12),
+    ("raw hex x12 (Soru4)", "raw", "hex", 12),
+    ("raw hex x32 (geniş)", "raw", "hex", 32),
+    ("raw str x64", "raw", "str", 64),
+    ("lz4 hex x32", "lz4", "hex", 32),
+    ("lz4 str x64", "lz4", "str", 64),
+    ("incbin", "incbin", "hex", 12),
+]
+
+
+def _derleyici():
+    for aday in (os.environ.get("CXX"), "c++", "g++", "clang++"):
+        if aday and shutil.which(aday):
+            return aday
+    return None
+
+
+def karsilastir(girdi_yolu, ad="model_data"):
+    """
+    Her kodlama için tek başlık üretir; başlık boyutu, flash'taki veri boyutu, üretim
+    süresi ve (C++ derleyicisi varsa) başlığı içeren bir .cpp'nin -O2 derleme süresini yazdırır.
+    """
+    import subprocess
+    import tempfile
+    if girdi_yolu.endswith(".h"):
+        veri = basliktan_bayt(girdi_yolu)
+    else:
+        veri = open(girdi_yolu, "rb").read()
+    lz4_boyut = len(lz4_sikistir(veri))
+    cxx = _derleyici()
+
+    print(f"Girdi: {len(veri)} byte ({girdi_yolu}) | derleyici: {cxx or 'yok (derleme süresi ölçülmez)'}")
+    print(f"  {'kodlama':<20} {'başlık':>12} {'flash veri':>12} {'üretim':>10} {'derleme':>10}")
+    with tempfile.TemporaryDirectory() as d:
+        model = os.path.join(d, "model.tflite")
+        open(model, "wb").write(veri)
+        for etiket, kodlama, bicim, satir in KARSILASTIRMA:
+            h = os.path.join(d, f"{kodlama}_{bicim}_{satir}.h")
+            t0 = time.perf_counter()
+            tek_baslik_yaz(model, h, ad, bicim, satir_basina=satir, kodlama=kodlama)
+            t_uretim = time.perf_counter() - t0
+
+            t_derleme = "-"
+            if cxx:
+                cpp = h[:-2] + ".cpp"
+                with open(cpp, "w", encoding="ascii") as f:
+                    f.write(f'#include "{os.path.basename(h)}"\n')
+                t0 = time.perf_counter()
+                sonuc = subprocess.run([cxx, "-std=c++11", "-O2", "-c", cpp, "-o", cpp + ".o", f"-Wa,-I{d}"],
+                                       cwd=d, capture_output=True, text=True)
+                t_derleme = (f"{(time.perf_counter() - t0) * 1000:7.0f} ms" if sonuc.returncode == 0
+                             else "hata")
+            flash = lz4_boyut if kodlama == "lz4" else len(veri)
+            print(f"  {etiket:<20} {os.path.getsize(h):>10} B {flash:>10} B "
+                  f"{t_uretim * 1000:>7.1f} ms {t_derleme:>10}")
+    print(f"  (lz4: çalışma anında {len(veri)} byte RAM/PSRAM gerekir; int8 ağırlıklar az sıkışır)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TFLite -> C dizisi (.h/.c)")
+    parser.add_argument("girdi", nargs="*", help=".tflite dosya(lar)ı")
+    parser.add_argument("--name", help="C dizi adı (tek girdi; varsayılan: dosya adından)")
+    parser.add_argument("--out", help="Çıktı öneki / .h yolu (tek girdi; varsayılan: --name)")
+    parser.add_argument("--out-dir", default=None, help="Çoklu girdide çıktı klasörü")
+    parser.add_argument("--header-only", action="store_true", help="Tanımı tek .h içine yaz (C++ / Arduino)")
+    parser.add_argument("--format", choices=["hex", "dec", "str"], default="hex",
+                        help="str: \"\\x..\" string literal (daha küçük başlık, hızlı derleme)")
+    parser.add_argument("--encoding", choices=["raw", "lz4", "incbin"], default="raw",
+                        help="lz4: sıkıştırılmış dizi + C açıcı, incbin: assembler ile gömme")
+    parser.add_argument("--per-line", type=int, default=SATIR_BASINA)
+    parser.add_argument("--align", type=int, default=8, help="0: hizalama yok")
+    parser.add_argument("--section", default=None, help='Örn: ".rodata.model" veya ".ext_flash"')
+    parser.add_argument("--cstdint", action="store_true", help="Tek başlıkta #include <cstdint> ekle")
+    parser.add_argument("--cache-dir", default=ONBELLEK_DIZINI)
+    parser.add_argument("--no-cache", action="store_true", help="Önbelleği kullanma, her zaman yeniden yaz")
+    parser.add_argument("--compare", action="store_true",
+                        help="Tüm kodlamaların başlık boyutu / derleme süresi karşılaştırması")
+    parser.add_argument("--bench", nargs="?", const="", default=None,
+                        help="Benchmark: .tflite veya mevcut .h yolu (boş: 4 MB rastgele)")
+    args = parser.parse_args(argv)
+
+    if args.bench is not None:
+        benchmark(args.bench or (args.girdi[0] if args.girdi else None))
+        return
+    if args.compare:
+        if not args.girdi:
+            parser.error("--compare için girdi (.tflite veya mevcut .h) gerekli")
+        for girdi in args.girdi:
+            karsilastir(girdi)
+        return
+
+    if not args.girdi:
+        parser.error("girdi (.tflite) gerekli")
+    if len(args.girdi) > 1 and (args.name or args.out):
+        parser.error("--name/--out sadece tek girdi ile kullanılabilir (çoklu girdide --out-dir)")
+
+    for girdi in args.girdi:
+        if not os.path.isfile(girdi):
+            raise FileNotFoundError(f"TFLite dosyası bulunamadı: {girdi}")
+
+        ad = args.name or re.sub(r"\W", "_", os.path.splitext(os.path.basename(girdi))[0])
+        if args.header_only:
+            cikti = args.out or os.path.join(args.out_dir or "", ad + ".h")
+        else:
+            cikti = os.path.splitext(args.out)[0] if args.out else os.path.join(args.out_dir or "", ad)
+
+        if args.no_cache:
+            if args.header_only:
+                n = tek_baslik_yaz(girdi, cikti, ad, args.format, args.align, args.section,
+                                   args.cstdint, args.per_line, args.encoding)
+            else:
+                n = c_ve_h_yaz(girdi, cikti, ad, args.format, args.align, args.section, args.per_line,
+                               args.encoding)
+            durum = "yeni"
+        else:
+            n, durum = onbellekli_cevir(girdi, cikti, ad, args.header_only, args.format, args.align,
+                                        args.section, args.cstdint, args.per_line, args.cache_dir,
+                                        args.encoding)
+        hedef = cikti if args.header_only else f"{cikti}.c ve {cikti}.h"
+        print(f"[{durum}] {hedef} (boyut: {n} byte)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())